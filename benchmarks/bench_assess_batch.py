@@ -0,0 +1,71 @@
+"""
+assess_batch() throughput on a synthetic backlog.
+
+Usage:
+    python benchmarks/bench_assess_batch.py [--proposals 100000 500000] [--runs 3]
+
+For each size, writes a CSV of random proposals (base rating, effort band,
+zero to three risk vectors) to a temporary directory and times reading,
+assessing, streaming JSONL and CSV output, and appending to a throwaway
+assessment store, reported as proposals per second.
+"""
+
+import argparse
+import csv
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tools import assess  # noqa: E402
+
+
+def write_backlog(path: str, proposals: int) -> None:
+    """A CSV backlog with the given number of random proposals."""
+    rng = random.Random(42)
+    vectors = list(assess.RISK_VECTORS)
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['proposal', 'base', 'effort', 'risks'])
+        for i in range(proposals):
+            writer.writerow([f"Backlog item {i}", rng.choice(list(assess.RATINGS)),
+                             rng.choice(list(assess.EFFORT_BANDS)),
+                             ';'.join(rng.sample(vectors, rng.randint(0, 3)))])
+
+
+def best_rate(runs: int, path: str, fmt: str, save: bool) -> float:
+    """Return the best proposals-per-second over several batches."""
+    rates = []
+    with open(os.devnull, 'w', encoding='utf-8') as out:
+        for _ in range(runs):
+            start = time.perf_counter()
+            count, _ = assess.assess_batch(assess.read_proposals(path), out, fmt, save=save)
+            rates.append(count / (time.perf_counter() - start))
+    return max(rates)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--proposals', type=int, nargs='+', default=[100000, 500000])
+    parser.add_argument('--runs', type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'proposals':>10} {'jsonl':>12} {'csv':>12} {'jsonl+store':>14}")
+    for n in args.proposals:
+        with tempfile.TemporaryDirectory() as tmp:
+            assess.ASSESSMENTS_DIR = os.path.join(tmp, 'assessments')
+            path = os.path.join(tmp, 'backlog.csv')
+            write_backlog(path, n)
+
+            jsonl = best_rate(args.runs, path, 'jsonl', save=False)
+            as_csv = best_rate(args.runs, path, 'csv', save=False)
+            stored = best_rate(args.runs, path, 'jsonl', save=True)
+
+        print(f"{n:>10} {jsonl:>10,.0f}/s {as_csv:>10,.0f}/s {stored:>12,.0f}/s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,48 @@
+"""
+simulate_assessment() timing by engine and sample count.
+
+Usage:
+    python benchmarks/bench_assess_simulate.py [--samples 100000 1000000 10000000] [--runs 3]
+
+Times a Monte Carlo run with every risk vector uncertain (the most work
+per scenario) with the NumPy sampler, when NumPy is installed, and with
+the pure-Python bit-parallel sampler.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tools import assess  # noqa: E402
+
+
+def best_of(runs: int, samples: int, use_numpy: bool) -> float:
+    """Return the fastest of several simulations, in milliseconds."""
+    probabilities = {vector: 0.1 + 0.1 * i for i, vector in enumerate(assess.RISK_VECTORS)}
+    timings = []
+    for seed in range(runs):
+        start = time.perf_counter()
+        assess.simulate_assessment('F2', probabilities, 'M', samples, seed=seed, use_numpy=use_numpy)
+        timings.append((time.perf_counter() - start) * 1000)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--samples', type=int, nargs='+', default=[100000, 1000000, 10000000])
+    parser.add_argument('--runs', type=int, default=3)
+    args = parser.parse_args()
+
+    engines = [False] + ([True] if assess._numpy() is not None else [])
+    header = f"{'samples':>10} {'python':>12}" + (f" {'numpy':>12}" if len(engines) > 1 else '')
+    print(header)
+    for n in args.samples:
+        timings = [best_of(args.runs, n, use_numpy) for use_numpy in engines]
+        print(f"{n:>10} " + ' '.join(f"{t:>9.1f} ms" for t in timings))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+"""
+bkp verify timing by hashing thread count.
+
+Usage:
+    python benchmarks/bench_backup_verify.py [--files 64] [--size-mb 4] [--workers 1 2 4 8]
+
+Builds a throwaway state/ of random files in a temporary directory, backs
+it up once, and times verify_backups() re-hashing every object with each
+pool size. hashlib and file reads release the GIL, so on a multi-core
+host the time should drop until the disk, not the CPU, is the limit.
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tools import backup  # noqa: E402
+
+
+def point_at(tmp: str) -> None:
+    """Redirect every backup path to a temporary project root."""
+    backup.BASE_DIR = tmp
+    backup.STATE_DIR = os.path.join(tmp, 'state')
+    backup.CHANGELOG_FILE = os.path.join(tmp, 'CHANGELOG.md')
+    backup.BACKUP_DIR = os.path.join(tmp, 'backups')
+    backup.OBJECTS_DIR = os.path.join(backup.BACKUP_DIR, 'objects')
+    backup.STAT_CACHE = os.path.join(backup.OBJECTS_DIR, '.stat-cache.json')
+    backup.CATALOG_FILE = os.path.join(backup.BACKUP_DIR, 'catalog.jsonl')
+
+
+def best_of(runs: int, workers: int) -> float:
+    """Return the fastest of several verify_backups() calls, in milliseconds."""
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        backup.verify_backups(workers=workers)
+        timings.append((time.perf_counter() - start) * 1000)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--files', type=int, default=64)
+    parser.add_argument('--size-mb', type=int, default=4)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8])
+    parser.add_argument('--runs', type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        point_at(tmp)
+        os.makedirs(backup.STATE_DIR)
+        for i in range(args.files):
+            with open(os.path.join(backup.STATE_DIR, f'file_{i}.bin'), 'wb') as f:
+                f.write(os.urandom(args.size_mb * 1024 * 1024))
+        backup.create_backup("Benchmark")
+
+        print(f"{args.files} files x {args.size_mb} MB, {os.cpu_count()} CPUs")
+        print(f"{'workers':>8} {'verify':>12} {'speedup':>9}")
+        baseline = None
+        for workers in args.workers:
+            elapsed = best_of(args.runs, workers)
+            baseline = baseline or elapsed
+            print(f"{workers:>8} {elapsed:>9.1f} ms {baseline / elapsed:>8.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+"""
+get_unreleased_summary() and add_entry() timing as CHANGELOG.md grows.
+
+Usage:
+    python benchmarks/bench_changelog_head.py [--versions 100 1000 10000] [--runs 20]
+
+For each size, builds a throwaway changelog in a temporary directory with
+that many released versions behind a small [Unreleased] section, and times
+a full-file parse (Changelog(read_changelog())) against the head-only
+get_unreleased_summary() and add_entry(), which read up to the first
+version heading and copy the rest of the file as raw bytes.
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tools import changelog  # noqa: E402
+
+
+def build_changelog(versions: int) -> str:
+    """A synthetic changelog with the given number of released versions."""
+    parts = ["# Changelog\n\n## [Unreleased]\n\n### Added\n\n- Pending work\n\n"]
+    for i in range(versions, 0, -1):
+        parts.append(f"## [0.{i}.0] - 2026-01-01\n\n### Added\n\n")
+        parts.extend(f"- Entry {j} of release {i} *(The Engineer)*\n" for j in range(20))
+        parts.append("\n")
+    return ''.join(parts)
+
+
+def best_of(runs: int, fn) -> float:
+    """Return the fastest of several calls, in milliseconds."""
+    timings = []
+    for i in range(runs):
+        start = time.perf_counter()
+        fn(i)
+        timings.append((time.perf_counter() - start) * 1000)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--versions', type=int, nargs='+', default=[100, 1000, 10000])
+    parser.add_argument('--runs', type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'versions':>10} {'size':>10} {'full parse':>12} {'summary':>12} {'add_entry':>12}")
+    for n in args.versions:
+        with tempfile.TemporaryDirectory() as tmp:
+            changelog.CHANGELOG_FILE = os.path.join(tmp, 'CHANGELOG.md')
+            changelog.LEDGER_FILE = os.path.join(tmp, '.changelog-ledger')
+            changelog.OFFSETS_FILE = os.path.join(tmp, '.changelog-offsets.json')
+            changelog.FRAGMENT_DIR = os.path.join(tmp, 'changelog.d')
+            changelog._ledger = None
+
+            changelog.write_changelog(build_changelog(n))
+            full = best_of(args.runs, lambda i: changelog.Changelog(changelog.read_changelog()).unreleased_summary())
+            summary = best_of(args.runs, lambda i: changelog.get_unreleased_summary())
+            add = best_of(args.runs, lambda i: changelog.add_entry('added', f"Bench entry {i}"))
+            size_mb = os.path.getsize(changelog.CHANGELOG_FILE) / (1024 * 1024)
+
+        print(f"{n:>10} {size_mb:>8.1f}MB {full:>9.2f} ms {summary:>9.2f} ms {add:>9.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
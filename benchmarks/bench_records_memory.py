@@ -0,0 +1,78 @@
+"""
+Per-decision memory footprint: plain dicts vs. __slots__ records.
+
+Usage:
+    python benchmarks/bench_records_memory.py [--decisions 100000]
+
+Parses a synthetic current.md with N decisions, then measures the memory
+held by the resulting decision dicts and by the equivalent
+tools.records.Decision objects, using tracemalloc.
+"""
+
+import argparse
+import gc
+import os
+import sys
+import tempfile
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tools import state, records  # noqa: E402
+
+
+def measure(build):
+    """Return (result, bytes still allocated by build())."""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, after - before
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--decisions', type=int, default=100000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        state.STATE_FILE = os.path.join(tmp, 'current.md')
+        state.JOURNAL_FILE = os.path.join(tmp, 'current.journal')
+        state.write_state({
+            "lastUpdated": "2026-02-14T12:00:00",
+            "decisions": [
+                {"topic": f"Topic {i}", "decision": f"Decision {i}",
+                 "risk": state.VALID_SEVERITIES[i % 4]}
+                for i in range(args.decisions)
+            ],
+        })
+
+        def parse_dicts():
+            return [item for kind, item in state.iter_state_events(sections=['decisions'])
+                    if kind == 'decisions']
+
+        def parse_records():
+            return [records.Decision.from_dict(item)
+                    for kind, item in state.iter_state_events(sections=['decisions'])
+                    if kind == 'decisions']
+
+        dicts, dict_bytes = measure(parse_dicts)
+        del dicts
+        recs, record_bytes = measure(parse_records)
+
+    # Sanity check: the conversion is lossless
+    sample = recs[len(recs) // 2]
+    assert records.Decision.from_dict(sample.to_dict()) == sample
+
+    n = args.decisions
+    print(f"Decisions: {n}")
+    print(f"  dicts:    {dict_bytes / 2**20:8.1f} MiB  ({dict_bytes / n:6.0f} B/decision)")
+    print(f"  records:  {record_bytes / 2**20:8.1f} MiB  ({record_bytes / n:6.0f} B/decision)")
+    print(f"  saving:   {100 * (1 - record_bytes / dict_bytes):7.1f}%")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+"""
+Cold vs. warm read_state() timing on a large state file.
+
+Usage:
+    python benchmarks/bench_state_cache.py [--decisions 10000] [--runs 5]
+
+Builds a throwaway state with N decisions in a temporary directory, then
+times read_state() with the parse cache disabled (cold) and with a warm
+cache.
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tools import state  # noqa: E402
+
+
+def build_state(decisions: int) -> None:
+    """Write a synthetic state with the given number of decisions."""
+    s = {
+        "lastUpdated": "2026-02-14T12:00:00",
+        "activeWork": [f"Work item {i}" for i in range(50)],
+        "decisions": [
+            {"topic": f"Topic {i}", "decision": f"Decision {i}", "rationale": "See logs",
+             "risk": state.VALID_SEVERITIES[i % 4], "votes": {}, "dissents": []}
+            for i in range(decisions)
+        ],
+        "outstandingIssues": [{"issue": f"Issue {i}", "severity": "Medium"} for i in range(100)],
+        "prophetVindications": [],
+        "dissentVindications": [],
+        "nextSession": [],
+    }
+    state.write_state(s)
+
+
+def best_of(runs: int, use_cache: bool) -> float:
+    """Return the fastest of several read_state() calls, in milliseconds."""
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        state.read_state(use_cache=use_cache)
+        timings.append((time.perf_counter() - start) * 1000)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--decisions', type=int, default=10000)
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        state.STATE_FILE = os.path.join(tmp, 'current.md')
+        state.JOURNAL_FILE = os.path.join(tmp, 'current.journal')
+        state.CACHE_FILE = os.path.join(tmp, '.current.cache.json')
+
+        build_state(args.decisions)
+        size_kb = os.path.getsize(state.STATE_FILE) / 1024
+
+        cold = best_of(args.runs, use_cache=False)
+        state.read_state(use_cache=True)  # populate the cache
+        warm = best_of(args.runs, use_cache=True)
+
+    print(f"State: {args.decisions} decisions ({size_kb:.0f} KiB)")
+    print(f"  cold (parse):  {cold:8.2f} ms")
+    print(f"  warm (cache):  {warm:8.2f} ms")
+    print(f"  speedup:       {cold / warm:8.1f}x")
+
+
+if __name__ == '__main__':
+    main()
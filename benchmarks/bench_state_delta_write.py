@@ -0,0 +1,77 @@
+"""
+Full vs. delta write_state() timing when one small section changes.
+
+Usage:
+    python benchmarks/bench_state_delta_write.py [--decisions 10000 50000 200000] [--runs 5]
+
+For each size, builds a throwaway state in a temporary directory, appends
+one outstanding issue, and times write_state() rendering every section
+(full) against write_state(changed=['outstandingIssues']), which renders
+that section and copies the rest of current.md byte for byte (delta).
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tools import state, archive  # noqa: E402
+
+
+def build_state(decisions: int) -> dict:
+    """A synthetic state with the given number of decisions."""
+    return {
+        "lastUpdated": "2026-02-14T12:00:00",
+        "activeWork": [f"Work item {i}" for i in range(50)],
+        "decisions": [
+            {"topic": f"Topic {i}", "decision": f"Decision {i}", "rationale": "See logs",
+             "risk": state.VALID_SEVERITIES[i % 4], "votes": {}, "dissents": []}
+            for i in range(decisions)
+        ],
+        "outstandingIssues": [{"issue": f"Issue {i}", "severity": "Medium"} for i in range(100)],
+        "prophetVindications": [],
+        "dissentVindications": [],
+        "nextSession": [],
+    }
+
+
+def best_of(runs: int, s: dict, changed) -> float:
+    """Return the fastest of several write_state() calls, in milliseconds."""
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        state.write_state(s, changed=changed)
+        timings.append((time.perf_counter() - start) * 1000)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--decisions', type=int, nargs='+', default=[10000, 50000, 200000])
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'decisions':>10} {'size':>10} {'full':>12} {'delta':>12} {'speedup':>9}")
+    for n in args.decisions:
+        with tempfile.TemporaryDirectory() as tmp:
+            state.STATE_FILE = os.path.join(tmp, 'current.md')
+            state.JOURNAL_FILE = os.path.join(tmp, 'current.journal')
+            state.CACHE_FILE = os.path.join(tmp, '.current.cache.json')
+            archive.ARCHIVE_INDEX = os.path.join(tmp, 'archive', 'index.json')
+
+            s = build_state(n)
+            state.write_state(s)
+            s['outstandingIssues'].append({"issue": "New issue", "severity": "High"})
+
+            full = best_of(args.runs, s, changed=None)
+            delta = best_of(args.runs, s, changed=['outstandingIssues'])
+            size_mb = os.path.getsize(state.STATE_FILE) / (1024 * 1024)
+
+        print(f"{n:>10} {size_mb:>8.1f}MB {full:>9.2f} ms {delta:>9.2f} ms {full / delta:>8.1f}x")
+
+
+if __name__ == '__main__':
+    main()
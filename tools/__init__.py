@@ -11,5 +11,9 @@ from . import changelog
 from . import backup
 from . import export
 from . import assess
+from . import statedb
+from . import records
+from . import index
+from . import archive
 
-__all__ = ['state', 'session', 'validate', 'changelog', 'backup', 'export', 'assess']
+__all__ = ['state', 'session', 'validate', 'changelog', 'backup', 'export', 'assess', 'statedb', 'records', 'index', 'archive']
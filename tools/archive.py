@@ -0,0 +1,233 @@
+"""
+Session rotation: keeps state/current.md bounded.
+
+At the end of each session, closed decisions and vindications are moved
+out of the live state into a dated shard under sessions/archive/, and
+the shard is listed in sessions/archive/index.json. current.md keeps only
+live work, outstanding issues, and next-session items.
+
+Shards are JSON Lines ({"section": ..., "item": ...} per line), so each
+entry is stored exactly as it was read from current.md; render_shard()
+turns one back into current.md-style markdown. Decisions that may not
+have been read exactly (see state.inexact_decisions()) are not archived
+but stay live, where they can still be checked and corrected.
+
+Inside a transaction, stage_rotation() writes the shard as a .pending file
+and publish_rotation() renames it into place and indexes it once the
+state write has committed, so a failed session end never leaves
+decisions both live and archived.
+"""
+
+import json
+import os
+from datetime import datetime
+from typing import Optional, List, Dict, Any, Iterator
+
+from . import state as state_module
+
+ARCHIVE_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'sessions', 'archive')
+ARCHIVE_INDEX = os.path.join(ARCHIVE_DIR, 'index.json')
+
+# Sections that are closed once recorded and move to the archive on rotation
+ARCHIVED_SECTIONS = ['decisions', 'prophetVindications', 'dissentVindications']
+
+# Suffix of a shard written by stage_rotation() but not yet published
+PENDING_SUFFIX = '.pending'
+
+
+def read_index() -> List[Dict[str, Any]]:
+    """
+    Load the archive index.
+
+    Returns:
+        Shard entries, oldest first: {file, archivedAt, <section>: count}
+    """
+    if not os.path.exists(ARCHIVE_INDEX):
+        return []
+    with open(ARCHIVE_INDEX, 'r', encoding='utf-8') as f:
+        return json.load(f).get('shards', [])
+
+
+def _write_index(shards: List[Dict[str, Any]]) -> None:
+    tmp_path = ARCHIVE_INDEX + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({"shards": shards}, f, indent=2)
+        f.write('\n')
+    os.replace(tmp_path, ARCHIVE_INDEX)
+
+
+def rotate_state(state: Dict[str, Any], now: Optional[datetime] = None) -> Optional[str]:
+    """
+    Move closed sections of state into a new archive shard.
+
+    state is modified in place: ARCHIVED_SECTIONS are emptied, and the
+    caller writes it back. The shard is published at once; a caller that
+    writes the state afterwards, and may fail, should use stage_rotation()
+    and publish_rotation() instead (end_session() does).
+
+    Args:
+        state: The full state dictionary
+        now: Rotation time (defaults to now); names the shard
+
+    Returns:
+        Path of the new shard, or None if there was nothing to archive
+    """
+    return publish_rotation(stage_rotation(state, now))
+
+
+def stage_rotation(state: Dict[str, Any], now: Optional[datetime] = None) -> Optional[Dict[str, Any]]:
+    """
+    Write closed sections of state to a pending shard, not yet indexed.
+
+    state is modified in place as by rotate_state(). Pass the result to
+    publish_rotation() once state has been written, or to
+    discard_rotation() if that fails. Decisions that current.md does not
+    hold in its current format stay in state rather than being archived
+    from an inexact read.
+
+    Args:
+        state: The full state dictionary
+        now: Rotation time (defaults to now); names the shard
+
+    Returns:
+        The staged rotation, or None if there was nothing to archive
+    """
+    _publish_orphans()
+    kept = {section: [] for section in ARCHIVED_SECTIONS}
+    inexact = state_module.inexact_decisions()
+    if inexact:
+        kept['decisions'] = [d for d in state.get('decisions', []) if d in inexact]
+        if kept['decisions']:
+            print(f"Warning: {len(kept['decisions'])} decision(s) in current.md are not in the "
+                  "current format and may not have been read exactly; left live, not archived")
+    if not any(len(state.get(section, [])) > len(kept[section]) for section in ARCHIVED_SECTIONS):
+        return None
+
+    now = now or datetime.now()
+    os.makedirs(ARCHIVE_DIR, exist_ok=True)
+    if not os.path.exists(ARCHIVE_INDEX):
+        # So the state written before publishing already points to it
+        _write_index([])
+
+    filename = f"state_{now.strftime('%Y%m%d_%H%M%S')}.jsonl"
+    suffix = 1
+    while (os.path.exists(os.path.join(ARCHIVE_DIR, filename))
+           or os.path.exists(os.path.join(ARCHIVE_DIR, filename + PENDING_SUFFIX))):
+        suffix += 1
+        filename = f"state_{now.strftime('%Y%m%d_%H%M%S')}_{suffix}.jsonl"
+    pending_path = os.path.join(ARCHIVE_DIR, filename + PENDING_SUFFIX)
+
+    entry = {"file": filename, "archivedAt": now.isoformat(),
+             "lastUpdated": state.get('lastUpdated', now.isoformat())}
+    tmp_path = pending_path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        for section in ARCHIVED_SECTIONS:
+            items = [item for item in state.get(section, []) if item not in kept[section]]
+            for item in items:
+                f.write(json.dumps({"section": section, "item": item}) + '\n')
+            entry[section] = len(items)
+    os.replace(tmp_path, pending_path)
+
+    for section in ARCHIVED_SECTIONS:
+        state[section] = kept[section]
+    return {"path": pending_path, "entry": entry}
+
+
+def publish_rotation(staged: Optional[Dict[str, Any]]) -> Optional[str]:
+    """
+    Move a staged shard into place and add it to the index.
+
+    Returns:
+        Path of the published shard, or None if nothing was staged
+    """
+    if staged is None:
+        return None
+    shard_path = staged['path'][:-len(PENDING_SUFFIX)]
+    os.replace(staged['path'], shard_path)
+    shards = read_index()
+    shards.append(staged['entry'])
+    _write_index(shards)
+    return shard_path
+
+
+def discard_rotation(staged: Optional[Dict[str, Any]]) -> None:
+    """Delete a staged shard whose state write failed; its items are still live."""
+    if staged is not None and os.path.exists(staged['path']):
+        os.remove(staged['path'])
+
+
+def _publish_orphans() -> None:
+    """
+    Publish shards left pending by a process that stopped between writing
+    the state and publishing. If it stopped before the state write, their
+    items are archived twice, but they are never lost.
+    """
+    if not os.path.isdir(ARCHIVE_DIR):
+        return
+    for name in sorted(os.listdir(ARCHIVE_DIR)):
+        if not name.endswith(PENDING_SUFFIX):
+            continue
+        path = os.path.join(ARCHIVE_DIR, name)
+        archived_at = datetime.fromtimestamp(os.path.getmtime(path)).isoformat()
+        entry = {"file": name[:-len(PENDING_SUFFIX)], "archivedAt": archived_at,
+                 "lastUpdated": archived_at}
+        entry.update((section, 0) for section in ARCHIVED_SECTIONS)
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                section = json.loads(line)['section']
+                entry[section] = entry.get(section, 0) + 1
+        publish_rotation({"path": path, "entry": entry})
+
+
+def iter_archived(section: str) -> Iterator[Any]:
+    """
+    Yield items of one section from every shard, oldest first.
+
+    Shards that hold nothing for the section are skipped without being read.
+    """
+    for entry in read_index():
+        if not entry.get(section):
+            continue
+        path = os.path.join(ARCHIVE_DIR, entry['file'])
+        if not os.path.exists(path):
+            continue
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                record = json.loads(line)
+                if record['section'] == section:
+                    yield record['item']
+
+
+def render_shard(path: str) -> str:
+    """Render an archive shard as current.md-style markdown."""
+    shard = {section: [] for section in ARCHIVED_SECTIONS}
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            record = json.loads(line)
+            shard.setdefault(record['section'], []).append(record['item'])
+    entry = next((e for e in read_index() if e['file'] == os.path.basename(path)), {})
+    shard['lastUpdated'] = entry.get('lastUpdated', '')
+    return state_module.format_state_markdown(shard)
+
+
+def iter_all(section: str) -> Iterator[Any]:
+    """Yield a section's archived items followed by its live ones."""
+    yield from iter_archived(section)
+    yield from state_module.iter_section(section)
+
+
+def find_shard(identifier: str) -> Optional[str]:
+    """
+    Resolve a shard by filename (with or without .jsonl) or 1-based
+    position, newest first, as listed by `morningstar history --archive`.
+    """
+    shards = read_index()
+    if identifier.isdigit():
+        position = int(identifier) - 1
+        if 0 <= position < len(shards):
+            return os.path.join(ARCHIVE_DIR, shards[::-1][position]['file'])
+        return None
+    if not identifier.endswith('.jsonl'):
+        identifier += '.jsonl'
+    path = os.path.join(ARCHIVE_DIR, os.path.basename(identifier))
+    return path if os.path.exists(path) else None
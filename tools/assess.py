@@ -2,12 +2,60 @@
 MORNINGSTAR Feasibility Assessment Framework (MFAF) Implementation.
 
 Provides tools for evaluating proposals using the MFAF methodology.
+
+Saved assessments live in one append-only JSON Lines file,
+state/assessments/assessments.jsonl, each with a monotonic integer id.
+Appends take an exclusive lock where fcntl is available, and recent
+assessments are read from the end of the file without parsing the rest.
+Per-assessment assessment_<timestamp>.json files from older versions are
+migrated into it on first use.
+
+Counts by rating, recommendation, effort band and risk vector, overall and
+per ISO week and month, are kept in state/assessments/.rollups.json and
+updated as assessments are saved, so statistics never read the store.
 """
 
+import csv
 import json
 import os
+import random
+import re
+from contextlib import contextmanager
 from datetime import datetime
-from typing import Optional, Dict, List, Tuple
+from typing import Optional, Dict, List, Tuple, Iterator, Iterable, TextIO
+
+try:
+    import fcntl
+except ImportError:  # Windows: appends are unlocked
+    fcntl = None
+
+ASSESSMENTS_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'state', 'assessments')
+STORE_NAME = 'assessments.jsonl'
+# Where migrated per-assessment files are moved, inside the assessments directory
+MIGRATED_DIR = 'migrated'
+# Bytes read per step when reading the store backwards
+TAIL_BLOCK = 64 * 1024
+# Aggregate counts next to the store; derived, rebuilt from it on demand
+ROLLUPS_NAME = '.rollups.json'
+# Rollup windows: assessment timestamp (ISO) -> period key
+ROLLUP_WINDOWS = ('week', 'month')
+# Fields counted in every rollup bucket
+ROLLUP_FIELDS = ('effectiveRating', 'recommendation', 'effortBand', 'riskVectors')
+
+# Proposals assessed, written out and appended to the store per step of a batch
+BATCH_CHUNK = 10000
+# Separators between risk vector names in one batch input field
+VECTOR_SEPARATORS = re.compile(r'[;,|\s]+')
+# Columns of `assess batch` CSV output
+BATCH_CSV_FIELDS = ['id', 'proposal', 'baseRating', 'riskVectors', 'riskMask', 'riskModifier',
+                    'effectiveRating', 'effortBand', 'recommendation']
+# One shared encoder: json.dumps(..., ensure_ascii=False) builds a new one per call
+_encode = json.JSONEncoder(ensure_ascii=False).encode
+
+# Scenarios sampled per NumPy step of a simulation (bounds its memory)
+SIMULATION_CHUNK = 1 << 18
+# Binary digits of each probability used by the pure-Python sampler
+PROBABILITY_BITS = 32
 
 # Rating definitions
 RATINGS = {
@@ -30,6 +78,10 @@ RISK_VECTORS = {
     'previouslyFailed': {'label': 'Has been attempted before and failed', 'modifier': 1.0},
 }
 
+# Bit of each risk vector in an assessment's riskMask, in RISK_VECTORS order
+# (authAuthz = 1 ... previouslyFailed = 64). Append new vectors; never reorder.
+VECTOR_BITS = {vector: 1 << i for i, vector in enumerate(RISK_VECTORS)}
+
 # Effort bands
 EFFORT_BANDS = {
     'S': 'Hours',
@@ -103,6 +155,51 @@ def determine_recommendation(effective_rating: str, effort_band: str) -> str:
     return 'REVIEW'  # Default
 
 
+def risk_mask(risk_vectors: Dict[str, bool]) -> int:
+    """
+    Encode active risk vectors as a bitmask of VECTOR_BITS.
+    
+    Args:
+        risk_vectors: Dict mapping vector names to boolean (unknown names are ignored)
+        
+    Returns:
+        The mask, 0 to 2**len(RISK_VECTORS) - 1
+    """
+    mask = 0
+    for vector, active in risk_vectors.items():
+        if active:
+            mask |= VECTOR_BITS.get(vector, 0)
+    return mask
+
+
+def vectors_from_mask(mask: int) -> Dict[str, bool]:
+    """Decode a risk mask back into the riskVectors dict (every vector, in order)."""
+    return {vector: bool(mask & bit) for vector, bit in VECTOR_BITS.items()}
+
+
+def _build_outcomes() -> Dict[Tuple[str, int, str], Tuple[float, str, str]]:
+    """Evaluate every (base rating, risk mask, effort band) once."""
+    outcomes = {}
+    for mask in range(1 << len(RISK_VECTORS)):
+        risk_modifier = calculate_risk_modifier(vectors_from_mask(mask))
+        for base_rating in RATINGS:
+            effective_rating = calculate_effective_rating(base_rating, risk_modifier)
+            for effort_band in EFFORT_BANDS:
+                outcomes[(base_rating, mask, effort_band)] = (
+                    risk_modifier, effective_rating,
+                    determine_recommendation(effective_rating, effort_band))
+    return outcomes
+
+
+# (base rating, risk mask, effort band) -> (risk modifier, effective rating,
+# recommendation) for all 6 x 128 x 4 inputs, so assessing is one lookup
+OUTCOMES = _build_outcomes()
+
+# Risk mask -> names of its active vectors
+MASK_VECTORS = [tuple(v for v, bit in VECTOR_BITS.items() if mask & bit)
+                for mask in range(1 << len(RISK_VECTORS))]
+
+
 def format_assessment(assessment: Dict) -> str:
     """
     Format an assessment as a displayable string.
@@ -184,15 +281,22 @@ def create_assessment(
     Returns:
         Complete assessment dictionary
     """
-    risk_modifier = calculate_risk_modifier(risk_vectors)
-    effective_rating = calculate_effective_rating(base_rating, risk_modifier)
-    recommendation = determine_recommendation(effective_rating, effort_band)
+    mask = risk_mask(risk_vectors)
+    outcome = OUTCOMES.get((base_rating, mask, effort_band))
+    if outcome is None:
+        # Inputs outside the table (e.g. a nonstandard effort band)
+        risk_modifier = calculate_risk_modifier(risk_vectors)
+        effective_rating = calculate_effective_rating(base_rating, risk_modifier)
+        recommendation = determine_recommendation(effective_rating, effort_band)
+    else:
+        risk_modifier, effective_rating, recommendation = outcome
     
     assessment = {
         'proposal': proposal,
         'timestamp': datetime.now().isoformat(),
         'baseRating': base_rating,
         'riskVectors': risk_vectors,
+        'riskMask': mask,
         'riskModifier': risk_modifier,
         'effectiveRating': effective_rating,
         'effortBand': effort_band,
@@ -211,67 +315,689 @@ def create_assessment(
     return assessment
 
 
-def save_assessment(assessment: Dict, directory: Optional[str] = None) -> str:
+def _legacy_files(directory: str) -> List[str]:
+    """Per-assessment JSON files awaiting migration (not hidden files such as ROLLUPS_NAME)."""
+    return sorted(name for name in os.listdir(directory)
+                  if name.endswith('.json') and not name.startswith('.'))
+
+
+def _store_path(directory: Optional[str] = None) -> str:
+    """Path of the store in directory (default ASSESSMENTS_DIR), migrating legacy files first."""
+    directory = directory or ASSESSMENTS_DIR
+    if os.path.isdir(directory) and _legacy_files(directory):
+        migrate_assessments(directory)
+    return os.path.join(directory, STORE_NAME)
+
+
+def _parse(line: bytes) -> Optional[Dict]:
+    """One store line as an assessment, or None for a blank or torn line."""
+    try:
+        record = json.loads(line)
+    except ValueError:
+        return None
+    return record if isinstance(record, dict) else None
+
+
+def _reverse_lines(f) -> Iterator[bytes]:
+    """Lines of a binary file, last first, read in TAIL_BLOCK steps from the end."""
+    pos = f.seek(0, os.SEEK_END)
+    remainder = b''
+    while pos > 0:
+        step = min(TAIL_BLOCK, pos)
+        pos -= step
+        f.seek(pos)
+        lines = (f.read(step) + remainder).split(b'\n')
+        remainder = lines.pop(0)
+        yield from reversed(lines)
+    yield remainder
+
+
+@contextmanager
+def _locked(path: str) -> Iterator:
+    """The store opened for appending, exclusively locked where fcntl is available."""
+    with open(path, 'ab+') as f:
+        if fcntl is not None:
+            fcntl.flock(f, fcntl.LOCK_EX)
+        yield f
+
+
+def _last_id(f) -> int:
+    """The highest id in the locked store (that of its last readable record)."""
+    for line in _reverse_lines(f):
+        record = _parse(line)
+        if record is not None and isinstance(record.get('id'), int):
+            return record['id']
+    return 0
+
+
+def _write_lines(f, data: str) -> None:
+    """Append complete lines to the locked store."""
+    payload = data.encode('utf-8')
+    # Never glue a new record onto a torn (unterminated) previous line
+    size = f.seek(0, os.SEEK_END)
+    if size:
+        f.seek(-1, os.SEEK_END)
+        if f.read(1) != b'\n':
+            payload = b'\n' + payload
+    f.write(payload)
+
+
+def _append_records(f, assessments: List[Dict]) -> List[int]:
+    """
+    Append assessments to the locked store, numbering them after the
+    last id in it. Each dict gets its 'id' set.
+    """
+    last_id = _last_id(f)
+    data = []
+    for offset, assessment in enumerate(assessments, 1):
+        assessment['id'] = last_id + offset
+        record = {'id': assessment['id'], **{k: v for k, v in assessment.items() if k != 'id'}}
+        data.append(_encode(record) + '\n')
+    _write_lines(f, ''.join(data))
+    return [assessment['id'] for assessment in assessments]
+
+
+def save_assessment(assessment: Dict, directory: Optional[str] = None) -> int:
     """
-    Save an assessment to a JSON file.
+    Append an assessment to the store and count it in the rollups.
     
     Args:
-        assessment: Assessment dictionary
-        directory: Directory to save to (defaults to state/assessments/)
+        assessment: Assessment dictionary (its 'id' is set)
+        directory: Directory holding the store (defaults to state/assessments/)
+        
+    Returns:
+        The new assessment's id
+    """
+    os.makedirs(directory or ASSESSMENTS_DIR, exist_ok=True)
+    with _locked(_store_path(directory)) as f:
+        rollups = _catch_up(_read_rollups(directory), f)
+        assessment_id = _append_records(f, [assessment])[0]
+        _fold_record(rollups, assessment)
+        rollups['size'] = f.tell()
+        _write_rollups(rollups, directory)
+    return assessment_id
+
+
+def load_assessments(directory: Optional[str] = None, limit: Optional[int] = None) -> List[Dict]:
+    """
+    Load assessments from the store, oldest first.
+    
+    Args:
+        directory: Directory holding the store (defaults to state/assessments/)
+        limit: Only the most recent N, read from the end of the file
+        
+    Returns:
+        List of assessment dictionaries
+    """
+    path = _store_path(directory)
+    if not os.path.exists(path):
+        return []
+    
+    assessments = []
+    with open(path, 'rb') as f:
+        if limit is None:
+            lines = iter(f)
+        else:
+            lines = _reverse_lines(f)
+        for line in lines:
+            if limit is not None and len(assessments) >= limit:
+                break
+            record = _parse(line)
+            if record is not None:
+                assessments.append(record)
+    
+    if limit is not None:
+        assessments.reverse()
+    return assessments
+
+
+def migrate_assessments(directory: Optional[str] = None) -> int:
+    """
+    Move per-assessment JSON files into the store.
+    
+    Files are appended in filename (timestamp) order with one write, then
+    moved into a migrated/ subdirectory. Unreadable files are moved there
+    too, without being imported, so the migration runs only once.
+    
+    Args:
+        directory: Directory holding the files and the store (defaults to state/assessments/)
+        
+    Returns:
+        Number of assessments migrated
+    """
+    directory = directory or ASSESSMENTS_DIR
+    if not os.path.isdir(directory):
+        return 0
+    
+    # Holding the store lock throughout means a concurrent migration
+    # finds the files already gone rather than importing them twice
+    with _locked(os.path.join(directory, STORE_NAME)) as f:
+        filenames = _legacy_files(directory)
+        migrated = []
+        for filename in filenames:
+            try:
+                with open(os.path.join(directory, filename), 'r', encoding='utf-8') as src:
+                    assessment = json.load(src)
+            except (json.JSONDecodeError, IOError):
+                continue
+            if isinstance(assessment, dict):
+                assessment.pop('id', None)
+                migrated.append(assessment)
+        if migrated:
+            _append_records(f, migrated)
+        
+        os.makedirs(os.path.join(directory, MIGRATED_DIR), exist_ok=True)
+        for filename in filenames:
+            os.replace(os.path.join(directory, filename), os.path.join(directory, MIGRATED_DIR, filename))
+    return len(migrated)
+
+
+def _rollups_path(directory: Optional[str] = None) -> str:
+    return os.path.join(directory or ASSESSMENTS_DIR, ROLLUPS_NAME)
+
+
+def _new_rollups(inode: int) -> Dict:
+    """Rollups of an empty store: which file they cover, and how much of it."""
+    rollups = {'inode': inode, 'size': 0, 'total': {}}
+    for window in ROLLUP_WINDOWS:
+        rollups[window] = {}
+    return rollups
+
+
+def _period_keys(timestamp: str, cache: Dict[str, Tuple[str, str]]) -> Optional[Tuple[str, str]]:
+    """(ISO week, month) keys of a timestamp, memoized by date."""
+    day = timestamp[:10]
+    keys = cache.get(day)
+    if keys is None:
+        try:
+            year, week = datetime.strptime(day, '%Y-%m-%d').isocalendar()[:2]
+        except ValueError:
+            return None
+        keys = cache[day] = ('%d-W%02d' % (year, week), day[:7])
+    return keys
+
+
+def _fold(rollups: Dict, timestamp: Optional[str], rating: str, recommendation: str,
+          effort: str, mask: int, count: int = 1, cache: Optional[Dict] = None) -> None:
+    """Add count assessments with the same outcome to the totals and their periods."""
+    buckets = [rollups['total']]
+    keys = _period_keys(timestamp, {} if cache is None else cache) if timestamp else None
+    if keys:
+        for window, key in zip(ROLLUP_WINDOWS, keys):
+            buckets.append(rollups[window].setdefault(key, {}))
+    for bucket in buckets:
+        bucket['count'] = bucket.get('count', 0) + count
+        for field, value in (('effectiveRating', rating), ('recommendation', recommendation),
+                             ('effortBand', effort)):
+            counts = bucket.setdefault(field, {})
+            counts[value] = counts.get(value, 0) + count
+        vectors = bucket.setdefault('riskVectors', {})
+        for vector in MASK_VECTORS[mask]:
+            vectors[vector] = vectors.get(vector, 0) + count
+
+
+def _fold_record(rollups: Dict, record: Dict, cache: Optional[Dict] = None) -> None:
+    """Add one stored assessment to the rollups."""
+    mask = record.get('riskMask')
+    if not isinstance(mask, int) or not 0 <= mask < len(MASK_VECTORS):
+        mask = risk_mask(record.get('riskVectors') or {})
+    _fold(rollups, record.get('timestamp'), record.get('effectiveRating', 'Unknown'),
+          record.get('recommendation', 'Unknown'), record.get('effortBand', 'Unknown'),
+          mask, cache=cache)
+
+
+def _read_rollups(directory: Optional[str] = None) -> Optional[Dict]:
+    try:
+        with open(_rollups_path(directory), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_rollups(rollups: Dict, directory: Optional[str] = None) -> None:
+    path = _rollups_path(directory)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(rollups, f, separators=(',', ':'))
+    os.replace(tmp_path, path)
+
+
+def _catch_up(rollups: Optional[Dict], f) -> Dict:
+    """
+    Bring rollups up to date with the open store: fold in records
+    appended since they were written (by a process that did not update
+    them, or that stopped before it could), or start over if the store
+    was replaced or truncated.
+    """
+    st = os.fstat(f.fileno())
+    if (not isinstance(rollups, dict) or rollups.get('inode') != st.st_ino
+            or not 0 <= rollups.get('size', -1) <= st.st_size):
+        rollups = _new_rollups(st.st_ino)
+    if rollups['size'] < st.st_size:
+        f.seek(rollups['size'])
+        data = f.read(st.st_size - rollups['size'])
+        # A record still being appended is left for later
+        complete = data[:data.rfind(b'\n') + 1]
+        cache = {}
+        for line in complete.splitlines():
+            record = _parse(line)
+            if record is not None:
+                _fold_record(rollups, record, cache)
+        rollups['size'] += len(complete)
+    return rollups
+
+
+def assessment_stats(directory: Optional[str] = None) -> Dict:
+    """
+    Assessment counts, overall and per ISO week and month.
+    
+    Read from the rollups file, which save_assessment() and batches keep
+    current; cost depends on the number of periods, not of assessments.
+    
+    Args:
+        directory: Directory holding the store (defaults to state/assessments/)
         
     Returns:
-        Path to saved file
+        {'total': bucket, 'week': {'2026-W07': bucket}, 'month': {'2026-02': bucket}}
+        where a bucket is {'count', 'effectiveRating': {rating: n},
+        'recommendation': {...}, 'effortBand': {...}, 'riskVectors': {vector: n}}
     """
-    if directory is None:
-        directory = os.path.join(
-            os.path.dirname(os.path.dirname(__file__)),
-            'state', 'assessments'
-        )
+    path = _store_path(directory)
+    if not os.path.exists(path):
+        return {window: {} for window in ('total',) + ROLLUP_WINDOWS}
+    rollups = _read_rollups(directory)
+    size = rollups.get('size') if isinstance(rollups, dict) else None
+    with open(path, 'rb') as f:
+        rollups = _catch_up(rollups, f)
+    if rollups['size'] != size:
+        _write_rollups(rollups, directory)
+    return {window: rollups[window] for window in ('total',) + ROLLUP_WINDOWS}
+
+
+def rebuild_rollups(directory: Optional[str] = None) -> Dict:
+    """
+    Recompute the rollups from every stored assessment.
     
-    os.makedirs(directory, exist_ok=True)
+    Returns:
+        The rebuilt statistics, as assessment_stats() returns them
+    """
+    try:
+        os.remove(_rollups_path(directory))
+    except FileNotFoundError:
+        pass
+    return assessment_stats(directory)
+
+
+def _truthy(value) -> bool:
+    if isinstance(value, str):
+        return value.strip().lower() in ('1', 'true', 'yes', 'y', 'x')
+    return bool(value)
+
+
+def _parse_mask(value) -> int:
+    """
+    Risk mask from a batch field: a separated string of names
+    ("authAuthz;publicApi"), a list of names, or a name -> bool dict.
     
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    filename = f"assessment_{timestamp}.json"
-    filepath = os.path.join(directory, filename)
+    Raises:
+        ValueError: On an unknown vector name
+    """
+    if isinstance(value, dict):
+        names = [name for name, active in value.items() if _truthy(active)]
+    elif isinstance(value, str):
+        names = [name for name in VECTOR_SEPARATORS.split(value) if name]
+    else:
+        names = list(value or [])
+    mask = 0
+    for name in names:
+        if name not in VECTOR_BITS:
+            raise ValueError(f"unknown risk vector {name!r}")
+        mask |= VECTOR_BITS[name]
+    return mask
+
+
+def read_proposals(path: str, fmt: Optional[str] = None) -> Iterator[Dict]:
+    """
+    Stream proposals from a CSV or JSON Lines file.
     
-    with open(filepath, 'w', encoding='utf-8') as f:
-        json.dump(assessment, f, indent=2)
+    Each row needs proposal, baseRating (or base) and effortBand (or
+    effort); active risk vectors come from a riskVectors (or risks) field
+    of separated names, or from one boolean column per vector. notes and
+    assessor are optional.
     
-    return filepath
+    Args:
+        path: Input file
+        fmt: 'csv' or 'jsonl' (default: from the file extension)
+        
+    Yields:
+        One dict per row, as read
+        
+    Raises:
+        ValueError: On a JSON Lines line that is not valid JSON
+    """
+    fmt = fmt or ('csv' if path.lower().endswith('.csv') else 'jsonl')
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        if fmt == 'csv':
+            yield from csv.DictReader(f)
+        else:
+            for line_num, line in enumerate(f, 1):
+                if line.strip():
+                    try:
+                        yield json.loads(line)
+                    except ValueError as e:
+                        raise ValueError(f"{path} line {line_num}: {e}")
 
 
-def load_assessments(directory: Optional[str] = None) -> List[Dict]:
+def _batch_outcome(base: str, mask: int, effort: str) -> Tuple:
+    """
+    Everything about an assessment that follows from its inputs: the
+    OUTCOMES entry and its JSON encoding (without braces).
     """
-    Load all assessments from the assessments directory.
+    outcome = OUTCOMES.get((base, mask, effort))
+    if outcome is None:
+        if base not in RATINGS:
+            raise ValueError(f"invalid base rating {base!r}")
+        raise ValueError(f"invalid effort band {effort!r}")
+    risk_modifier, effective_rating, recommendation = outcome
+    fragment = json.dumps({
+        'baseRating': base,
+        'riskVectors': vectors_from_mask(mask),
+        'riskMask': mask,
+        'riskModifier': risk_modifier,
+        'effectiveRating': effective_rating,
+        'effortBand': effort,
+        'recommendation': recommendation,
+    })[1:-1]
+    active = ';'.join(vector for vector, bit in VECTOR_BITS.items() if mask & bit)
+    return fragment, active, risk_modifier, effective_rating, recommendation
+
+
+def _fold_tallies(rollups: Dict, tallies: Dict[str, Dict[tuple, int]]) -> None:
+    """Count a batch in the rollups, once per distinct outcome per day."""
+    cache = {}
+    for day, tally in tallies.items():
+        outcomes = {}
+        for (base, mask, effort), n in tally.items():
+            _, effective_rating, recommendation = OUTCOMES[(base, mask, effort)]
+            key = (effective_rating, recommendation, effort, mask)
+            outcomes[key] = outcomes.get(key, 0) + n
+        for (effective_rating, recommendation, effort, mask), n in outcomes.items():
+            _fold(rollups, day, effective_rating, recommendation, effort, mask, n, cache)
+
+
+@contextmanager
+def _no_store() -> Iterator[None]:
+    """Stand-in for _locked() when a batch is not saved."""
+    yield None
+
+
+def assess_batch(
+    proposals: Iterable[Dict],
+    output: Optional[TextIO] = None,
+    fmt: str = 'jsonl',
+    save: bool = True,
+    directory: Optional[str] = None,
+    assessor: str = "Batch"
+) -> Tuple[int, List[str]]:
+    """
+    Assess many proposals in one pass.
+    
+    Rows are processed BATCH_CHUNK at a time: each chunk is written to
+    output and appended to the store with one write, under one lock held
+    for the whole batch so the ids are consecutive. The computed fields
+    come from OUTCOMES, and each distinct (base rating, risk mask, effort
+    band) is JSON-encoded once and counted in the rollups once per day.
     
     Args:
-        directory: Directory to load from
+        proposals: Rows as yielded by read_proposals()
+        output: Stream for the results, one per row (None for no output)
+        fmt: Output format, 'jsonl' (store records) or 'csv' (BATCH_CSV_FIELDS)
+        save: Append the assessments to the store
+        directory: Directory holding the store (defaults to state/assessments/)
+        assessor: Assessor recorded on rows that do not name one
         
     Returns:
-        List of assessment dictionaries
+        (number of proposals assessed, ["Row N: reason", ...] for rows skipped)
     """
-    if directory is None:
-        directory = os.path.join(
-            os.path.dirname(os.path.dirname(__file__)),
-            'state', 'assessments'
-        )
+    if fmt not in ('jsonl', 'csv'):
+        raise ValueError(f"Unknown output format: {fmt}")
+    writer = csv.writer(output, lineterminator='\n') if output is not None and fmt == 'csv' else None
+    if writer is not None:
+        writer.writerow(BATCH_CSV_FIELDS)
     
-    if not os.path.exists(directory):
-        return []
+    if save:
+        os.makedirs(directory or ASSESSMENTS_DIR, exist_ok=True)
+        store = _locked(_store_path(directory))
+    else:
+        store = _no_store()
     
-    assessments = []
-    for filename in sorted(os.listdir(directory)):
-        if filename.endswith('.json'):
-            filepath = os.path.join(directory, filename)
+    default_extra = ', "assessor": ' + _encode(assessor)
+    mask_cache = {}
+    outcome_cache = {}
+    errors = []
+    count = 0
+    with store as f:
+        next_id = _last_id(f) + 1 if f is not None else None
+        rollups = _catch_up(_read_rollups(directory), f) if f is not None else None
+        chunk = []
+        rows = []
+        timestamp = datetime.now().isoformat()
+        # Date -> (base, mask, effort) -> rows, folded into the rollups at the end
+        tallies = {}
+        tally = tallies.setdefault(timestamp[:10], {})
+        for row_num, row in enumerate(proposals, 1):
             try:
-                with open(filepath, 'r', encoding='utf-8') as f:
-                    assessment = json.load(f)
-                    assessment['_filename'] = filename
-                    assessments.append(assessment)
-            except (json.JSONDecodeError, IOError):
+                proposal = row.get('proposal')
+                if not proposal:
+                    raise ValueError("missing proposal")
+                raw = row.get('riskVectors', row.get('risks'))
+                if raw is None:
+                    raw = {key: row[key] for key in RISK_VECTORS if key in row}
+                if isinstance(raw, str):
+                    mask = mask_cache.get(raw)
+                    if mask is None:
+                        mask = mask_cache[raw] = _parse_mask(raw)
+                else:
+                    mask = _parse_mask(raw)
+                key = (row.get('baseRating') or row.get('base'), mask,
+                       row.get('effortBand') or row.get('effort'))
+                outcome = outcome_cache.get(key)
+                if outcome is None:
+                    outcome = outcome_cache[key] = _batch_outcome(*key)
+            except (ValueError, TypeError, AttributeError) as e:
+                errors.append(f"Row {row_num}: {e}")
                 continue
+            
+            head = '{' if next_id is None else '{"id": %d, ' % (next_id + count)
+            notes = row.get('notes')
+            row_assessor = row.get('assessor')
+            extra = default_extra
+            if notes or row_assessor:
+                extra = ', "assessor": ' + _encode(row_assessor or assessor)
+                if notes:
+                    extra = ', "notes": ' + _encode(notes) + extra
+            chunk.append('%s"proposal": %s, "timestamp": "%s", %s%s}\n' % (
+                head, _encode(proposal), timestamp, outcome[0], extra))
+            if writer is not None:
+                rows.append((next_id + count if next_id is not None else '', proposal, key[0],
+                             outcome[1], mask, outcome[2], outcome[3], key[2], outcome[4]))
+            tally[key] = tally.get(key, 0) + 1
+            count += 1
+            
+            if len(chunk) >= BATCH_CHUNK:
+                _flush_batch(f, output, writer, chunk, rows)
+                chunk, rows = [], []
+                timestamp = datetime.now().isoformat()
+                tally = tallies.setdefault(timestamp[:10], {})
+        _flush_batch(f, output, writer, chunk, rows)
+        if rollups is not None:
+            _fold_tallies(rollups, tallies)
+            rollups['size'] = f.tell()
+            _write_rollups(rollups, directory)
+    return count, errors
+
+
+def _flush_batch(f, output: Optional[TextIO], writer, chunk: List[str], rows: List[tuple]) -> None:
+    """Write one chunk of batch results to the store and the output."""
+    if not chunk:
+        return
+    data = ''.join(chunk)
+    if f is not None:
+        _write_lines(f, data)
+    if writer is not None:
+        writer.writerows(rows)
+    elif output is not None:
+        output.write(data)
+
+
+def _numpy():
+    """NumPy if it is installed, else None."""
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+def _popcount(x: int) -> int:
+    return x.bit_count() if hasattr(x, 'bit_count') else bin(x).count('1')
+
+
+def _bernoulli_bits(rng: random.Random, p: float, n: int) -> int:
+    """
+    n independent draws that are 1 with probability p, as the bits of one
+    integer.
     
-    return assessments
+    Each uniform random n-bit integer is one binary digit of a uniform
+    U for every draw at once; folding them in with | or & following the
+    binary digits of p, least significant first, leaves each bit set
+    exactly when U < p.
+    """
+    if p <= 0:
+        return 0
+    if p >= 1:
+        return (1 << n) - 1
+    digits = int(p * (1 << PROBABILITY_BITS))
+    bits = 0
+    for position in range(PROBABILITY_BITS):
+        if bits or digits >> position & 1:
+            draw = rng.getrandbits(n)
+            bits = draw | bits if digits >> position & 1 else draw & bits
+    return bits
+
+
+def _mask_counts_python(probabilities: List[float], samples: int,
+                        seed: Optional[int]) -> List[int]:
+    """Scenarios per risk mask, sampled bit-parallel with big integers."""
+    rng = random.Random(seed)
+    draws = [_bernoulli_bits(rng, p, samples) for p in probabilities]
+    # Split the set of scenarios on one vector at a time: 2**k leaves
+    groups = [(0, (1 << samples) - 1)]
+    for bit, drawn in zip(VECTOR_BITS.values(), draws):
+        split = []
+        for mask, scenarios in groups:
+            if scenarios & ~drawn:
+                split.append((mask, scenarios & ~drawn))
+            if scenarios & drawn:
+                split.append((mask | bit, scenarios & drawn))
+        groups = split
+    counts = [0] * (1 << len(VECTOR_BITS))
+    for mask, scenarios in groups:
+        counts[mask] = _popcount(scenarios)
+    return counts
+
+
+def _mask_counts_numpy(np, probabilities: List[float], samples: int,
+                       seed: Optional[int]) -> List[int]:
+    """Scenarios per risk mask, sampled SIMULATION_CHUNK rows at a time."""
+    rng = np.random.default_rng(seed)
+    # Vectors that always or never apply are the same bit in every row
+    certain = sum(bit for bit, p in zip(VECTOR_BITS.values(), probabilities) if p >= 1)
+    uncertain = [(bit, p) for bit, p in zip(VECTOR_BITS.values(), probabilities) if 0 < p < 1]
+    counts = np.zeros(1 << len(VECTOR_BITS), dtype=np.int64)
+    for start in range(0, samples, SIMULATION_CHUNK):
+        rows = min(SIMULATION_CHUNK, samples - start)
+        masks = np.full(rows, certain, dtype=np.uint8)
+        for bit, p in uncertain:
+            masks |= (rng.random(rows) < p).view(np.uint8) * np.uint8(bit)
+        counts += np.bincount(masks, minlength=len(counts))
+    return counts.tolist()
+
+
+def simulate_assessment(
+    base_rating: str,
+    probabilities: Dict[str, float],
+    effort_band: str,
+    samples: int = 100000,
+    seed: Optional[int] = None,
+    use_numpy: Optional[bool] = None
+) -> Dict:
+    """
+    Monte Carlo what-if: sample scenarios of uncertain risk vectors and
+    tally the resulting ratings and recommendations.
+    
+    Each scenario draws every vector independently with its probability
+    and is reduced to a risk mask; masks are counted, then each distinct
+    mask is rated once through OUTCOMES (the same logic as
+    calculate_effective_rating). Sampling is vectorized with NumPy when
+    installed, else bit-parallel over Python integers.
+    
+    Args:
+        base_rating: Base rating (F0-F5)
+        probabilities: Vector name -> probability it applies (0-1); vectors
+                       not given never apply
+        effort_band: Effort magnitude (S/M/L/XL)
+        samples: Number of scenarios
+        seed: Seed for reproducible results (per engine: NumPy and the
+              fallback draw different streams)
+        use_numpy: Force the engine (default: NumPy if installed)
+        
+    Returns:
+        {'samples', 'engine', 'ratings': {rating: count},
+         'recommendations': {recommendation: count}, 'meanModifier'}
+         
+    Raises:
+        ValueError: On an unknown rating, effort band or vector, or a
+                    probability outside 0-1
+    """
+    if base_rating not in RATINGS:
+        raise ValueError(f"Invalid base rating: {base_rating}")
+    if effort_band not in EFFORT_BANDS:
+        raise ValueError(f"Invalid effort band: {effort_band}")
+    for vector, p in probabilities.items():
+        if vector not in RISK_VECTORS:
+            raise ValueError(f"Unknown risk vector: {vector}")
+        if not 0 <= p <= 1:
+            raise ValueError(f"Probability for {vector} must be between 0 and 1: {p}")
+    if samples < 1:
+        raise ValueError("samples must be at least 1")
+    
+    np = _numpy() if use_numpy is not False else None
+    if use_numpy and np is None:
+        raise ValueError("NumPy is not installed")
+    vector_probabilities = [float(probabilities.get(vector, 0.0)) for vector in RISK_VECTORS]
+    if np is not None:
+        counts = _mask_counts_numpy(np, vector_probabilities, samples, seed)
+    else:
+        counts = _mask_counts_python(vector_probabilities, samples, seed)
+    
+    ratings = {rating: 0 for rating in RATINGS}
+    recommendations = {}
+    modifier_total = 0.0
+    for mask, count in enumerate(counts):
+        if count:
+            risk_modifier, effective_rating, recommendation = OUTCOMES[(base_rating, mask, effort_band)]
+            ratings[effective_rating] += count
+            recommendations[recommendation] = recommendations.get(recommendation, 0) + count
+            modifier_total += risk_modifier * count
+    
+    return {
+        'samples': samples,
+        'engine': 'numpy' if np is not None else 'python',
+        'ratings': ratings,
+        'recommendations': recommendations,
+        'meanModifier': modifier_total / samples,
+    }
 
 
 # Interactive assessment helpers
@@ -2,100 +2,895 @@
 Backup and restore functionality for MORNINGSTAR state.
 
 The Debugger insisted on this. Rightfully so.
+
+File contents live once each in a content-addressed store,
+backups/objects/<2 hex>/<sha256> (read-only); a backup is a directory holding only
+backup_metadata.json, whose manifest maps each backed-up path to its
+object. Unchanged files are recognized by their stat signature and
+neither read nor copied again, so a backup costs about as much as the
+bytes that changed since the last one. Backups made before the object
+store (full copies of state/) are still listed and restored.
+
+Restore builds the new state/ next to the old one and swaps it into
+place with a rename, so state/ is never missing or half-written.
+
+A backup can instead be a single compressed tar file,
+backups/backup_<timestamp>.tar.gz (or .tar.xz), with the metadata as its
+first member so it can be read without decompressing the rest.
+
+Every backup's metadata records the SHA-256 of each file it holds (for
+manifest backups, the object names), so verify_backups() can check them
+and diff_backups() can compare two backups without reading contents.
 """
 
+import io
 import os
+import sys
 import shutil
 import json
+import ctypes
+import hashlib
+import tarfile
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Optional, List, Dict
+from typing import Optional, List, Dict, Iterator, Iterable, Tuple, Callable
 
 # Base directory
 BASE_DIR = os.path.dirname(os.path.dirname(__file__))
 BACKUP_DIR = os.path.join(BASE_DIR, 'backups')
 STATE_DIR = os.path.join(BASE_DIR, 'state')
+CHANGELOG_FILE = os.path.join(BASE_DIR, 'CHANGELOG.md')
+
+METADATA_FILE = 'backup_metadata.json'
+
+# Single-file backups: compression -> file suffix
+ARCHIVE_FORMATS = {'gz': '.tar.gz', 'xz': '.tar.xz'}
+
+# Content-addressed blobs, plus the stat signature of each source file at
+# the time it was last stored (so unchanged files are not re-read)
+OBJECTS_DIR = os.path.join(BACKUP_DIR, 'objects')
+STAT_CACHE = os.path.join(OBJECTS_DIR, '.stat-cache.json')
+
+# One JSON line per backup added ({"op": "add", ...}) or removed
+# ({"op": "remove", "name"}), so listing and lookup read one file instead
+# of every backup's metadata. Each line also records BACKUP_DIR's mtime
+# after the change; a mismatch means backups were added or removed behind
+# the catalog's back, and it is rebuilt from the directories
+CATALOG_FILE = os.path.join(BACKUP_DIR, 'catalog.jsonl')
+
+# In-memory catalog: {'path', 'size' (bytes of CATALOG_FILE applied),
+# 'entries' (name -> entry, oldest first), 'dirMtime', 'lines'}
+_catalog: Optional[dict] = None
 
+# Files the tools only ever replace (write a temp file, then rename) and
+# never modify in place, so a restored copy can be a hardlink to its
+# object. Everything else (the journal, SQLite files, anything edited by
+# hand) is copied.
+LINKABLE = {os.path.join('state', 'current.md'), 'CHANGELOG.md'}
 
-def create_backup(description: Optional[str] = None) -> str:
+# Generational retention: keep the newest backup in each of the last N
+# hours, days, ISO weeks, and months
+RETENTION_POLICY = {'hourly': 24, 'daily': 14, 'weekly': 8, 'monthly': 12}
+
+# Bucket key of a backup's time for each retention granularity
+_BUCKETS = {
+    'hourly': lambda t: (t.year, t.month, t.day, t.hour),
+    'daily': lambda t: (t.year, t.month, t.day),
+    'weekly': lambda t: tuple(t.isocalendar()[:2]),
+    'monthly': lambda t: (t.year, t.month),
+}
+
+# Seconds between automatic backups taken after state writes; 0 disables
+AUTO_BACKUP_INTERVAL = int(os.environ.get('MORNINGSTAR_AUTO_BACKUP_INTERVAL', '0'))
+AUTO_BACKUP_STAMP = os.path.join(BACKUP_DIR, '.last-auto-backup')
+# No need to look at AUTO_BACKUP_STAMP again before this time
+_next_auto_check = 0.0
+
+# Caches and indexes under state/ (paths relative to it) that are rebuilt on
+# demand; backing them up would store a new copy on nearly every write
+DERIVED_FILES = {'.current.cache.json', '.current.index.db', '.changelog-ledger', '.changelog-offsets.json',
+                 os.path.join('assessments', '.rollups.json')}
+
+
+def _iter_sources() -> Iterator[Tuple[str, str]]:
+    """
+    Files a backup covers: everything under state/ plus CHANGELOG.md.
+
+    Returns:
+        (path relative to the backup, absolute path) pairs
+    """
+    if os.path.exists(STATE_DIR):
+        for root, dirs, files in os.walk(STATE_DIR):
+            dirs.sort()
+            for file in sorted(files):
+                if os.path.relpath(os.path.join(root, file), STATE_DIR) in DERIVED_FILES:
+                    continue
+                path = os.path.join(root, file)
+                yield os.path.relpath(path, BASE_DIR), path
+    if os.path.exists(CHANGELOG_FILE):
+        yield 'CHANGELOG.md', CHANGELOG_FILE
+
+
+def _state_dirs() -> List[str]:
+    """Directories under state/ (relative to BASE_DIR), so empty ones survive a restore."""
+    if not os.path.exists(STATE_DIR):
+        return []
+    dirs = []
+    for root, subdirs, _ in os.walk(STATE_DIR):
+        subdirs.sort()
+        dirs.append(os.path.relpath(root, BASE_DIR))
+    return dirs
+
+
+def _object_path(digest: str) -> str:
+    return os.path.join(OBJECTS_DIR, digest[:2], digest)
+
+
+def _store_object(path: str) -> str:
+    """
+    Copy a file into the object store, hashing it in the same pass.
+
+    Returns:
+        The file's SHA-256 hex digest (its object name)
+    """
+    os.makedirs(OBJECTS_DIR, exist_ok=True)
+    hasher = hashlib.sha256()
+    tmp_path = os.path.join(OBJECTS_DIR, f".tmp-{os.getpid()}-{os.path.basename(path)}")
+    with open(path, 'rb') as src, open(tmp_path, 'wb') as dst:
+        for chunk in iter(lambda: src.read(1024 * 1024), b''):
+            hasher.update(chunk)
+            dst.write(chunk)
+    digest = hasher.hexdigest()
+    object_path = _object_path(digest)
+    if os.path.exists(object_path):
+        os.remove(tmp_path)
+    else:
+        os.makedirs(os.path.dirname(object_path), exist_ok=True)
+        # Read-only, so a hardlinked restore cannot be written through
+        os.chmod(tmp_path, 0o444)
+        os.replace(tmp_path, object_path)
+    return digest
+
+
+def _read_stat_cache() -> Dict[str, list]:
+    try:
+        with open(STAT_CACHE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_stat_cache(cache: Dict[str, list]) -> None:
+    tmp_path = f"{STAT_CACHE}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(cache, f)
+    os.replace(tmp_path, STAT_CACHE)
+
+
+def _new_backup_name() -> str:
+    """A fresh, timestamped backup name (suffixed if the second is taken)."""
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    backup_name = f"backup_{timestamp}"
+    suffix = 1
+    while any(os.path.exists(os.path.join(BACKUP_DIR, backup_name + ext))
+              for ext in ('',) + tuple(ARCHIVE_FORMATS.values())):
+        suffix += 1
+        backup_name = f"backup_{timestamp}_{suffix}"
+    return backup_name
+
+
+def _new_backup_path() -> str:
+    """A fresh, timestamped backup directory."""
+    backup_path = os.path.join(BACKUP_DIR, _new_backup_name())
+    os.makedirs(backup_path)
+    return backup_path
+
+
+def is_archive(backup_path: str) -> bool:
+    """Whether a backup is a single compressed tar file rather than a directory."""
+    return backup_path.endswith(tuple(ARCHIVE_FORMATS.values()))
+
+
+def create_backup(description: Optional[str] = None, auto: bool = False) -> str:
     """
     Create a backup of current state.
     
+    Only files whose size, mtime or inode changed since they were last
+    stored are read; everything else reuses its existing object.
+    
     Args:
         description: Optional description for this backup
+        auto: Mark it as an automatic backup (see maybe_auto_backup())
         
     Returns:
         Path to backup directory
     """
     os.makedirs(BACKUP_DIR, exist_ok=True)
+    # Bring the catalog up to date before this backup's entry is appended
+    _load_catalog()
+    backup_path = _new_backup_path()
     
-    # Create timestamped backup directory
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    backup_name = f"backup_{timestamp}"
-    backup_path = os.path.join(BACKUP_DIR, backup_name)
-    
-    os.makedirs(backup_path, exist_ok=True)
-    
-    # Copy state directory
-    state_backup = os.path.join(backup_path, 'state')
-    if os.path.exists(STATE_DIR):
-        shutil.copytree(STATE_DIR, state_backup)
-    
-    # Copy changelog
-    changelog_src = os.path.join(BASE_DIR, 'CHANGELOG.md')
-    if os.path.exists(changelog_src):
-        shutil.copy2(changelog_src, os.path.join(backup_path, 'CHANGELOG.md'))
+    stat_cache = _read_stat_cache()
+    objects = {}
+    sizes = {}
+    for rel_path, path in _iter_sources():
+        st = os.stat(path)
+        signature = [st.st_size, st.st_mtime_ns, st.st_ino]
+        cached = stat_cache.get(rel_path)
+        digest = None
+        if cached and cached[:3] == signature:
+            try:
+                # Touching the object marks it in use, so a concurrent
+                # gc_objects() leaves it alone; not when the file is a
+                # restored hardlink to it, whose mtime would change too
+                if os.stat(_object_path(cached[3])).st_ino != st.st_ino:
+                    os.utime(_object_path(cached[3]))
+                digest = cached[3]
+            except FileNotFoundError:
+                pass
+        if digest is None:
+            digest = _store_object(path)
+            stat_cache[rel_path] = signature + [digest]
+        objects[rel_path] = digest
+        sizes[rel_path] = st.st_size
     
     # Create backup metadata
     metadata = {
         'timestamp': datetime.now().isoformat(),
         'description': description or 'Manual backup',
-        'files_backed_up': []
+        'auto': auto,
+        'files_backed_up': list(objects),
+        'objects': objects,
+        'sizes': sizes,
+        'dirs': _state_dirs(),
     }
     
-    for root, dirs, files in os.walk(backup_path):
-        for file in files:
-            rel_path = os.path.relpath(os.path.join(root, file), backup_path)
-            metadata['files_backed_up'].append(rel_path)
-    
-    metadata_path = os.path.join(backup_path, 'backup_metadata.json')
+    metadata_path = os.path.join(backup_path, METADATA_FILE)
     with open(metadata_path, 'w', encoding='utf-8') as f:
         json.dump(metadata, f, indent=2)
     
+    _write_stat_cache({k: v for k, v in stat_cache.items() if k in objects})
+    _append_catalog([_catalog_entry(os.path.basename(backup_path), metadata)])
     return backup_path
 
 
-def list_backups() -> List[Dict]:
+def _source_hashes(sources: List[Tuple[str, str]]) -> Dict[str, Optional[str]]:
     """
-    List all available backups.
+    SHA-256 of each source file for an archive's metadata, which has to be
+    written before the files themselves. Files the stat cache already
+    knows are not read; the rest are hashed in parallel.
+    """
+    stat_cache = _read_stat_cache()
+    hashes = {}
+    pending = {}
+    for rel_path, path in sources:
+        st = os.stat(path)
+        cached = stat_cache.get(rel_path)
+        if cached and cached[:3] == [st.st_size, st.st_mtime_ns, st.st_ino]:
+            hashes[rel_path] = cached[3]
+        else:
+            pending[rel_path] = path
+    digests = hash_files(pending.values())
+    for rel_path, path in pending.items():
+        hashes[rel_path] = digests[path]
+    return hashes
+
+
+def create_archive_backup(description: Optional[str] = None, compression: str = 'gz') -> str:
+    """
+    Create a backup as one compressed tar file.
     
+    state/, CHANGELOG.md and the metadata (first member) are streamed
+    straight into the archive; nothing is staged on disk first.
+    
+    Args:
+        description: Optional description for this backup
+        compression: 'gz' or 'xz'
+        
     Returns:
-        List of backup metadata dicts
+        Path to the archive
     """
+    if compression not in ARCHIVE_FORMATS:
+        raise ValueError(f"Unknown compression: {compression}")
+    os.makedirs(BACKUP_DIR, exist_ok=True)
+    _load_catalog()
+    backup_path = os.path.join(BACKUP_DIR, _new_backup_name() + ARCHIVE_FORMATS[compression])
+    
+    sources = list(_iter_sources())
+    metadata = {
+        'timestamp': datetime.now().isoformat(),
+        'description': description or 'Manual backup',
+        'files_backed_up': [rel_path for rel_path, _ in sources],
+        'sizes': {rel_path: os.path.getsize(path) for rel_path, path in sources},
+        'hashes': _source_hashes(sources),
+        'dirs': _state_dirs(),
+    }
+    
+    tmp_path = f"{backup_path}.tmp"
+    with open(tmp_path, 'xb') as f:
+        try:
+            with tarfile.open(fileobj=f, mode=f"w:{compression}") as tar:
+                data = json.dumps(metadata, indent=2).encode('utf-8')
+                info = tarfile.TarInfo(METADATA_FILE)
+                info.size = len(data)
+                info.mtime = int(time.time())
+                tar.addfile(info, io.BytesIO(data))
+                for rel_dir in metadata['dirs']:
+                    tar.add(os.path.join(BASE_DIR, rel_dir), arcname=rel_dir, recursive=False)
+                for rel_path, path in sources:
+                    tar.add(path, arcname=rel_path, recursive=False)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+    os.replace(tmp_path, backup_path)
+    
+    _append_catalog([_catalog_entry(os.path.basename(backup_path), metadata)])
+    return backup_path
+
+
+def _catalog_entry(name: str, metadata: Dict) -> Dict:
+    entry = {
+        'op': 'add',
+        'name': name,
+        'timestamp': metadata.get('timestamp', 'Unknown'),
+        'description': metadata.get('description', 'No description'),
+        'file_count': len(metadata.get('files_backed_up', [])),
+        'auto': metadata.get('auto', False),
+    }
+    if not is_archive(name):
+        # The objects a directory backup references, so gc_objects() can
+        # work from the catalog alone
+        entry['objects'] = sorted(set(metadata.get('objects', {}).values()))
+    return entry
+
+
+def _dir_mtime() -> int:
+    return os.stat(BACKUP_DIR).st_mtime_ns
+
+
+def _append_catalog(records: List[Dict]) -> None:
+    """Record backups added or removed, with one append."""
+    if not records:
+        return
+    # Open (and so create) the catalog before reading BACKUP_DIR's mtime;
+    # appending to an existing file does not change it
+    with open(CATALOG_FILE, 'a', encoding='utf-8') as f:
+        dir_mtime = _dir_mtime()
+        f.write(''.join(json.dumps(dict(record, dirMtime=dir_mtime)) + '\n' for record in records))
+
+
+def _apply(catalog: dict, data: str) -> None:
+    for line in data.splitlines():
+        record = json.loads(line)
+        if record.get('op') == 'add':
+            catalog['entries'].pop(record['name'], None)
+            catalog['entries'][record['name']] = {
+                k: v for k, v in record.items() if k not in ('op', 'dirMtime')}
+        elif record.get('op') == 'remove':
+            catalog['entries'].pop(record['name'], None)
+        catalog['dirMtime'] = record.get('dirMtime')
+        catalog['lines'] += 1
+
+
+def _load_catalog() -> Dict[str, Dict]:
+    """
+    The catalog as name -> entry, oldest first.
+    
+    Loaded once per process and topped up with lines appended since.
+    Rebuilt from the backup directories if it is missing, unreadable, or
+    out of step with BACKUP_DIR; compacted once removals dominate it.
+    """
+    global _catalog
     if not os.path.exists(BACKUP_DIR):
-        return []
+        return {}
+    try:
+        size = os.path.getsize(CATALOG_FILE)
+    except OSError:
+        return rebuild_catalog()
+    
+    if not (_catalog is not None and _catalog['path'] == CATALOG_FILE and size >= _catalog['size']):
+        _catalog = {'path': CATALOG_FILE, 'size': 0, 'entries': {}, 'dirMtime': None, 'lines': 0}
+    if size > _catalog['size']:
+        with open(CATALOG_FILE, 'rb') as f:
+            f.seek(_catalog['size'])
+            data = f.read(size - _catalog['size'])
+        # A line still being appended by another process is left for later
+        complete = data[:data.rfind(b'\n') + 1]
+        try:
+            _apply(_catalog, complete.decode('utf-8'))
+        except (ValueError, KeyError, TypeError, AttributeError):
+            return rebuild_catalog()
+        _catalog['size'] += len(complete)
     
-    backups = []
-    for name in sorted(os.listdir(BACKUP_DIR), reverse=True):
+    if _catalog['dirMtime'] != _dir_mtime():
+        return rebuild_catalog()
+    if _catalog['lines'] > 2 * len(_catalog['entries']) + 100:
+        _write_catalog(list(_catalog['entries'].values()))
+    return _catalog['entries']
+
+
+def _write_catalog(entries: List[Dict]) -> Dict[str, Dict]:
+    """Replace the catalog with the given entries, oldest first."""
+    global _catalog
+    tmp_path = f"{CATALOG_FILE}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(''.join(json.dumps(dict(entry, op='add')) + '\n' for entry in entries))
+    os.replace(tmp_path, CATALOG_FILE)
+    # The rename changed BACKUP_DIR's mtime; record the new one
+    _append_catalog([{'op': 'sync'}])
+    _catalog = None
+    return _load_catalog()
+
+
+def rebuild_catalog() -> Dict[str, Dict]:
+    """
+    Recreate the catalog by reading every backup's metadata.
+    
+    Returns:
+        name -> entry, oldest first
+    """
+    if not os.path.exists(BACKUP_DIR):
+        return {}
+    entries = []
+    for name in os.listdir(BACKUP_DIR):
         backup_path = os.path.join(BACKUP_DIR, name)
-        if not os.path.isdir(backup_path):
+        if not (os.path.isdir(backup_path) or is_archive(backup_path)) or backup_path == OBJECTS_DIR:
             continue
+        metadata = read_metadata(backup_path) or {'timestamp': 'Unknown', 'description': 'No metadata'}
+        entries.append(_catalog_entry(name, metadata))
+    entries.sort(key=lambda e: _name_order(e['name']))
+    return _write_catalog(entries)
+
+
+def _name_order(name: str) -> Tuple[str, int]:
+    """Sort key for backup_<date>_<time>[_<n>] names: time, then same-second suffix."""
+    for ext in ARCHIVE_FORMATS.values():
+        if name.endswith(ext):
+            name = name[:-len(ext)]
+    parts = name.split('_')
+    if len(parts) == 4 and parts[3].isdigit():
+        return '_'.join(parts[:3]), int(parts[3])
+    return name, 1
+
+
+def find_backup(identifier: str) -> Optional[Dict]:
+    """
+    Look up a backup by name or 1-based index (newest first), via the catalog.
+    
+    Returns:
+        The list_backups() entry, or None
+    """
+    for attempt in range(2):
+        entries = _load_catalog()
+        entry = None
+        if identifier.isdigit():
+            index = int(identifier) - 1
+            if 0 <= index < len(entries):
+                entry = list(entries.values())[-1 - index]
+        else:
+            entry = entries.get(identifier)
+        if entry is None:
+            return None
+        backup = dict(entry, path=os.path.join(BACKUP_DIR, entry['name']))
+        if os.path.exists(backup['path']):
+            return backup
+        # Listed but gone: the catalog is stale
+        rebuild_catalog()
+    return None
+
+
+def read_metadata(backup_path: str) -> Dict:
+    """
+    Load a backup's metadata (and manifest), or {} if it has none.
+    
+    For an archive only the first member is read and decompressed.
+    """
+    if is_archive(backup_path):
+        with tarfile.open(backup_path, 'r:*') as tar:
+            member = tar.next()
+            if member is None or member.name != METADATA_FILE:
+                return {}
+            return json.load(tar.extractfile(member))
+    metadata_path = os.path.join(backup_path, METADATA_FILE)
+    if not os.path.exists(metadata_path):
+        return {}
+    with open(metadata_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def backup_files(backup_path: str, metadata: Dict) -> Dict[str, str]:
+    """
+    Where each file of a backup is stored.
+    
+    Returns:
+        Path relative to BASE_DIR -> file holding its contents (an object
+        for manifest backups, the copy inside the backup directory for
+        older full-copy backups)
+    """
+    if 'objects' in metadata:
+        return {rel: _object_path(digest) for rel, digest in metadata['objects'].items()}
+    files = {}
+    for root, _, names in os.walk(backup_path):
+        for name in names:
+            path = os.path.join(root, name)
+            rel_path = os.path.relpath(path, backup_path)
+            if rel_path != METADATA_FILE:
+                files[rel_path] = path
+    return files
+
+
+def _hash_file(path: str) -> Optional[str]:
+    """SHA-256 hex digest of a file, or None if it cannot be read."""
+    hasher = hashlib.sha256()
+    try:
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                hasher.update(chunk)
+    except OSError:
+        return None
+    return hasher.hexdigest()
+
+
+def _hash_archive(backup_path: str) -> Dict[str, Optional[str]]:
+    """SHA-256 of every file member of an archive, in one streaming pass."""
+    hashes = {}
+    try:
+        with tarfile.open(backup_path, 'r:*') as tar:
+            for member in tar:
+                if not member.isfile() or member.name == METADATA_FILE:
+                    continue
+                hasher = hashlib.sha256()
+                with tar.extractfile(member) as src:
+                    for chunk in iter(lambda: src.read(1024 * 1024), b''):
+                        hasher.update(chunk)
+                hashes[member.name.replace('/', os.sep)] = hasher.hexdigest()
+    except (OSError, tarfile.TarError, EOFError):
+        # Truncated or corrupt: members not reached count as missing
+        pass
+    return hashes
+
+
+def hash_files(paths: Iterable[str], workers: Optional[int] = None) -> Dict[str, Optional[str]]:
+    """
+    SHA-256 of many files, hashed on a thread pool.
+    
+    hashlib and file reads release the GIL, so this scales across cores.
+    
+    Args:
+        paths: Files to hash (duplicates are hashed once)
+        workers: Pool size (defaults to ThreadPoolExecutor's)
+        
+    Returns:
+        Path -> hex digest, or None for files that could not be read
+    """
+    unique = list(dict.fromkeys(paths))
+    if len(unique) <= 1:
+        return {path: _hash_file(path) for path in unique}
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return dict(zip(unique, pool.map(_hash_file, unique)))
+
+
+def recorded_hashes(metadata: Dict) -> Optional[Dict[str, str]]:
+    """
+    The SHA-256 of each file as recorded when the backup was made, or
+    None for backups that predate recorded hashes.
+    """
+    if 'objects' in metadata:
+        return metadata['objects']
+    return metadata.get('hashes')
+
+
+def _resolve(identifier: str) -> Dict:
+    backup = find_backup(identifier)
+    if backup is None:
+        raise ValueError(f"Backup not found: {identifier}")
+    return backup
+
+
+def verify_backups(identifiers: Optional[List[str]] = None,
+                   workers: Optional[int] = None) -> List[Dict]:
+    """
+    Re-hash backed-up files and compare them with the recorded hashes.
+    
+    All files of all the backups are hashed on one thread pool: objects
+    shared between manifest backups once each, and every archive as one
+    streaming task.
+    
+    Args:
+        identifiers: Backup names or 1-based indexes (default: every backup)
+        workers: Pool size (defaults to ThreadPoolExecutor's)
         
-        metadata_path = os.path.join(backup_path, 'backup_metadata.json')
-        if os.path.exists(metadata_path):
-            with open(metadata_path, 'r', encoding='utf-8') as f:
-                metadata = json.load(f)
+    Returns:
+        Per backup: {'name', 'files', 'corrupt': [...], 'missing': [...],
+        'unverified': [...]} with paths relative to the project root;
+        'unverified' lists files of backups that recorded no hashes
+        
+    Raises:
+        ValueError: If an identifier matches no backup
+    """
+    if identifiers:
+        backups = [_resolve(identifier) for identifier in identifiers]
+    else:
+        backups = list_backups()
+    
+    jobs = []
+    for backup in backups:
+        metadata = read_metadata(backup['path'])
+        if is_archive(backup['path']):
+            files = None
+        else:
+            files = backup_files(backup['path'], metadata)
+        jobs.append((backup, metadata, files))
+    
+    paths = list(dict.fromkeys(path for _, _, files in jobs if files for path in files.values()))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        archive_hashes = {backup['path']: pool.submit(_hash_archive, backup['path'])
+                          for backup, _, files in jobs if files is None}
+        file_hashes = dict(zip(paths, pool.map(_hash_file, paths)))
+    
+    results = []
+    for backup, metadata, files in jobs:
+        if files is None:
+            actual = archive_hashes[backup['path']].result()
         else:
-            metadata = {'timestamp': 'Unknown', 'description': 'No metadata'}
+            actual = {rel: file_hashes[path] for rel, path in files.items()}
+        expected = recorded_hashes(metadata)
+        rel_paths = sorted(set(metadata.get('files_backed_up', [])) | set(actual))
+        result = {'name': backup['name'], 'files': len(rel_paths),
+                  'corrupt': [], 'missing': [], 'unverified': []}
+        for rel_path in rel_paths:
+            digest = actual.get(rel_path)
+            if digest is None:
+                result['missing'].append(rel_path)
+            elif expected is None or rel_path not in expected:
+                result['unverified'].append(rel_path)
+            elif digest != expected[rel_path]:
+                result['corrupt'].append(rel_path)
+        results.append(result)
+    return results
+
+
+def diff_backups(a: str, b: str, workers: Optional[int] = None) -> Dict[str, List[str]]:
+    """
+    Compare two backups by their recorded hashes.
+    
+    No file contents are read unless a backup predates recorded hashes,
+    in which case its files are hashed (in parallel) first.
+    
+    Args:
+        a: Older backup, by name or 1-based index
+        b: Newer backup, by name or 1-based index
+        workers: Pool size for hashing old backups
+        
+    Returns:
+        {'added': [...], 'removed': [...], 'changed': [...], 'unchanged': [...]}
         
-        backups.append({
-            'name': name,
-            'path': backup_path,
-            'timestamp': metadata.get('timestamp', 'Unknown'),
-            'description': metadata.get('description', 'No description'),
-            'file_count': len(metadata.get('files_backed_up', []))
-        })
+    Raises:
+        ValueError: If either backup does not exist
+    """
+    hashes = []
+    for identifier in (a, b):
+        backup = _resolve(identifier)
+        metadata = read_metadata(backup['path'])
+        recorded = recorded_hashes(metadata)
+        if recorded is None and is_archive(backup['path']):
+            recorded = _hash_archive(backup['path'])
+        elif recorded is None:
+            files = backup_files(backup['path'], metadata)
+            digests = hash_files(files.values(), workers)
+            recorded = {rel: digests[path] for rel, path in files.items()}
+        hashes.append(recorded)
+    
+    old, new = hashes
+    return {
+        'added': sorted(set(new) - set(old)),
+        'removed': sorted(set(old) - set(new)),
+        'changed': sorted(p for p in set(old) & set(new) if old[p] != new[p]),
+        'unchanged': sorted(p for p in set(old) & set(new) if old[p] == new[p]),
+    }
+
+
+def read_backup_file(identifier: str, rel_path: str) -> Optional[bytes]:
+    """
+    Contents of one file as stored in a backup, or None if it holds no
+    such file. For an archive the members before it are skipped over.
+    """
+    backup = _resolve(identifier)
+    if is_archive(backup['path']):
+        with tarfile.open(backup['path'], 'r:*') as tar:
+            for member in tar:
+                if member.isfile() and member.name.replace('/', os.sep) == rel_path:
+                    with tar.extractfile(member) as src:
+                        return src.read()
+        return None
+    path = backup_files(backup['path'], read_metadata(backup['path'])).get(rel_path)
+    if path is None:
+        return None
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+def _place(src: str, dst: str, rel_path: str) -> None:
+    """Put a backed-up file at dst: hardlinked when LINKABLE, else copied."""
+    if rel_path in LINKABLE:
+        try:
+            if os.stat(src).st_mode & 0o222:
+                os.chmod(src, 0o444)
+            os.link(src, dst)
+            return
+        except OSError:
+            # Different filesystem, or links unsupported
+            pass
+    shutil.copyfile(src, dst)
+
+
+def _exchange(a: str, b: str) -> bool:
+    """
+    Atomically swap two directories (renameat2 with RENAME_EXCHANGE).
+    
+    Returns:
+        False where the platform or filesystem does not support it
+    """
+    if not sys.platform.startswith('linux'):
+        return False
+    try:
+        renameat2 = ctypes.CDLL(None, use_errno=True).renameat2
+    except (OSError, AttributeError, TypeError):
+        return False
+    at_fdcwd, rename_exchange = -100, 2
+    return renameat2(at_fdcwd, os.fsencode(a), at_fdcwd, os.fsencode(b), rename_exchange) == 0
+
+
+def _place_files(backup_path: str, metadata: Dict, changelog_tmp: str) -> Callable[[str], bool]:
+    """
+    Filler for _restore() from a directory backup: links or copies each
+    file from the object store (or the legacy copy) into place.
+    """
+    files = backup_files(backup_path, metadata)
+    
+    def fill(staging: str) -> bool:
+        restores_state = ('state' in metadata.get('dirs', [])
+                          or os.path.isdir(os.path.join(backup_path, 'state')))
+        for rel_dir in metadata.get('dirs', []):
+            os.makedirs(os.path.join(staging, os.path.relpath(rel_dir, 'state')), exist_ok=True)
+        for rel_path, src in files.items():
+            if rel_path == 'CHANGELOG.md':
+                _place(src, changelog_tmp, rel_path)
+            elif rel_path.startswith('state' + os.sep):
+                dst = os.path.join(staging, os.path.relpath(rel_path, 'state'))
+                os.makedirs(os.path.dirname(dst), exist_ok=True)
+                _place(src, dst, rel_path)
+                restores_state = True
+        return restores_state
+    return fill
+
+
+def _extract_archive(backup_path: str, changelog_tmp: str) -> Callable[[str], bool]:
+    """
+    Filler for _restore() from an archive: one streaming pass over its
+    members, writing state/ members into staging and CHANGELOG.md to
+    changelog_tmp. Links, devices, and paths outside those are skipped.
+    """
+    def fill(staging: str) -> bool:
+        restores_state = False
+        with tarfile.open(backup_path, 'r:*') as tar:
+            for member in tar:
+                parts = member.name.split('/')
+                if '..' in parts or member.name.startswith('/'):
+                    continue
+                if member.name == 'CHANGELOG.md' and member.isfile():
+                    dst = changelog_tmp
+                elif parts[0] == 'state':
+                    dst = os.path.join(staging, *parts[1:])
+                    restores_state = True
+                else:
+                    continue
+                if member.isdir():
+                    os.makedirs(dst, exist_ok=True)
+                elif member.isfile():
+                    os.makedirs(os.path.dirname(dst), exist_ok=True)
+                    with tar.extractfile(member) as src, open(dst, 'wb') as out:
+                        shutil.copyfileobj(src, out, 1024 * 1024)
+        return restores_state
+    return fill
+
+
+def _restore(fill: Callable[[str], bool], changelog_tmp: str) -> Tuple[bool, bool]:
+    """
+    Replace STATE_DIR (and CHANGELOG.md) with backed-up copies.
+    
+    fill(staging) writes the backed-up state/ into the empty staging
+    directory and CHANGELOG.md to changelog_tmp, returning whether the
+    backup holds a state/ at all. The staging tree is then exchanged with
+    STATE_DIR in one rename; where that is unsupported, the old directory
+    is renamed aside and the new one renamed in, leaving state/ absent
+    only between two renames.
+    
+    Returns:
+        (state restored, changelog restored)
+    """
+    staging = os.path.join(BASE_DIR, f".state-restore-{os.getpid()}")
+    for leftover in (staging, changelog_tmp):
+        if os.path.isdir(leftover):
+            shutil.rmtree(leftover)
+        elif os.path.exists(leftover):
+            os.remove(leftover)
+    try:
+        os.mkdir(staging)
+        restores_state = fill(staging)
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        if os.path.exists(changelog_tmp):
+            os.remove(changelog_tmp)
+        raise
     
-    return backups
+    restores_changelog = os.path.exists(changelog_tmp)
+    if restores_changelog:
+        os.replace(changelog_tmp, CHANGELOG_FILE)
+    if not restores_state:
+        shutil.rmtree(staging)
+    else:
+        _swap_in(staging)
+    return restores_state, restores_changelog
+
+
+def _swap_in(staging: str) -> None:
+    """Make staging the new STATE_DIR and remove the old one."""
+    if not os.path.exists(STATE_DIR):
+        os.rename(staging, STATE_DIR)
+        return
+    if not _exchange(staging, STATE_DIR):
+        previous = f"{staging}.old"
+        os.rename(STATE_DIR, previous)
+        os.rename(staging, STATE_DIR)
+        staging = previous
+    # staging now holds the state that was replaced
+    shutil.rmtree(staging)
+
+
+def gc_objects() -> int:
+    """
+    Delete objects no backup refers to any more.
+    
+    References come from the catalog, so no backup's metadata is read;
+    a catalog written before entries listed their objects is rebuilt
+    once. Objects touched in the last hour are kept, since a backup being
+    created right now may not be in the catalog yet.
+    
+    Returns:
+        Number of objects removed
+    """
+    if not os.path.exists(OBJECTS_DIR):
+        return 0
+    entries = _load_catalog()
+    if any('objects' not in entry and not is_archive(entry['name']) for entry in entries.values()):
+        entries = rebuild_catalog()
+    referenced = set()
+    for entry in entries.values():
+        referenced.update(entry.get('objects', ()))
+    
+    cutoff = datetime.now().timestamp() - 3600
+    removed = 0
+    for prefix in os.scandir(OBJECTS_DIR):
+        if not prefix.is_dir():
+            continue
+        for entry in os.scandir(prefix.path):
+            if entry.name not in referenced and entry.stat().st_mtime < cutoff:
+                os.remove(entry.path)
+                removed += 1
+    return removed
+
+
+def list_backups() -> List[Dict]:
+    """
+    List all available backups.
+    
+    Returns:
+        List of backup metadata dicts
+    """
+    return [dict(entry, path=os.path.join(BACKUP_DIR, entry['name']))
+            for entry in reversed(list(_load_catalog().values()))]
 
 
 def restore_backup(backup_identifier: str, confirm: bool = False) -> bool:
@@ -109,23 +904,12 @@ def restore_backup(backup_identifier: str, confirm: bool = False) -> bool:
     Returns:
         True if restore succeeded
     """
-    backups = list_backups()
-    
-    if not backups:
+    if not _load_catalog():
         print("No backups available.")
         return False
     
     # Find backup by name or index
-    backup = None
-    if backup_identifier.isdigit():
-        index = int(backup_identifier) - 1
-        if 0 <= index < len(backups):
-            backup = backups[index]
-    else:
-        for b in backups:
-            if b['name'] == backup_identifier:
-                backup = b
-                break
+    backup = find_backup(backup_identifier)
     
     if not backup:
         print(f"Backup not found: {backup_identifier}")
@@ -148,19 +932,15 @@ def restore_backup(backup_identifier: str, confirm: bool = False) -> bool:
     safety_backup = create_backup(description="Pre-restore safety backup")
     print(f"Safety backup created: {safety_backup}")
     
-    # Restore state directory
-    state_backup = os.path.join(backup_path, 'state')
-    if os.path.exists(state_backup):
-        if os.path.exists(STATE_DIR):
-            shutil.rmtree(STATE_DIR)
-        shutil.copytree(state_backup, STATE_DIR)
+    changelog_tmp = f"{CHANGELOG_FILE}.restore"
+    if is_archive(backup_path):
+        fill = _extract_archive(backup_path, changelog_tmp)
+    else:
+        fill = _place_files(backup_path, read_metadata(backup_path), changelog_tmp)
+    restored_state, restored_changelog = _restore(fill, changelog_tmp)
+    if restored_state:
         print("State directory restored.")
-    
-    # Restore changelog
-    changelog_backup = os.path.join(backup_path, 'CHANGELOG.md')
-    changelog_dst = os.path.join(BASE_DIR, 'CHANGELOG.md')
-    if os.path.exists(changelog_backup):
-        shutil.copy2(changelog_backup, changelog_dst)
+    if restored_changelog:
         print("Changelog restored.")
     
     print(f"\n✓ Restore complete from: {backup['name']}")
@@ -178,23 +958,12 @@ def delete_backup(backup_identifier: str, confirm: bool = False) -> bool:
     Returns:
         True if deletion succeeded
     """
-    backups = list_backups()
-    
-    if not backups:
+    if not _load_catalog():
         print("No backups available.")
         return False
     
     # Find backup
-    backup = None
-    if backup_identifier.isdigit():
-        index = int(backup_identifier) - 1
-        if 0 <= index < len(backups):
-            backup = backups[index]
-    else:
-        for b in backups:
-            if b['name'] == backup_identifier:
-                backup = b
-                break
+    backup = find_backup(backup_identifier)
     
     if not backup:
         print(f"Backup not found: {backup_identifier}")
@@ -207,7 +976,9 @@ def delete_backup(backup_identifier: str, confirm: bool = False) -> bool:
             print("Deletion cancelled.")
             return False
     
-    shutil.rmtree(backup['path'])
+    _remove_backup(backup['path'])
+    _append_catalog([{'op': 'remove', 'name': backup['name']}])
+    gc_objects()
     print(f"Backup deleted: {backup['name']}")
     return True
 
@@ -228,13 +999,133 @@ def prune_backups(keep: int = 10) -> int:
         return 0
     
     to_delete = backups[keep:]  # backups are sorted newest-first
-    deleted = 0
+    return _delete_many(to_delete)
+
+
+def _delete_many(to_delete: List[Dict]) -> int:
+    """Remove backups with one catalog append and one object collection."""
+    removed = []
     
     for backup in to_delete:
         try:
-            shutil.rmtree(backup['path'])
-            deleted += 1
+            _remove_backup(backup['path'])
+            removed.append({'op': 'remove', 'name': backup['name']})
         except Exception as e:
             print(f"Failed to delete {backup['name']}: {e}")
     
+    deleted = len(removed)
+    if deleted:
+        _append_catalog(removed)
+        gc_objects()
     return deleted
+
+
+def _remove_backup(backup_path: str) -> None:
+    """Delete one backup: a single unlink for archives."""
+    if is_archive(backup_path):
+        os.remove(backup_path)
+    else:
+        shutil.rmtree(backup_path)
+
+
+def _backup_time(backup: Dict) -> Optional[datetime]:
+    try:
+        return datetime.fromisoformat(backup['timestamp'])
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+def select_retained(backups: List[Dict], policy: Optional[Dict[str, int]] = None) -> set:
+    """
+    Names of the backups a generational policy keeps.
+    
+    One pass over the backups, newest first: a backup is kept when it is
+    the newest one in a bucket (hour, day, ISO week, month) that the policy
+    still has room for. Backups without a readable timestamp are kept; the
+    pass stops early once every granularity is full.
+    
+    Args:
+        backups: list_backups() entries, newest first
+        policy: Granularity -> number of buckets (defaults to RETENTION_POLICY)
+    """
+    policy = RETENTION_POLICY if policy is None else policy
+    last_bucket = {granularity: None for granularity in policy}
+    kept_buckets = {granularity: 0 for granularity in policy}
+    retained = set()
+    open_slots = sum(policy.values())
+    for backup in backups:
+        when = _backup_time(backup)
+        if when is None:
+            retained.add(backup['name'])
+            continue
+        for granularity, count in policy.items():
+            bucket = _BUCKETS[granularity](when)
+            if bucket != last_bucket[granularity] and kept_buckets[granularity] < count:
+                last_bucket[granularity] = bucket
+                kept_buckets[granularity] += 1
+                open_slots -= 1
+                retained.add(backup['name'])
+        if open_slots <= 0:
+            # Every granularity is full: the rest can only be undated backups
+            retained.update(b['name'] for b in backups if _backup_time(b) is None)
+            break
+    return retained
+
+
+def apply_retention(policy: Optional[Dict[str, int]] = None, auto_only: bool = False,
+                    dry_run: bool = False) -> List[str]:
+    """
+    Delete backups a generational retention policy does not keep.
+    
+    Args:
+        policy: Granularity -> number of buckets (defaults to RETENTION_POLICY)
+        auto_only: Consider only automatic backups; manual ones are never removed
+        dry_run: Report what would be deleted without deleting it
+        
+    Returns:
+        Names of the backups deleted (or that would be)
+    """
+    backups = [b for b in list_backups() if b.get('auto') or not auto_only]
+    retained = select_retained(backups, policy)
+    to_delete = [b for b in backups if b['name'] not in retained]
+    if not dry_run:
+        _delete_many(to_delete)
+    return [b['name'] for b in to_delete]
+
+
+def maybe_auto_backup() -> Optional[str]:
+    """
+    Take an automatic backup if AUTO_BACKUP_INTERVAL has passed since the last.
+    
+    Called after every state write. Between backups this costs nothing
+    within a process and one stat() of AUTO_BACKUP_STAMP across processes.
+    Each automatic backup is followed by generational retention over the
+    automatic backups.
+    
+    Returns:
+        Path of the new backup, or None
+    """
+    global _next_auto_check
+    if AUTO_BACKUP_INTERVAL <= 0:
+        return None
+    now = time.time()
+    if now < _next_auto_check:
+        return None
+    try:
+        last = os.stat(AUTO_BACKUP_STAMP).st_mtime
+    except OSError:
+        last = 0
+    if now - last < AUTO_BACKUP_INTERVAL:
+        _next_auto_check = last + AUTO_BACKUP_INTERVAL
+        return None
+    
+    # Claim the slot first, so a failing backup is retried next interval,
+    # not on every write
+    os.makedirs(BACKUP_DIR, exist_ok=True)
+    with open(AUTO_BACKUP_STAMP, 'w', encoding='utf-8') as f:
+        f.write(datetime.now().isoformat())
+    _next_auto_check = now + AUTO_BACKUP_INTERVAL
+    
+    path = create_backup(description="Automatic backup", auto=True)
+    apply_retention(auto_only=True)
+    return path
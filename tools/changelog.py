@@ -5,13 +5,59 @@ The court maintains a living record of its proceedings.
 Each session's verdicts, changes, and warnings are inscribed for posterity.
 """
 
+import hashlib
+import json
+import mmap
 import os
 import re
+import shutil
+import time
+import uuid
+from contextlib import contextmanager
 from datetime import datetime
-from typing import Optional
+from typing import Optional, List, Dict, Tuple, Iterable, Callable
 
 CHANGELOG_FILE = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'CHANGELOG.md')
 
+# Content hashes of entries already in [Unreleased], one per line; rebuilt
+# from the changelog when missing
+LEDGER_FILE = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'state', '.changelog-ledger')
+
+# Byte offsets of the released version headings in CHANGELOG.md, keyed
+# to its stat stamp (safe to delete). JSON Lines: {"stamp", "head"} first,
+# so the head size is one short line away, then one [heading, offset] per
+# version
+OFFSETS_FILE = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'state', '.changelog-offsets.json')
+
+# One file per entry under changelog.d/<category>/, merged into
+# CHANGELOG.md by release_version(); opt in per call or for every call
+FRAGMENT_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'changelog.d')
+FRAGMENTS_ENABLED = os.environ.get('MORNINGSTAR_CHANGELOG_FRAGMENTS') == '1'
+
+# Released versions beyond the newest CHANGELOG_KEEP are moved to one file
+# each under changelog/archive/ (listed in index.json); 0 keeps them all
+ARCHIVE_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'changelog', 'archive')
+ARCHIVE_INDEX = os.path.join(ARCHIVE_DIR, 'index.json')
+CHANGELOG_KEEP = int(os.environ.get('MORNINGSTAR_CHANGELOG_KEEP', '0'))
+
+# Last line of CHANGELOG.md once versions have been archived
+ARCHIVE_POINTER = "*Earlier versions are archived in [changelog/archive/](changelog/archive/index.json).*\n"
+
+# "## [version] - date" heading of a released version
+VERSION_PATTERN = re.compile(r'^## \[([^\]]+)\](?:\s*-\s*(.*?))?\s*$')
+
+# Pending changelog content while a batch() is open; None outside a batch
+_batch: Optional[dict] = None
+
+# In-memory ledger: {'path', 'size' (bytes of LEDGER_FILE read), 'keys'}
+_ledger: Optional[dict] = None
+
+# Trailing " *(source)*" attribution of an entry line
+SOURCE_PATTERN = re.compile(r'\s\*\([^()]*\)\*$')
+
+# Description written by add_decision(): **topic**: decision — *Risk: risk[. rationale]*
+DECISION_PATTERN = re.compile(r'^\*\*(.+?)\*\*: (.*) — \*Risk: (.*?)(?:\. .*)?\*$')
+
 # Change categories following Keep a Changelog conventions
 CATEGORIES = {
     'added': 'Added',
@@ -30,14 +76,441 @@ def read_changelog() -> str:
     if not os.path.exists(CHANGELOG_FILE):
         return _create_initial_changelog()
     
-    with open(CHANGELOG_FILE, 'r') as f:
+    with open(CHANGELOG_FILE, 'r', encoding='utf-8') as f:
         return f.read()
 
 
 def write_changelog(content: str) -> None:
-    """Write the changelog to disk."""
-    with open(CHANGELOG_FILE, 'w') as f:
+    """Write the changelog to disk atomically."""
+    tmp_path = f"{CHANGELOG_FILE}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
         f.write(content)
+    os.replace(tmp_path, CHANGELOG_FILE)
+    version_offsets()
+
+
+def _stamp(st: os.stat_result) -> List[int]:
+    return [st.st_ino, st.st_size, st.st_mtime_ns]
+
+
+def _read_offsets(stamp: List[int]) -> Optional[Tuple[int, Optional[bytes]]]:
+    """
+    The cached head size and version lines, if recorded for this stamp.
+
+    Returns:
+        (head size, remaining lines of OFFSETS_FILE as raw bytes), or None
+        if the cache is missing or stale
+    """
+    try:
+        with open(OFFSETS_FILE, 'rb') as f:
+            meta = json.loads(f.readline())
+            if meta.get('stamp') != stamp:
+                return None
+            return meta['head'], f.read()
+    except (OSError, ValueError, KeyError, AttributeError):
+        return None
+
+
+def _write_offsets(stamp: List[int], head: int, lines: bytes) -> None:
+    os.makedirs(os.path.dirname(OFFSETS_FILE), exist_ok=True)
+    tmp_path = f"{OFFSETS_FILE}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(json.dumps({"stamp": stamp, "head": head}).encode('utf-8') + b'\n')
+        f.write(lines)
+    os.replace(tmp_path, OFFSETS_FILE)
+
+
+def _offset_lines(offsets: List[Tuple[str, int]], base: int) -> bytes:
+    """Serialize (heading, offset) pairs relative to base."""
+    return ''.join(json.dumps([heading, offset - base]) + '\n' for heading, offset in offsets).encode('utf-8')
+
+
+def _scan_headings(data, base: int = 0) -> List[Tuple[str, int]]:
+    """(heading line, byte offset) of every version heading in data."""
+    offsets = []
+    pos = 0 if data[:4] == b'## [' else data.find(b'\n## [')
+    while pos != -1:
+        start = pos if data[pos:pos + 4] == b'## [' else pos + 1
+        if data[start + 4:start + 5].isdigit():
+            line_end = data.find(b'\n', start)
+            line = data[start:line_end if line_end != -1 else len(data)]
+            offsets.append((bytes(line).decode('utf-8').rstrip(), base + start))
+        pos = data.find(b'\n## [', start)
+    return offsets
+
+
+def version_offsets() -> List[Tuple[str, int]]:
+    """
+    Byte offsets of the released version headings in CHANGELOG.md.
+
+    Served from OFFSETS_FILE while the changelog is unchanged; otherwise
+    the file is scanned once (via mmap, no per-line Python work) and the
+    result cached. Offsets are cached relative to the end of the head, so
+    adding to [Unreleased] only has to update the head size.
+
+    Returns:
+        (heading line, offset) pairs, newest version first
+    """
+    try:
+        st = os.stat(CHANGELOG_FILE)
+    except OSError:
+        return []
+    stamp = _stamp(st)
+    cached = _read_offsets(stamp)
+    if cached is not None:
+        head, lines = cached
+        return [(heading, head + offset)
+                for heading, offset in (json.loads(line) for line in lines.splitlines())]
+
+    if st.st_size == 0:
+        offsets = []
+    else:
+        with open(CHANGELOG_FILE, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            offsets = _scan_headings(mm)
+    head = offsets[0][1] if offsets else st.st_size
+    _write_offsets(stamp, head, _offset_lines(offsets, head))
+    return offsets
+
+
+def _head_size(source) -> int:
+    """
+    Bytes before the first released version heading of an open changelog.
+
+    Taken from the offsets cache when it matches the file, otherwise read
+    line by line up to the heading; the file past it is never read.
+    """
+    cached = _read_offsets(_stamp(os.fstat(source.fileno())))
+    if cached is not None:
+        return cached[0]
+    source.seek(0)
+    size = 0
+    for line in source:
+        if line.startswith(b'## [') and line[4:5].isdigit():
+            break
+        size += len(line)
+    return size
+
+
+def _load() -> 'Changelog':
+    """Current changelog, including changes pending in a batch."""
+    if _batch is not None:
+        if _batch['changelog'] is None:
+            _batch['changelog'] = _open_changelog()
+        return _batch['changelog']
+    return _open_changelog()
+
+
+def _release(changelog: 'Changelog') -> None:
+    """Close a changelog from _load() that will not be stored, unless a batch holds it."""
+    if _batch is None or _batch['changelog'] is not changelog:
+        changelog.close()
+
+
+def _open_changelog() -> 'Changelog':
+    if not os.path.exists(CHANGELOG_FILE):
+        return Changelog(_create_initial_changelog())
+    return Changelog.from_file(CHANGELOG_FILE)
+
+
+def _store(changelog: 'Changelog') -> None:
+    """Write the changelog, or hold it in memory until the open batch ends."""
+    if _batch is not None:
+        _batch['changelog'] = changelog
+    else:
+        _save(changelog)
+
+
+def _save(changelog: 'Changelog') -> None:
+    """
+    Write a changelog to CHANGELOG_FILE atomically.
+
+    A changelog opened with Changelog.from_file() whose released versions
+    were never needed is written as its new head followed by the old
+    file's remaining bytes, copied without decoding, and the cached
+    version offsets are carried over rather than rescanned.
+    """
+    source = changelog._source
+    if source is None:
+        write_changelog(str(changelog))
+        return
+
+    head = (changelog.head + changelog.unreleased_text()).encode('utf-8')
+    # Versions released since loading, in front of the unread tail
+    released = changelog._tail.encode('utf-8')
+    cached = _read_offsets(_stamp(os.fstat(source.fileno())))
+    tmp_path = f"{CHANGELOG_FILE}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(head)
+        f.write(released)
+        source.seek(changelog._tail_offset)
+        shutil.copyfileobj(source, f, 1024 * 1024)
+        f.flush()
+        stamp = _stamp(os.fstat(f.fileno()))
+    changelog.close()
+    os.replace(tmp_path, CHANGELOG_FILE)
+
+    if cached is None:
+        version_offsets()
+        return
+    lines = cached[1]
+    if released:
+        old = [json.loads(line) for line in lines.splitlines()]
+        lines = (_offset_lines(_scan_headings(released), 0)
+                 + _offset_lines([(h, o + len(released)) for h, o in old], 0))
+    _write_offsets(stamp, len(head), lines)
+
+
+@contextmanager
+def batch():
+    """
+    Apply any number of changelog updates with a single read and write.
+    
+    Inside the block, add_entry() and friends modify one in-memory
+    Changelog; it is serialized and written once when the block exits
+    normally and discarded if the block raises. Nested batches join the
+    outer one. Callbacks registered with after_batch() run once it has
+    been written.
+    """
+    global _batch, _ledger
+    if _batch is not None:
+        yield
+        return
+    
+    _batch = {'changelog': None, 'keys': [], 'fragments': [], 'merged': [], 'keep': 0,
+              'reset': False, 'after': []}
+    try:
+        yield
+        if _batch['changelog'] is not None and _batch['changelog'].modified:
+            _save(_batch['changelog'])
+        for category, entry in _batch['fragments']:
+            _write_fragment(category, entry)
+        _remove_fragments(_batch['merged'])
+        if _batch['reset']:
+            # Released: the ledger is rebuilt from the changelog as written
+            _reset_ledger()
+        else:
+            _append_ledger(_batch['keys'])
+        if _batch['keep']:
+            archive_versions(_batch['keep'])
+        after = _batch['after']
+    except BaseException:
+        # Entries that were never written must not be remembered as recorded
+        if _batch['reset']:
+            # The in-memory keys no longer match the unchanged ledger file
+            _ledger = None
+        elif _ledger is not None:
+            _ledger['keys'].difference_update(_batch['keys'])
+        raise
+    finally:
+        if _batch['changelog'] is not None:
+            # Saved or not, the batch is done with it
+            _batch['changelog'].close()
+        _batch = None
+    for callback in after:
+        callback()
+
+
+def after_batch(callback: Callable[[], None]) -> None:
+    """
+    Run callback once the open batch() has been written, or now if no
+    batch is open. A callback registered twice in one batch runs once.
+    """
+    if _batch is None:
+        callback()
+    elif callback not in _batch['after']:
+        _batch['after'].append(callback)
+
+
+def entry_key(category: str, description: str) -> str:
+    """
+    Content hash identifying a changelog entry.
+
+    Attribution is left out, so the same work item logged mid-session and
+    again at session end is one entry.
+    """
+    data = f"{category.lower()}\0{description.strip()}".encode('utf-8')
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def decision_key(topic: str, decision: str, risk: str) -> str:
+    """
+    Entry key of a court decision.
+
+    Keyed on topic, ruling and risk only: decisions read back from
+    current.md have lost their rationale, but are the same ruling.
+    """
+    return entry_key('decided', f"{topic}\0{decision}\0{risk}")
+
+
+def _ledger_keys() -> set:
+    """
+    The set of entry keys already in [Unreleased].
+
+    Loaded once per process and topped up with lines appended since;
+    rebuilt from the changelog if LEDGER_FILE is missing or was rewritten.
+    """
+    global _ledger
+    try:
+        size = os.path.getsize(LEDGER_FILE)
+    except OSError:
+        size = None
+
+    if _ledger is not None and _ledger['path'] == LEDGER_FILE and size is not None:
+        if size == _ledger['size']:
+            return _ledger['keys']
+        if size > _ledger['size']:
+            with open(LEDGER_FILE, 'r', encoding='utf-8') as f:
+                f.seek(_ledger['size'])
+                _ledger['keys'].update(line.strip() for line in f if line.strip())
+            _ledger['size'] = size
+            return _ledger['keys']
+
+    if size is None:
+        rebuild_ledger()
+        return _ledger['keys']
+
+    with open(LEDGER_FILE, 'r', encoding='utf-8') as f:
+        keys = {line.strip() for line in f if line.strip()}
+    _ledger = {'path': LEDGER_FILE, 'size': size, 'keys': keys}
+    return keys
+
+
+def _append_ledger(keys: List[str]) -> None:
+    """Persist newly recorded entry keys with a single append."""
+    if not keys:
+        return
+    os.makedirs(os.path.dirname(LEDGER_FILE), exist_ok=True)
+    with open(LEDGER_FILE, 'a', encoding='utf-8') as f:
+        f.write(''.join(f"{key}\n" for key in keys))
+        size = f.tell()
+    if _ledger is not None and _ledger['path'] == LEDGER_FILE:
+        _ledger['size'] = size
+
+
+def rebuild_ledger() -> int:
+    """
+    Recompute the ledger from the entries currently in [Unreleased]
+    and in changelog.d/ fragments.
+
+    Returns:
+        Number of distinct entries
+    """
+    global _ledger
+    keys = set()
+    headings = {name: key for key, name in CATEGORIES.items()}
+    for title, entries in get_unreleased_summary().items():
+        category = headings.get(title, title.lower())
+        for entry in entries:
+            description = SOURCE_PATTERN.sub('', entry)
+            match = DECISION_PATTERN.match(description) if category == 'decided' else None
+            if match:
+                keys.add(decision_key(*match.groups()))
+            else:
+                keys.add(entry_key(category, description))
+
+    os.makedirs(os.path.dirname(LEDGER_FILE), exist_ok=True)
+    tmp_path = f"{LEDGER_FILE}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(''.join(f"{key}\n" for key in sorted(keys)))
+        size = f.tell()
+    os.replace(tmp_path, LEDGER_FILE)
+    _ledger = {'path': LEDGER_FILE, 'size': size, 'keys': keys}
+    return len(keys)
+
+
+def _reset_ledger() -> None:
+    """Forget all recorded keys; the next lookup rebuilds from the changelog."""
+    global _ledger
+    _ledger = None
+    if os.path.exists(LEDGER_FILE):
+        os.remove(LEDGER_FILE)
+
+
+def _write_fragment(category: str, entry: str) -> str:
+    """
+    Write one entry as its own file under FRAGMENT_DIR/<category>/.
+
+    Names sort by creation time and are unique per process, and the file
+    is renamed into place complete, so concurrent writers never collide
+    and readers never see a partial fragment.
+
+    Returns:
+        Path of the fragment
+    """
+    directory = os.path.join(FRAGMENT_DIR, category.lower())
+    os.makedirs(directory, exist_ok=True)
+    name = f"{time.time_ns():020d}-{os.getpid()}-{uuid.uuid4().hex[:8]}.md"
+    path = os.path.join(directory, name)
+    tmp_path = os.path.join(directory, f".{name}.tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(entry)
+    os.replace(tmp_path, path)
+    return path
+
+
+def iter_fragments() -> Iterable[Tuple[str, str]]:
+    """
+    List pending fragments, oldest first.
+
+    Returns:
+        (category, path) pairs
+    """
+    if not os.path.isdir(FRAGMENT_DIR):
+        return []
+    fragments = []
+    for category_dir in os.scandir(FRAGMENT_DIR):
+        if not category_dir.is_dir():
+            continue
+        for fragment in os.scandir(category_dir.path):
+            if fragment.name.endswith('.md') and not fragment.name.startswith('.'):
+                fragments.append((fragment.name, category_dir.name, fragment.path))
+    fragments.sort()
+    return [(category, path) for _, category, path in fragments]
+
+
+def _merge_fragments(changelog: 'Changelog', consume: bool = True) -> List[str]:
+    """
+    Add every pending fragment to changelog, in the order they were written.
+
+    Args:
+        changelog: Changelog to merge into
+        consume: Drop fragments an open batch has not written yet, since
+                 they are now part of changelog
+
+    Returns:
+        Paths of the merged fragments (removed once the changelog is saved)
+    """
+    merged = []
+    for category, path in iter_fragments():
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                entry = f.read()
+        except FileNotFoundError:
+            # Merged and removed by a concurrent release
+            continue
+        if entry.strip():
+            changelog.add(category, entry if entry.endswith('\n') else entry + '\n')
+        merged.append(path)
+    if _batch is not None:
+        # Fragments this batch has not written yet
+        for category, entry in _batch['fragments']:
+            changelog.add(category, entry)
+        if consume:
+            _batch['fragments'] = []
+    return merged
+
+
+def _remove_fragments(paths: List[str]) -> None:
+    """Delete merged fragments (and category directories left empty)."""
+    for path in paths:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        try:
+            os.rmdir(os.path.dirname(path))
+        except OSError:
+            pass
 
 
 def _create_initial_changelog() -> str:
@@ -78,6 +551,187 @@ def _find_unreleased_section(content: str) -> tuple[int, int]:
     return start, end
 
 
+class Changelog:
+    """
+    A parsed CHANGELOG.md.
+
+    The [Unreleased] section is split into category blocks that entries
+    are added to in O(1); everything around it (the preamble and every
+    released version) is kept as the original text and written back
+    unchanged. str() serializes the whole file once, producing exactly
+    what the equivalent sequence of single-entry splices would.
+
+    Changelog.from_file() reads only the head of the file (preamble and
+    [Unreleased]); the released versions behind it are read on first use
+    of tail, or never, if the changelog is only added to and saved.
+    """
+
+    def __init__(self, content: str):
+        self._source = None
+        self._tail_offset = 0
+        self.modified = False
+        start, end = _find_unreleased_section(content)
+        if start == -1:
+            # No [Unreleased] yet; created on the first add()
+            first_version = re.search(r'^## \[\d', content, re.MULTILINE)
+            split = first_version.start() if first_version else len(content)
+            self.head = content[:split]
+            self.tail = content[split:]
+            self.blocks = None
+            return
+
+        self.head = content[:start]
+        self.tail = content[end:]
+        # Category blocks: [title, whitespace after the heading, new entries
+        # (newest last), remaining original text]; title None is the text
+        # before the first category heading
+        self.blocks = []
+        parts = re.split(r'^### ', content[start:end], flags=re.MULTILINE)
+        if parts[0]:
+            self.blocks.append([None, '', [], parts[0]])
+        for part in parts[1:]:
+            title, newline, body = part.partition('\n')
+            lead = re.match(r'\s*\n', newline + body)
+            lead_text = lead.group(0) if lead else newline
+            self.blocks.append([title, lead_text, [], (newline + body)[len(lead_text):]])
+
+    @classmethod
+    def from_file(cls, path: str) -> 'Changelog':
+        """
+        Parse a changelog file, reading only up to its first released version.
+
+        Falls back to reading the whole file if [Unreleased] is not in the
+        head (e.g. it was placed below a released version).
+        """
+        source = open(path, 'rb')
+        try:
+            head_size = _head_size(source)
+            source.seek(0)
+            head = source.read(head_size).decode('utf-8')
+            if _find_unreleased_section(head)[0] == -1 and source.read(1):
+                source.seek(0)
+                return cls(source.read().decode('utf-8'))
+        except BaseException:
+            source.close()
+            raise
+        if head_size == os.fstat(source.fileno()).st_size:
+            source.close()
+            return cls(head)
+        changelog = cls(head)
+        changelog._source = source
+        changelog._tail_offset = head_size
+        return changelog
+
+    @property
+    def tail(self) -> str:
+        """Everything after [Unreleased]: the released versions."""
+        if self._source is not None:
+            self._source.seek(self._tail_offset)
+            self._tail += self._source.read().decode('utf-8')
+            self.close()
+        return self._tail
+
+    @tail.setter
+    def tail(self, value: str) -> None:
+        self.close()
+        self._tail = value
+
+    def close(self) -> None:
+        """Release the file a from_file() changelog reads its tail from."""
+        if self._source is not None:
+            self._source.close()
+            self._source = None
+
+    def add(self, category: str, entry: str) -> None:
+        """
+        Add a rendered entry line at the top of a category in [Unreleased].
+
+        Args:
+            category: Key from CATEGORIES (or a custom category name)
+            entry: The full line, e.g. "- Description *(Source)*\n"
+        """
+        title = CATEGORIES.get(category, category.title())
+        self.modified = True
+
+        if self.blocks is None:
+            if self.tail:
+                self.head += "## [Unreleased]\n\n"
+            else:
+                self.head += "\n## [Unreleased]\n\n"
+            self.blocks = []
+
+        for block in self.blocks:
+            # Matches the first heading whose text starts with the title, as
+            # the original '^### Title\s*\n' search did
+            if block[0] is not None and block[1] and block[0].rstrip() == title:
+                block[2].append(entry)
+                return
+        self.blocks.insert(0, [title, '\n', [entry], '\n'])
+
+    def add_many(self, entries: Iterable[Tuple[str, str]]) -> int:
+        """
+        Add many (category, entry line) pairs.
+
+        Returns:
+            Number of entries added
+        """
+        count = 0
+        for category, entry in entries:
+            self.add(category, entry)
+            count += 1
+        return count
+
+    def release(self, version: str, date: str) -> bool:
+        """
+        Turn [Unreleased] into a version section and open a new, empty one.
+
+        Returns:
+            False if there is no [Unreleased] section
+        """
+        if self.blocks is None:
+            return False
+        match = re.search(r'^## \[Unreleased\]\s*\n', self.head, re.MULTILINE)
+        # Prepended to the unread tail, if any, so releasing stays head-only
+        self._tail = f"## [{version}] - {date}\n" + self.head[match.end():] + self.unreleased_text() + self._tail
+        self.head = self.head[:match.start()] + "## [Unreleased]\n\n"
+        self.blocks = []
+        self.modified = True
+        return True
+
+    def unreleased_text(self) -> str:
+        """The body of the [Unreleased] section."""
+        if self.blocks is None:
+            return ''
+        parts = []
+        for title, lead, added, rest in self.blocks:
+            if title is not None:
+                parts.append(f"### {title}")
+            parts.append(lead)
+            parts.extend(reversed(added))
+            parts.append(rest)
+        return ''.join(parts)
+
+    def unreleased_summary(self) -> Dict[str, List[str]]:
+        """Category title -> entry texts in [Unreleased], top to bottom."""
+        summary = {}
+        current_category = None
+        for line in self.unreleased_text().split('\n'):
+            if line.startswith('### '):
+                current_category = line[4:].strip()
+                summary[current_category] = []
+            elif line.startswith('- ') and current_category:
+                summary[current_category].append(line[2:].strip())
+        return summary
+
+    def versions(self) -> List[Tuple[str, str]]:
+        """Released versions as (heading line, original section text), newest first."""
+        parts = re.split(r'^(?=## \[\d)', self.tail, flags=re.MULTILINE)
+        return [(part.split('\n', 1)[0], part) for part in parts if part.startswith('## [')]
+
+    def __str__(self) -> str:
+        return self.head + self.unreleased_text() + self.tail
+
+
 def _get_or_create_category_in_section(section_content: str, category: str) -> tuple[str, int]:
     """
     Find a category heading in section content, or determine where to add it.
@@ -102,59 +756,73 @@ def add_entry(
     category: str,
     description: str,
     source: Optional[str] = None,
-    to_unreleased: bool = True
-) -> None:
+    to_unreleased: bool = True,
+    key: Optional[str] = None,
+    fragment: Optional[bool] = None
+) -> bool:
     """
     Add a new entry to the changelog.
     
+    Entries already in [Unreleased] (same category and description,
+    whatever the source) are skipped without touching the file.
+    
     Args:
         category: One of 'added', 'changed', 'deprecated', 'removed', 'fixed', 
                   'security', 'decided', 'warned'
         description: The change description
         source: Optional attribution (e.g., personality name, session ID)
         to_unreleased: If True, add to [Unreleased]; otherwise add to latest version
-    """
-    content = read_changelog()
+        key: Ledger key to deduplicate on (defaults to entry_key())
+        fragment: Write the entry to changelog.d/ instead of rewriting
+                  CHANGELOG.md (defaults to FRAGMENTS_ENABLED)
     
+    Returns:
+        True if the entry was added, False if it was already recorded
+    """
+    key = key or entry_key(category, description)
+    keys = _ledger_keys()
+    if key in keys:
+        return False
+
     if source:
         entry = f"- {description} *({source})*\n"
     else:
         entry = f"- {description}\n"
     
-    start, end = _find_unreleased_section(content)
-    
-    if start == -1:
-        # No unreleased section, create one
-        # Find first version heading
-        first_version = re.search(r'^## \[\d', content, re.MULTILINE)
-        if first_version:
-            insert_at = first_version.start()
-            unreleased_section = f"## [Unreleased]\n\n### {CATEGORIES.get(category, category.title())}\n{entry}\n"
-            content = content[:insert_at] + unreleased_section + content[insert_at:]
-        else:
-            # No versions at all, append
-            content += f"\n## [Unreleased]\n\n### {CATEGORIES.get(category, category.title())}\n{entry}\n"
+    if fragment is None:
+        fragment = FRAGMENTS_ENABLED
+    if fragment and _batch is not None:
+        _batch['fragments'].append((category, entry))
+    elif fragment:
+        _write_fragment(category, entry)
     else:
-        section_content = content[start:end]
-        category_heading = f"### {CATEGORIES.get(category, category.title())}"
-        
-        # Check if category exists in section
-        pattern = rf'^{re.escape(category_heading)}\s*\n'
-        match = re.search(pattern, section_content, re.MULTILINE)
-        
-        if match:
-            # Insert after heading
-            insert_point = start + match.end()
-            content = content[:insert_point] + entry + content[insert_point:]
-        else:
-            # Add new category section at start of unreleased content
-            new_category = f"{category_heading}\n{entry}\n"
-            content = content[:start] + new_category + content[start:]
+        changelog = _load()
+        changelog.add(category, entry)
+        _store(changelog)
+    keys.add(key)
+    if _batch is not None:
+        _batch['keys'].append(key)
+    else:
+        _append_ledger([key])
+    return True
+
+
+def add_many(entries: Iterable[Tuple[str, ...]]) -> int:
+    """
+    Add many entries with one read and one write of the changelog.
     
-    write_changelog(content)
+    Args:
+        entries: (category, description) or (category, description, source)
+                 tuples, in the order they would be passed to add_entry()
+    
+    Returns:
+        Number of entries added (already-recorded ones are skipped)
+    """
+    with batch():
+        return sum(1 for entry in entries if add_entry(*entry))
 
 
-def add_decision(topic: str, decision: str, risk: str, rationale: Optional[str] = None) -> None:
+def add_decision(topic: str, decision: str, risk: str, rationale: Optional[str] = None) -> bool:
     """
     Record a court decision in the changelog.
     
@@ -163,25 +831,32 @@ def add_decision(topic: str, decision: str, risk: str, rationale: Optional[str]
         decision: The ruling
         risk: Risk level or notes
         rationale: Optional explanation
+    
+    Returns:
+        True if the decision was added, False if it was already recorded
     """
     if rationale and rationale != "See logs":
         description = f"**{topic}**: {decision} — *Risk: {risk}. {rationale}*"
     else:
         description = f"**{topic}**: {decision} — *Risk: {risk}*"
     
-    add_entry('decided', description, source="The Court")
+    return add_entry('decided', description, source="The Court",
+                     key=decision_key(topic, decision, risk))
 
 
-def add_prophet_vindication(prediction: str, outcome: str) -> None:
+def add_prophet_vindication(prediction: str, outcome: str) -> bool:
     """
     Record when the Prophet was proven right.
     
     Args:
         prediction: What the Prophet warned about
         outcome: What actually happened
+    
+    Returns:
+        True if the vindication was added, False if it was already recorded
     """
     description = f"The Prophet warned of *\"{prediction}\"* — and so it came to pass: {outcome}"
-    add_entry('warned', description, source="The Prophet, Vindicated")
+    return add_entry('warned', description, source="The Prophet, Vindicated")
 
 
 def add_work_completed(work_items: list[str], session_id: Optional[str] = None) -> None:
@@ -193,8 +868,7 @@ def add_work_completed(work_items: list[str], session_id: Optional[str] = None)
         session_id: Optional session identifier
     """
     source = f"Session {session_id}" if session_id else "Session"
-    for item in work_items:
-        add_entry('added', item, source=source)
+    add_many(('added', item, source) for item in work_items)
 
 
 def add_fix(description: str, source: Optional[str] = None) -> None:
@@ -207,36 +881,170 @@ def add_change(description: str, source: Optional[str] = None) -> None:
     add_entry('changed', description, source=source)
 
 
-def release_version(version: str, date: Optional[str] = None) -> None:
+def release_version(version: str, date: Optional[str] = None, keep: Optional[int] = None) -> None:
     """
     Convert the [Unreleased] section to a versioned release.
     
     Args:
         version: Version number (e.g., "1.0.0")
         date: Release date (defaults to today)
+        keep: Archive released versions beyond the newest `keep`
+              (defaults to CHANGELOG_KEEP; 0 keeps all)
     """
     if date is None:
         date = datetime.now().strftime("%Y-%m-%d")
     
-    content = read_changelog()
-    
-    # Find unreleased section
-    unreleased_pattern = r'^## \[Unreleased\]\s*\n'
-    match = re.search(unreleased_pattern, content, re.MULTILINE)
+    changelog = _load()
     
-    if not match:
+    # Replace [Unreleased] with version, add new empty unreleased
+    if changelog.blocks is None:
+        _release(changelog)
         print("No [Unreleased] section found.")
         return
+    merged = _merge_fragments(changelog)
+    changelog.release(version, date)
     
-    # Replace [Unreleased] with version, add new empty unreleased
-    new_version_heading = f"## [{version}] - {date}\n"
-    new_unreleased = "## [Unreleased]\n\n"
-    
-    content = content[:match.start()] + new_unreleased + new_version_heading + content[match.end():]
-    
-    write_changelog(content)
+    _store(changelog)
+    # Fragments go only once the changelog holding them is on disk
+    if _batch is not None:
+        _batch['merged'].extend(merged)
+    else:
+        _remove_fragments(merged)
+    # [Unreleased] is empty again, so nothing in it is a duplicate any more
+    if _batch is not None:
+        # Keys recorded earlier in the batch were released too; the ledger
+        # file is reset once the batch is written
+        _ledger_keys().clear()
+        _batch['keys'] = []
+        _batch['reset'] = True
+    else:
+        _reset_ledger()
     print(f"Released version {version}")
 
+    keep = CHANGELOG_KEEP if keep is None else keep
+    if keep and _batch is not None:
+        _batch['keep'] = keep
+    elif keep:
+        archive_versions(keep)
+
+
+def read_archive_index() -> List[Dict[str, str]]:
+    """
+    Load the changelog archive index.
+
+    Returns:
+        {version, date, file} entries, newest version first
+    """
+    if not os.path.exists(ARCHIVE_INDEX):
+        return []
+    with open(ARCHIVE_INDEX, 'r', encoding='utf-8') as f:
+        return json.load(f).get('versions', [])
+
+
+def _write_archive_index(versions: List[Dict[str, str]]) -> None:
+    tmp_path = f"{ARCHIVE_INDEX}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({"versions": versions}, f, indent=2)
+        f.write('\n')
+    os.replace(tmp_path, ARCHIVE_INDEX)
+
+
+def archive_versions(keep: int) -> List[str]:
+    """
+    Move released versions beyond the newest `keep` out of CHANGELOG.md.
+
+    Each version is written verbatim to ARCHIVE_DIR/<version>.md and listed
+    in ARCHIVE_INDEX before CHANGELOG.md is cut down, so an interruption
+    leaves a version in both places rather than in neither. Only the
+    archived byte range is read, located through version_offsets().
+
+    Args:
+        keep: Number of released versions to leave in CHANGELOG.md (at least 1)
+
+    Returns:
+        The archived versions, newest first
+    """
+    if keep < 1:
+        raise ValueError("keep must be at least 1")
+    offsets = version_offsets()
+    if len(offsets) <= keep:
+        return []
+
+    cut = offsets[keep][1]
+    with open(CHANGELOG_FILE, 'rb') as f:
+        kept = f.read(cut)
+        archived = f.read()
+    pointer = ARCHIVE_POINTER.encode('utf-8')
+    if archived.endswith(b'\n' + pointer):
+        archived = archived[:-len(pointer) - 1]
+
+    os.makedirs(ARCHIVE_DIR, exist_ok=True)
+    index = read_archive_index()
+    taken = {entry['file'] for entry in index}
+    new_entries = []
+    for i, (heading, offset) in enumerate(offsets[keep:]):
+        end = offsets[keep + i + 1][1] - cut if keep + i + 1 < len(offsets) else len(archived)
+        match = VERSION_PATTERN.match(heading)
+        version = match.group(1) if match else heading
+        date = (match.group(2) or '') if match else ''
+
+        stem = re.sub(r'[^\w.-]', '_', version)
+        filename = f"{stem}.md"
+        suffix = 1
+        while filename in taken:
+            suffix += 1
+            filename = f"{stem}_{suffix}.md"
+        taken.add(filename)
+
+        path = os.path.join(ARCHIVE_DIR, filename)
+        with open(f"{path}.tmp", 'wb') as f:
+            f.write(archived[offset - cut:end])
+        os.replace(f"{path}.tmp", path)
+        new_entries.append({"version": version, "date": date, "file": filename})
+    _write_archive_index(new_entries + index)
+
+    tmp_path = f"{CHANGELOG_FILE}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(kept + b'\n' + pointer)
+    os.replace(tmp_path, CHANGELOG_FILE)
+    version_offsets()
+    return [entry['version'] for entry in new_entries]
+
+
+def read_version(version: str) -> Optional[str]:
+    """
+    The section of one released version, from CHANGELOG.md or the archive.
+
+    Reads only that version's byte range (or archive file).
+
+    Args:
+        version: Version number as it appears in the heading (e.g. "1.0.0")
+
+    Returns:
+        The section text, starting with its "## [version]" heading, or None
+    """
+    offsets = version_offsets()
+    for i, (heading, offset) in enumerate(offsets):
+        match = VERSION_PATTERN.match(heading)
+        if match and match.group(1) == version:
+            with open(CHANGELOG_FILE, 'rb') as f:
+                f.seek(offset)
+                if i + 1 < len(offsets):
+                    section = f.read(offsets[i + 1][1] - offset).decode('utf-8')
+                else:
+                    section = f.read().decode('utf-8')
+                    if section.endswith('\n' + ARCHIVE_POINTER):
+                        section = section[:-len(ARCHIVE_POINTER) - 1]
+            return section
+
+    for entry in read_archive_index():
+        if entry['version'] == version:
+            path = os.path.join(ARCHIVE_DIR, entry['file'])
+            if os.path.exists(path):
+                with open(path, 'r', encoding='utf-8') as f:
+                    return f.read()
+    return None
+
 
 def get_unreleased_summary() -> dict:
     """
@@ -245,24 +1053,17 @@ def get_unreleased_summary() -> dict:
     Returns:
         Dict with category names as keys and lists of entries as values
     """
-    content = read_changelog()
-    start, end = _find_unreleased_section(content)
-    
-    if start == -1:
-        return {}
-    
-    section = content[start:end]
-    summary = {}
-    
-    current_category = None
-    for line in section.split('\n'):
-        if line.startswith('### '):
-            current_category = line[4:].strip()
-            summary[current_category] = []
-        elif line.startswith('- ') and current_category:
-            summary[current_category].append(line[2:].strip())
-    
-    return summary
+    changelog = _load()
+    try:
+        if iter_fragments() or (_batch is not None and _batch['fragments']):
+            # Merge pending fragments into a copy, as a release would; the
+            # summary needs only the head
+            summary = Changelog(changelog.head + changelog.unreleased_text())
+            _merge_fragments(summary, consume=False)
+            return summary.unreleased_summary()
+        return changelog.unreleased_summary()
+    finally:
+        _release(changelog)
 
 
 def format_session_changelog_entry(state: dict) -> str:
@@ -278,25 +1079,27 @@ def format_session_changelog_entry(state: dict) -> str:
     """
     entries_added = []
     
-    # Record decisions
+    # Record decisions (most were already logged by update_session; the
+    # ledger skips those)
     for decision in state.get('decisions', []):
-        add_decision(
+        if add_decision(
             topic=decision.get('topic', 'Unknown'),
             decision=decision.get('decision', 'Unknown'),
             risk=decision.get('risk', 'Unknown'),
             rationale=decision.get('rationale')
-        )
-        entries_added.append(f"Decision: {decision.get('topic')}")
+        ):
+            entries_added.append(f"Decision: {decision.get('topic')}")
     
     # Record prophet vindications
     for vindication in state.get('prophetVindications', []):
         # Vindications are stored as simple strings; parse if possible
         if ' — ' in vindication:
             prediction, outcome = vindication.split(' — ', 1)
-            add_prophet_vindication(prediction, outcome)
+            added = add_prophet_vindication(prediction, outcome)
         else:
-            add_entry('warned', vindication, source="The Prophet")
-        entries_added.append(f"Vindication: {vindication[:30]}...")
+            added = add_entry('warned', vindication, source="The Prophet")
+        if added:
+            entries_added.append(f"Vindication: {vindication[:30]}...")
     
     # Record completed work (from activeWork that's being closed out)
     work_items = state.get('activeWork', [])
@@ -306,7 +1109,7 @@ def format_session_changelog_entry(state: dict) -> str:
         for item in work_items:
             # Only log substantive work, not meta-tasks
             if item and not item.lower().startswith('initialize'):
-                add_entry('added', item, source=f"Session {session_marker}")
-                entries_added.append(f"Work: {item[:30]}...")
+                if add_entry('added', item, source=f"Session {session_marker}"):
+                    entries_added.append(f"Work: {item[:30]}...")
     
     return entries_added
@@ -1,17 +1,25 @@
 import click
+import difflib
 import os
+import json
 import glob as globlib
 from datetime import datetime
-from tools import session, state, validate, changelog, backup, export as export_module
+from tools import session, state, validate, changelog, backup, archive, export as export_module
 
 # Base directory for the project
 BASE_DIR = os.path.dirname(os.path.dirname(__file__))
 
 
 @click.group()
-def cli():
+@click.option('--no-cache', is_flag=True, help='Re-parse state/current.md instead of using the parse cache')
+@click.option('--backend', type=click.Choice(state.STATE_BACKENDS),
+              help='State storage backend (default: $MORNINGSTAR_STATE_BACKEND or markdown)')
+def cli(no_cache, backend):
     """MORNINGSTAR - Sardonic deliberative coding partner."""
-    pass
+    if no_cache:
+        state.CACHE_ENABLED = False
+    if backend:
+        state.STATE_BACKEND = backend
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -25,9 +33,39 @@ def init():
     click.echo("Morningstar session initialized.")
 
 
+# status --section names -> state keys
+STATUS_SECTIONS = {
+    'work': 'activeWork',
+    'decisions': 'decisions',
+    'issues': 'outstandingIssues',
+    'next': 'nextSession',
+}
+
+
+def _format_status_item(key, item):
+    if key == 'decisions':
+        return f"- {item.get('topic', 'Unknown')}: {item.get('decision', 'Unknown')}"
+    if key == 'outstandingIssues':
+        return f"- {item.get('issue', 'Unknown')} ({item.get('severity', 'Medium')})"
+    return f"- {item}"
+
+
 @cli.command()
-def status():
-    """Display current session status."""
+@click.option('--section', '-s', type=click.Choice(list(STATUS_SECTIONS)),
+              help='Show only this section (streams the state file)')
+@click.option('--limit', '-n', type=int, help='Show at most N items per section')
+def status(section, limit):
+    """Display current session status.
+    
+    With --section, only that part of the state is read, and reading stops
+    after --limit items.
+    """
+    if section:
+        key = STATUS_SECTIONS[section]
+        for item in state.iter_section(key, limit=limit):
+            click.echo(_format_status_item(key, item))
+        return
+
     s = state.read_state()
     if not s:
         click.echo("No active session.")
@@ -35,16 +73,16 @@ def status():
     
     click.echo(f"Last Updated: {s.get('lastUpdated')}")
     click.echo("\nActive Work:")
-    for w in s.get('activeWork', []):
-        click.echo(f"- {w}")
+    for w in s.get('activeWork', [])[:limit]:
+        click.echo(_format_status_item('activeWork', w))
     
     click.echo("\nDecisions Made:")
-    for d in s.get('decisions', []):
-        click.echo(f"- {d.get('topic', 'Unknown')}: {d.get('decision', 'Unknown')}")
+    for d in s.get('decisions', [])[:limit]:
+        click.echo(_format_status_item('decisions', d))
     
     click.echo("\nOutstanding Issues:")
-    for i in s.get('outstandingIssues', []):
-        click.echo(f"- {i.get('issue', 'Unknown')} ({i.get('severity', 'Medium')})")
+    for i in s.get('outstandingIssues', [])[:limit]:
+        click.echo(_format_status_item('outstandingIssues', i))
 
 
 @cli.command()
@@ -65,7 +103,7 @@ def update(work, decision, issue):
         if len(parts) >= 2:
             i = {"issue": parts[0], "severity": parts[1]}
             
-    session.update_session(work_item=work, decision=d, issue=i)
+    session.update_session(work_item=work, decision=d, issue=i, return_state=False)
 
 
 @cli.command()
@@ -91,7 +129,7 @@ def decide(topic, decision, rationale, risk):
         "rationale": rationale or "See logs",
         "risk": risk
     }
-    session.update_session(decision=decision_obj)
+    session.update_session(decision=decision_obj, return_state=False)
     click.echo(f"\n*The Court has ruled on '{topic}': {decision}*")
     click.echo(f"Risk: {risk}")
 
@@ -111,6 +149,67 @@ def validate_schema():
         click.echo(f"Validation failed: {error}")
 
 
+@cli.command()
+def compact():
+    """Fold the state journal into current.md."""
+    if state.compact_state():
+        click.echo("State journal compacted into current.md.")
+    elif os.path.exists(state.JOURNAL_FILE):
+        click.echo("State journal left uncompacted.")
+    else:
+        click.echo("Nothing to compact.")
+
+
+@cli.command()
+@click.option('--topic', '-t', help='Words that must appear in the topic (prefix match)')
+@click.option('--risk', '-r', multiple=True, type=click.Choice(state.VALID_SEVERITIES, case_sensitive=False),
+              help='Risk level to include (repeatable)')
+@click.option('--vote', '-v', 'votes', multiple=True, metavar='PERSONALITY:VOTE',
+              help='Require a vote, e.g. Prophet:NO (repeatable)')
+@click.option('--dissenter', '-d', help='Personality that filed a dissent')
+@click.option('--page', '-p', default=1, type=click.IntRange(min=1), help='Page number')
+@click.option('--per-page', default=20, type=click.IntRange(min=1), help='Results per page')
+@click.option('--rebuild', is_flag=True, help='Rebuild the decision index first')
+def query(topic, risk, votes, dissenter, page, per_page, rebuild):
+    """Search recorded decisions.
+
+    Example: morningstar query --topic caching --risk High --risk Critical
+    """
+    from tools import index
+
+    vote_filters = {}
+    for v in votes:
+        personality, sep, value = v.partition(':')
+        if not sep or value.upper() not in state.VALID_VOTES:
+            raise click.BadParameter(f"expected PERSONALITY:{'|'.join(state.VALID_VOTES)}, got '{v}'",
+                                     param_hint="'--vote'")
+        vote_filters[personality] = value
+
+    if rebuild:
+        index.rebuild_index()
+
+    total, results = index.query(topic=topic, risk=list(risk), votes=vote_filters,
+                                 dissenter=dissenter, limit=per_page,
+                                 offset=(page - 1) * per_page)
+
+    click.echo("")
+    click.echo("┌─────────────────────────────────────────────────────────────────┐")
+    click.echo("│ DECISION QUERY                                                  │")
+    click.echo("└─────────────────────────────────────────────────────────────────┘")
+    click.echo("")
+
+    if not results:
+        click.echo("No matching decisions.")
+        return
+
+    for d in results:
+        click.echo(f"  [{d['_id'] + 1}] {d.get('topic', 'Unknown')}: {d.get('decision', 'Unknown')} "
+                   f"({d.get('risk', 'Unknown')})")
+
+    pages = (total + per_page - 1) // per_page
+    click.echo(f"\n{total} match(es) — page {page} of {pages}")
+
+
 # ─────────────────────────────────────────────────────────────────────────────
 # Court Commands
 # ─────────────────────────────────────────────────────────────────────────────
@@ -187,27 +286,14 @@ def oracle(question):
 # History Commands
 # ─────────────────────────────────────────────────────────────────────────────
 
-@cli.command()
-@click.option('--limit', '-n', default=10, help='Number of sessions to show')
-def history(limit):
-    """List past session reports."""
+def _history_entries():
+    """
+    Session reports and archived state shards, newest first, as
+    (formatted time, filename, path, shard index entry or None).
+    """
     sessions_dir = os.path.join(BASE_DIR, 'sessions')
-    
-    if not os.path.exists(sessions_dir):
-        click.echo("No session history found.")
-        return
-    
-    reports = sorted(globlib.glob(os.path.join(sessions_dir, 'report_*.md')), reverse=True)
-    
-    if not reports:
-        click.echo("No session reports found.")
-        return
-    
-    click.echo("\n┌─────────────────────────────────────────────────────────────────┐")
-    click.echo("│ SESSION HISTORY                                                 │")
-    click.echo("└─────────────────────────────────────────────────────────────────┘\n")
-    
-    for i, report_path in enumerate(reports[:limit]):
+    entries = []
+    for report_path in globlib.glob(os.path.join(sessions_dir, 'report_*.md')):
         filename = os.path.basename(report_path)
         # Extract timestamp from filename: report_YYYYMMDD_HHMMSS.md
         timestamp_str = filename.replace('report_', '').replace('.md', '')
@@ -216,32 +302,105 @@ def history(limit):
             formatted = dt.strftime("%Y-%m-%d %H:%M:%S")
         except ValueError:
             formatted = timestamp_str
-        
-        click.echo(f"  [{i+1}] {formatted}  →  {filename}")
+        entries.append((formatted, filename, report_path, None))
+    for shard in archive.read_index():
+        formatted = shard['archivedAt'][:19].replace('T', ' ')
+        entries.append((formatted, shard['file'], os.path.join(archive.ARCHIVE_DIR, shard['file']), shard))
+    # A session's report and shard share a timestamp; list the report first
+    entries.sort(key=lambda e: (e[0], e[3] is None), reverse=True)
+    return entries
+
+
+@cli.command()
+@click.option('--limit', '-n', default=10, help='Number of sessions to show')
+@click.option('--archive', '-a', 'show_archive', is_flag=True,
+              help='List only archived state shards, not reports')
+def history(limit, show_archive):
+    """List past session reports and archived state, newest first."""
+    if show_archive:
+        _archive_history(limit)
+        return
+
+    entries = _history_entries()
+    if not entries:
+        click.echo("No session history found.")
+        return
     
-    click.echo(f"\nUse 'morningstar recall <filename>' to view a specific session.")
+    click.echo("\n┌─────────────────────────────────────────────────────────────────┐")
+    click.echo("│ SESSION HISTORY                                                 │")
+    click.echo("└─────────────────────────────────────────────────────────────────┘\n")
+    
+    for i, (formatted, filename, _, shard) in enumerate(entries[:limit]):
+        if shard is None:
+            click.echo(f"  [{i+1}] {formatted}  →  {filename}")
+        else:
+            counts = ', '.join(f"{shard.get(section, 0)} {section}" for section in archive.ARCHIVED_SECTIONS)
+            click.echo(f"  [{i+1}] {formatted}  →  {filename}  (archived state: {counts})")
+    
+    click.echo(f"\nUse 'morningstar recall <n>' or 'morningstar recall <filename>' to view one.")
+
+
+def _archive_history(limit):
+    """List archive shards, newest first."""
+    shards = archive.read_index()
+    if not shards:
+        click.echo("No archived state found.")
+        return
+
+    click.echo("\n┌─────────────────────────────────────────────────────────────────┐")
+    click.echo("│ STATE ARCHIVE                                                   │")
+    click.echo("└─────────────────────────────────────────────────────────────────┘\n")
+
+    for i, entry in enumerate(reversed(shards[-limit:] if limit else shards)):
+        counts = ', '.join(f"{entry.get(section, 0)} {section}" for section in archive.ARCHIVED_SECTIONS)
+        click.echo(f"  [{i+1}] {entry['archivedAt'][:19].replace('T', ' ')}  →  {entry['file']}  ({counts})")
+
+    click.echo(f"\nUse 'morningstar recall --archive <n>' to view a shard.")
 
 
 @cli.command()
 @click.argument('identifier')
-def recall(identifier):
-    """Load and display a past session report."""
-    sessions_dir = os.path.join(BASE_DIR, 'sessions')
+@click.option('--archive', '-a', 'from_archive', is_flag=True,
+              help='Numeric identifiers refer to `history --archive` positions')
+def recall(identifier, from_archive):
+    """Load and display a past session report or archived state shard.
     
-    # Allow numeric index or filename
-    if identifier.isdigit():
-        reports = sorted(globlib.glob(os.path.join(sessions_dir, 'report_*.md')), reverse=True)
+    IDENTIFIER is a filename or a position in `morningstar history`.
+    """
+    sessions_dir = os.path.join(BASE_DIR, 'sessions')
+
+    # Archived state shards, by position or filename
+    shard_path = None
+    if from_archive or identifier.startswith('state_'):
+        shard_path = archive.find_shard(identifier)
+        if not shard_path:
+            click.echo(f"Archived state not found: {identifier}")
+            return
+    elif identifier.isdigit():
+        # Position in the combined history listing
+        entries = _history_entries()
         index = int(identifier) - 1
-        if 0 <= index < len(reports):
-            report_path = reports[index]
-        else:
+        if not 0 <= index < len(entries):
             click.echo(f"Invalid index: {identifier}")
             return
-    else:
-        # Treat as filename
-        if not identifier.endswith('.md'):
-            identifier += '.md'
-        report_path = os.path.join(sessions_dir, identifier)
+        if entries[index][3] is not None:
+            shard_path = entries[index][2]
+        else:
+            identifier = entries[index][1]
+
+    if shard_path:
+        click.echo("")
+        click.echo("┌─────────────────────────────────────────────────────────────────┐")
+        click.echo("│ ARCHIVE RECALL                                                  │")
+        click.echo("└─────────────────────────────────────────────────────────────────┘")
+        click.echo("")
+        click.echo(archive.render_shard(shard_path))
+        return
+    
+    # Treat as filename
+    if not identifier.endswith('.md'):
+        identifier += '.md'
+    report_path = os.path.join(sessions_dir, identifier)
     
     if not os.path.exists(report_path):
         click.echo(f"Session not found: {identifier}")
@@ -274,7 +433,11 @@ def doctor():
     warnings = []
     
     # Check state file
-    state_file = os.path.join(BASE_DIR, 'state', 'current.md')
+    if state.STATE_BACKEND == 'sqlite':
+        from tools import statedb
+        state_file = statedb.DB_FILE
+    else:
+        state_file = os.path.join(BASE_DIR, 'state', 'current.md')
     if os.path.exists(state_file):
         click.echo("  [✓] State file exists")
         # Try to parse it
@@ -420,8 +583,8 @@ def assess_new(proposal, base, effort, save):
         assessment = assess_module.run_interactive_assessment(proposal)
     
     if save:
-        filepath = assess_module.save_assessment(assessment)
-        click.echo(f"\n*Assessment saved to {filepath}*")
+        assessment_id = assess_module.save_assessment(assessment)
+        click.echo(f"\n*Assessment #{assessment_id} saved*")
 
 
 @assess.command('list')
@@ -430,7 +593,7 @@ def assess_list(limit):
     """List recent assessments."""
     from tools import assess as assess_module
     
-    assessments = assess_module.load_assessments()
+    assessments = assess_module.load_assessments(limit=limit)
     
     if not assessments:
         click.echo("No assessments found.")
@@ -440,11 +603,136 @@ def assess_list(limit):
     click.echo("│ RECENT ASSESSMENTS                                              │")
     click.echo("└─────────────────────────────────────────────────────────────────┘\n")
     
-    for i, a in enumerate(assessments[-limit:]):
+    for a in assessments:
         proposal = a.get('proposal', 'Unknown')[:40]
         rating = a.get('effectiveRating', '?')
         rec = a.get('recommendation', '?')
-        click.echo(f"  [{i+1}] {rating} | {rec:<12} | {proposal}")
+        click.echo(f"  [#{a.get('id', '?')}] {rating} | {rec:<12} | {proposal}")
+
+
+@assess.command('batch')
+@click.argument('input_file', type=click.Path(exists=True, dir_okay=False))
+@click.option('--input-format', type=click.Choice(['csv', 'jsonl']),
+              help='Input format (default: from the file extension)')
+@click.option('--output', '-o', default='-', help='Where to stream results (default: stdout)')
+@click.option('--format', '-f', 'fmt', type=click.Choice(['jsonl', 'csv']), default='jsonl',
+              help='Output format')
+@click.option('--save/--no-save', default=True, help='Append the assessments to the store')
+def assess_batch(input_file, input_format, output, fmt, save):
+    """Assess every proposal in a CSV or JSONL file.
+    
+    Each row needs proposal, base (or baseRating) and effort (or
+    effortBand); active risk vectors go in a risks column separated by
+    ';' or in one yes/no column per vector.
+    """
+    from tools import assess as assess_module
+    
+    proposals = assess_module.read_proposals(input_file, input_format)
+    try:
+        with click.open_file(output, 'w', encoding='utf-8') as out:
+            count, errors = assess_module.assess_batch(proposals, out, fmt, save=save)
+    except (ValueError, KeyError) as e:
+        click.echo(f"Error: unreadable input: {e}", err=True)
+        raise SystemExit(1)
+    
+    for error in errors:
+        click.echo(f"  Skipped {error}", err=True)
+    saved = " and saved" if save else ""
+    click.echo(f"*{count} proposal(s) assessed{saved}; {len(errors)} skipped.*", err=True)
+    if errors:
+        raise SystemExit(1)
+
+
+@assess.command('simulate')
+@click.option('--base', '-b', type=click.Choice(['F0', 'F1', 'F2', 'F3', 'F4', 'F5']), required=True,
+              help='Base rating')
+@click.option('--effort', '-e', type=click.Choice(['S', 'M', 'L', 'XL']), required=True,
+              help='Effort band')
+@click.option('--risk', '-r', 'risks', multiple=True, metavar='VECTOR=P',
+              help='Probability (0-1) that a risk vector applies; repeatable')
+@click.option('--samples', '-n', default=100000, help='Number of scenarios to sample')
+@click.option('--seed', type=int, help='Random seed, for reproducible results')
+@click.option('--no-numpy', is_flag=True, help='Use the pure-Python sampler even if NumPy is installed')
+def assess_simulate(base, effort, risks, samples, seed, no_numpy):
+    """Monte Carlo what-if over uncertain risk vectors.
+    
+    Example: morningstar assess simulate -b F2 -e M -r unclearRequirements=0.3 -r externalTeam=0.5
+    """
+    from tools import assess as assess_module
+    
+    probabilities = {}
+    for risk in risks:
+        vector, _, value = risk.partition('=')
+        try:
+            probabilities[vector.strip()] = float(value)
+        except ValueError:
+            click.echo(f"Error: expected VECTOR=PROBABILITY, got {risk!r}", err=True)
+            raise SystemExit(1)
+    
+    try:
+        result = assess_module.simulate_assessment(base, probabilities, effort, samples, seed,
+                                                   use_numpy=False if no_numpy else None)
+    except ValueError as e:
+        click.echo(f"Error: {e}", err=True)
+        raise SystemExit(1)
+    
+    click.echo("\n┌─────────────────────────────────────────────────────────────────┐")
+    click.echo("│ RISK SIMULATION                                                 │")
+    click.echo("└─────────────────────────────────────────────────────────────────┘\n")
+    click.echo(f"  Base {base}, effort {effort}, {result['samples']:,} scenarios ({result['engine']})")
+    for vector, p in probabilities.items():
+        click.echo(f"    {vector}: {p:.0%}")
+    click.echo(f"  Mean risk modifier: +{result['meanModifier']:.2f}\n")
+    
+    click.echo("  Effective rating:")
+    for rating, count in result['ratings'].items():
+        if count:
+            share = count / result['samples']
+            label = assess_module.RATINGS[rating]['label']
+            click.echo(f"    {rating} {label:<16} {share:>7.1%}  {'█' * round(share * 40)}")
+    click.echo("\n  Recommendation:")
+    for recommendation, count in sorted(result['recommendations'].items(), key=lambda item: -item[1]):
+        click.echo(f"    {recommendation:<21} {count / result['samples']:>7.1%}")
+
+
+@assess.command('stats')
+@click.option('--window', '-w', type=click.Choice(['week', 'month']),
+              help='Break the counts down by ISO week or month')
+@click.option('--last', '-n', default=8, help='Number of most recent periods to show (with --window)')
+@click.option('--json', 'as_json', is_flag=True, help='Print the raw rollups as JSON')
+@click.option('--rebuild', is_flag=True, help='Recompute the rollups from every stored assessment first')
+def assess_stats(window, last, as_json, rebuild):
+    """Assessment counts by rating, recommendation, effort and risk vector."""
+    from tools import assess as assess_module
+    
+    stats = assess_module.rebuild_rollups() if rebuild else assess_module.assessment_stats()
+    if window:
+        periods = sorted(stats[window].items())[-last:] if last > 0 else []
+    else:
+        periods = [('All time', stats['total'])] if stats['total'] else []
+    
+    if as_json:
+        click.echo(json.dumps(dict(periods), indent=2))
+        return
+    if not periods:
+        click.echo("No assessments found.")
+        return
+    
+    click.echo("\n┌─────────────────────────────────────────────────────────────────┐")
+    click.echo("│ ASSESSMENT STATISTICS                                           │")
+    click.echo("└─────────────────────────────────────────────────────────────────┘")
+    for period, bucket in periods:
+        click.echo(f"\n  {period}: {bucket['count']} assessment(s)")
+        for field, label, order in (
+                ('effectiveRating', 'Rating', list(assess_module.RATINGS)),
+                ('recommendation', 'Recommendation', None),
+                ('effortBand', 'Effort', list(assess_module.EFFORT_BANDS)),
+                ('riskVectors', 'Risk vectors', list(assess_module.RISK_VECTORS))):
+            counts = bucket.get(field, {})
+            keys = [k for k in order if k in counts] + [k for k in counts if k not in order] \
+                if order else sorted(counts, key=lambda k: -counts[k])
+            if keys:
+                click.echo(f"    {label + ':':<16}" + ", ".join(f"{k} {counts[k]}" for k in keys))
 
 
 @assess.command('f0')
@@ -471,8 +759,17 @@ def log():
 
 
 @log.command('show')
-def log_show():
+@click.option('--version', '-v', help='Show one released version (including archived ones)')
+def log_show(version):
     """Display unreleased changelog entries."""
+    if version:
+        section = changelog.read_version(version)
+        if section is None:
+            click.echo(f"Version not found: {version}")
+            return
+        click.echo(section.rstrip('\n'))
+        return
+    
     summary = changelog.get_unreleased_summary()
     if not summary:
         click.echo("*The chronicle awaits new entries.*")
@@ -487,6 +784,10 @@ def log_show():
         for entry in entries:
             click.echo(f"  - {entry}")
         click.echo("")
+    
+    pending = len(changelog.iter_fragments())
+    if pending:
+        click.echo(f"*{pending} of these await in changelog.d/ until the next release.*")
 
 
 @log.command('add')
@@ -494,10 +795,14 @@ def log_show():
               default='added', help='Type of change')
 @click.option('--message', '-m', required=True, help='Description of the change')
 @click.option('--source', '-s', help='Attribution (e.g., personality name)')
-def log_add(category, message, source):
+@click.option('--fragment/--no-fragment', default=None,
+              help='Write to changelog.d/ instead of CHANGELOG.md (default: MORNINGSTAR_CHANGELOG_FRAGMENTS)')
+def log_add(category, message, source, fragment):
     """Add an entry to the changelog."""
-    changelog.add_entry(category, message, source=source)
-    click.echo(f"*Inscribed to the chronicle: [{category}] {message}*")
+    if changelog.add_entry(category, message, source=source, fragment=fragment):
+        click.echo(f"*Inscribed to the chronicle: [{category}] {message}*")
+    else:
+        click.echo(f"*Already in the chronicle: [{category}] {message}*")
 
 
 @log.command('decide')
@@ -507,8 +812,10 @@ def log_add(category, message, source):
 @click.option('--rationale', help='Explanation for the decision')
 def log_decide(topic, decision, risk, rationale):
     """Record a court decision in the changelog."""
-    changelog.add_decision(topic, decision, risk, rationale)
-    click.echo(f"*The Court has ruled on '{topic}'. So it is written.*")
+    if changelog.add_decision(topic, decision, risk, rationale):
+        click.echo(f"*The Court has ruled on '{topic}'. So it is written.*")
+    else:
+        click.echo(f"*The Court's ruling on '{topic}' is already written.*")
 
 
 @log.command('vindicate')
@@ -523,12 +830,26 @@ def log_vindicate(prediction, outcome):
 @log.command('release')
 @click.option('--version', '-v', required=True, help='Version number (e.g., 1.0.0)')
 @click.option('--date', '-d', help='Release date (YYYY-MM-DD, defaults to today)')
-def log_release(version, date):
+@click.option('--keep', '-k', type=click.IntRange(min=0), default=None,
+              help='Archive versions beyond the newest N (default: MORNINGSTAR_CHANGELOG_KEEP, 0 = keep all)')
+def log_release(version, date, keep):
     """Convert unreleased entries to a versioned release."""
-    changelog.release_version(version, date)
+    changelog.release_version(version, date, keep=keep)
     click.echo(f"*Version {version} has been sealed in the chronicle.*")
 
 
+@log.command('archive')
+@click.option('--keep', '-k', type=click.IntRange(min=1), required=True,
+              help='Number of released versions to leave in CHANGELOG.md')
+def log_archive(keep):
+    """Move older released versions to changelog/archive/."""
+    archived = changelog.archive_versions(keep)
+    if not archived:
+        click.echo(f"*No more than {keep} released versions; nothing to archive.*")
+        return
+    click.echo(f"*{len(archived)} versions moved to the archive: {', '.join(archived)}*")
+
+
 # ─────────────────────────────────────────────────────────────────────────────
 # Backup Commands - The Debugger's Insurance
 # ─────────────────────────────────────────────────────────────────────────────
@@ -541,16 +862,26 @@ def bkp():
 
 @bkp.command('create')
 @click.option('--description', '-d', help='Description for this backup')
-def bkp_create(description):
+@click.option('--archive', '-a', 'as_archive', is_flag=True,
+              help='Write a single compressed tar file instead of a manifest')
+@click.option('--compression', '-z', type=click.Choice(['gz', 'xz']), default='gz',
+              help='Archive compression (with --archive)')
+def bkp_create(description, as_archive, compression):
     """Create a backup of current state."""
-    path = backup.create_backup(description)
+    if as_archive:
+        path = backup.create_archive_backup(description, compression)
+    else:
+        path = backup.create_backup(description)
     click.echo(f"\n✓ Backup created: {os.path.basename(path)}")
     click.echo(f"  Path: {path}")
 
 
 @bkp.command('list')
-def bkp_list():
+@click.option('--rebuild', is_flag=True, help='Rebuild backups/catalog.jsonl from the backup directories first')
+def bkp_list(rebuild):
     """List available backups."""
+    if rebuild:
+        backup.rebuild_catalog()
     backups = backup.list_backups()
     
     if not backups:
@@ -562,7 +893,7 @@ def bkp_list():
     click.echo("└─────────────────────────────────────────────────────────────────┘\n")
     
     for i, b in enumerate(backups, 1):
-        click.echo(f"  [{i}] {b['name']}")
+        click.echo(f"  [{i}] {b['name']}{'  (archive)' if backup.is_archive(b['path']) else ''}")
         click.echo(f"      Created: {b['timestamp']}")
         click.echo(f"      Description: {b['description']}")
         click.echo(f"      Files: {b['file_count']}")
@@ -582,6 +913,76 @@ def bkp_restore(identifier, force):
         raise SystemExit(1)
 
 
+@bkp.command('verify')
+@click.argument('identifiers', nargs=-1)
+@click.option('--workers', '-j', type=int, help='Hashing threads (default: based on CPU count)')
+def bkp_verify(identifiers, workers):
+    """Check backed-up files against their recorded hashes.
+    
+    IDENTIFIERS are backup names or index numbers (1-based); all backups
+    are checked when none are given.
+    """
+    try:
+        results = backup.verify_backups(list(identifiers), workers)
+    except ValueError as e:
+        click.echo(f"Error: {e}", err=True)
+        raise SystemExit(1)
+    
+    if not results:
+        click.echo("No backups found.")
+        return
+    
+    damaged = 0
+    for result in results:
+        if result['corrupt'] or result['missing']:
+            damaged += 1
+            click.echo(f"  ✗ {result['name']}")
+            for key in ('corrupt', 'missing'):
+                for path in result[key]:
+                    click.echo(f"      {key}: {path}")
+        else:
+            note = f", {len(result['unverified'])} without recorded hashes" if result['unverified'] else ""
+            click.echo(f"  ✓ {result['name']} ({result['files']} files{note})")
+    
+    click.echo(f"\n{len(results) - damaged} of {len(results)} backup(s) intact.")
+    if damaged:
+        raise SystemExit(1)
+
+
+@bkp.command('diff')
+@click.argument('old')
+@click.argument('new')
+@click.option('--content', '-c', is_flag=True, help='Show a unified diff of each changed file')
+def bkp_diff(old, new, content):
+    """Compare two backups (OLD and NEW, by name or index).
+    
+    Files are compared by recorded hash; contents are only read for
+    changed files with --content.
+    """
+    try:
+        diff = backup.diff_backups(old, new)
+    except ValueError as e:
+        click.echo(f"Error: {e}", err=True)
+        raise SystemExit(1)
+    
+    for marker, key in (('+', 'added'), ('-', 'removed'), ('~', 'changed')):
+        for path in diff[key]:
+            click.echo(f"  {marker} {path}")
+    click.echo(f"\n{len(diff['added'])} added, {len(diff['removed'])} removed, "
+               f"{len(diff['changed'])} changed, {len(diff['unchanged'])} unchanged.")
+    
+    if content:
+        for path in diff['changed']:
+            before = backup.read_backup_file(old, path) or b''
+            after = backup.read_backup_file(new, path) or b''
+            click.echo("")
+            for line in difflib.unified_diff(
+                    before.decode('utf-8', 'replace').splitlines(),
+                    after.decode('utf-8', 'replace').splitlines(),
+                    f"{old}/{path}", f"{new}/{path}", lineterm=''):
+                click.echo(line)
+
+
 @bkp.command('delete')
 @click.argument('identifier')
 @click.option('--force', '-f', is_flag=True, help='Skip confirmation prompt')
@@ -594,10 +995,34 @@ def bkp_delete(identifier, force):
 
 @bkp.command('prune')
 @click.option('--keep', '-k', default=10, help='Number of backups to keep')
-def bkp_prune(keep):
-    """Remove old backups, keeping the most recent N."""
-    deleted = backup.prune_backups(keep)
-    click.echo(f"Pruned {deleted} old backup(s). Keeping {keep} most recent.")
+@click.option('--generational', '-g', is_flag=True,
+              help='Keep the newest backup per hour/day/week/month instead of the last N')
+@click.option('--hourly', type=int, help='Hourly backups to keep (with --generational)')
+@click.option('--daily', type=int, help='Daily backups to keep (with --generational)')
+@click.option('--weekly', type=int, help='Weekly backups to keep (with --generational)')
+@click.option('--monthly', type=int, help='Monthly backups to keep (with --generational)')
+@click.option('--auto-only', is_flag=True, help='Only prune automatic backups (with --generational)')
+@click.option('--dry-run', is_flag=True, help='List what would be deleted (with --generational)')
+def bkp_prune(keep, generational, hourly, daily, weekly, monthly, auto_only, dry_run):
+    """Remove old backups, keeping the most recent N or a generational set."""
+    if not generational:
+        deleted = backup.prune_backups(keep)
+        click.echo(f"Pruned {deleted} old backup(s). Keeping {keep} most recent.")
+        return
+
+    policy = dict(backup.RETENTION_POLICY)
+    for granularity, count in (('hourly', hourly), ('daily', daily),
+                               ('weekly', weekly), ('monthly', monthly)):
+        if count is not None:
+            policy[granularity] = count
+    deleted = backup.apply_retention(policy, auto_only=auto_only, dry_run=dry_run)
+    if dry_run:
+        for name in deleted:
+            click.echo(f"  would delete {name}")
+        click.echo(f"{len(deleted)} backup(s) would be pruned.")
+    else:
+        click.echo(f"Pruned {len(deleted)} old backup(s).")
+    click.echo("Policy: " + ", ".join(f"{count} {granularity}" for granularity, count in policy.items()))
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -624,6 +1049,17 @@ def export_state(output, fmt):
             click.echo(json_str)
 
 
+@export.command('markdown')
+@click.option('--output', '-o', help='Output file path')
+def export_markdown(output):
+    """Export current state (from either backend) as current.md-style markdown."""
+    content = export_module.export_state_markdown(output)
+    if output:
+        click.echo(f"State exported to: {output}")
+    else:
+        click.echo(content)
+
+
 @export.command('session')
 @click.argument('session_file')
 @click.option('--output', '-o', help='Output file path')
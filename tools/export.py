@@ -11,7 +11,7 @@ import re
 from datetime import datetime
 from typing import Optional, Dict, List
 
-from .state import read_state
+from .state import read_state, format_state_markdown
 
 
 # Dracula theme CSS with personality color coding
@@ -300,6 +300,29 @@ def export_state_json(output_path: Optional[str] = None) -> str:
     return json_str
 
 
+def export_state_markdown(output_path: Optional[str] = None) -> str:
+    """
+    Export current state as current.md-style markdown.
+    
+    Reads through the configured backend, so with the markdown backend
+    the SQLite store is never opened (which would create and seed a
+    current.db that then goes stale).
+    
+    Args:
+        output_path: Path to write the markdown file (optional)
+        
+    Returns:
+        The rendered markdown
+    """
+    content = format_state_markdown(read_state() or {})
+    
+    if output_path:
+        with open(output_path, 'w', encoding='utf-8') as f:
+            f.write(content)
+    
+    return content
+
+
 def export_session_html(session_path: str, output_path: Optional[str] = None, 
                         theme: str = 'dracula') -> str:
     """
@@ -0,0 +1,217 @@
+"""
+Secondary indexes over court decisions.
+
+Answers questions like "all High/Critical decisions whose topic mentions
+caching" without scanning the state. The index lives in a small SQLite
+file next to current.md and holds postings for topic tokens, risk, each
+personality's vote, and dissenting personalities, for archived
+(sessions/archive/) and live decisions alike. add_decision() updates
+it incrementally; any other change to the state (compaction, session end,
+manual edits) is detected from the state file's stamp and triggers a
+rebuild on the next query.
+"""
+
+import json
+import os
+import re
+import sqlite3
+from contextlib import closing
+from typing import Optional, List, Dict, Any, Tuple
+
+from . import state as state_module
+from . import archive
+
+INDEX_FILE = os.path.join(os.path.dirname(state_module.STATE_FILE), '.current.index.db')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS docs (
+    id INTEGER PRIMARY KEY,
+    risk TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_docs_risk ON docs(risk, id);
+CREATE TABLE IF NOT EXISTS tokens (
+    token TEXT NOT NULL,
+    id INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_tokens ON tokens(token, id);
+CREATE TABLE IF NOT EXISTS votes (
+    personality TEXT NOT NULL,
+    vote TEXT NOT NULL,
+    id INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_votes ON votes(personality, vote, id);
+CREATE TABLE IF NOT EXISTS dissenters (
+    personality TEXT NOT NULL,
+    id INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_dissenters ON dissenters(personality, id);
+"""
+
+TOKEN_PATTERN = re.compile(r'[a-z0-9]+')
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase alphanumeric tokens of a topic."""
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+def source_stamp() -> Optional[str]:
+    """
+    Cheap identity of the current state contents (stat calls only).
+
+    Changes whenever the state backing files change, so a stored stamp
+    that still matches means the index is up to date.
+    """
+    if state_module.STATE_BACKEND == 'sqlite':
+        from . import statedb
+        paths = [statedb.DB_FILE]
+    else:
+        paths = [state_module.STATE_FILE, state_module.JOURNAL_FILE]
+    paths.append(archive.ARCHIVE_INDEX)
+
+    parts = []
+    for path in paths:
+        try:
+            st = os.stat(path)
+            parts.append([st.st_ino, st.st_size, st.st_mtime_ns])
+        except OSError:
+            parts.append(None)
+    return json.dumps(parts)
+
+
+def _connect() -> sqlite3.Connection:
+    conn = sqlite3.connect(INDEX_FILE)
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def _get_meta(conn: sqlite3.Connection, key: str) -> Optional[str]:
+    row = conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+    return row[0] if row else None
+
+
+def _set_meta(conn: sqlite3.Connection, key: str, value: Any) -> None:
+    conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, str(value)))
+
+
+def _add(conn: sqlite3.Connection, doc_id: int, decision: Dict[str, Any]) -> None:
+    """Insert one decision's postings."""
+    conn.execute("INSERT INTO docs (id, risk, data) VALUES (?, ?, ?)",
+                 (doc_id, str(decision.get('risk', 'Unknown')).lower(), json.dumps(decision)))
+    conn.executemany("INSERT INTO tokens (token, id) VALUES (?, ?)",
+                     [(t, doc_id) for t in set(tokenize(decision.get('topic', '')))])
+    conn.executemany("INSERT INTO votes (personality, vote, id) VALUES (?, ?, ?)",
+                     [(p.lower(), str(v).upper(), doc_id) for p, v in (decision.get('votes') or {}).items()])
+    conn.executemany("INSERT INTO dissenters (personality, id) VALUES (?, ?)",
+                     [(str(d.get('personality', '')).lower(), doc_id)
+                      for d in decision.get('dissents') or [] if isinstance(d, dict)])
+
+
+def rebuild_index() -> int:
+    """
+    Rebuild the index from the session archive and the current state.
+
+    Returns:
+        Number of decisions indexed
+    """
+    stamp = source_stamp()
+    current = state_module.read_state() or {}
+    decisions = list(archive.iter_archived('decisions')) + current.get('decisions', [])
+
+    with closing(_connect()) as conn:
+        with conn:
+            for table in ('docs', 'tokens', 'votes', 'dissenters'):
+                conn.execute(f"DELETE FROM {table}")
+            for doc_id, decision in enumerate(decisions):
+                _add(conn, doc_id, decision)
+            _set_meta(conn, 'count', len(decisions))
+            _set_meta(conn, 'stamp', stamp)
+    return len(decisions)
+
+
+def ensure_index() -> None:
+    """Rebuild the index if the state changed in a way it did not track."""
+    if os.path.exists(INDEX_FILE):
+        with closing(_connect()) as conn:
+            if _get_meta(conn, 'stamp') == source_stamp():
+                return
+    rebuild_index()
+
+
+def record_decision(decision: Dict[str, Any], previous_stamp: Optional[str]) -> None:
+    """
+    Add a just-appended decision to an existing index.
+
+    Called by state.append_item(). previous_stamp is source_stamp() from
+    before the append; if the index was not current at that point, it is
+    left stale and rebuilt by the next query instead.
+    """
+    if not os.path.exists(INDEX_FILE):
+        return
+    with closing(_connect()) as conn:
+        with conn:
+            if _get_meta(conn, 'stamp') != previous_stamp:
+                return
+            count = int(_get_meta(conn, 'count') or 0)
+            _add(conn, count, decision)
+            _set_meta(conn, 'count', count + 1)
+            _set_meta(conn, 'stamp', source_stamp())
+
+
+def query(
+    topic: Optional[str] = None,
+    risk: Optional[List[str]] = None,
+    votes: Optional[Dict[str, str]] = None,
+    dissenter: Optional[str] = None,
+    limit: int = 20,
+    offset: int = 0
+) -> Tuple[int, List[Dict[str, Any]]]:
+    """
+    Find decisions matching all of the given filters.
+
+    Args:
+        topic: Words that must all appear in the topic (each matches as a
+               prefix, so "cach" finds "cache" and "caching")
+        risk: Risk levels to include, case-insensitive
+        votes: Personality -> vote that must have been cast (e.g. {'Prophet': 'NO'})
+        dissenter: Personality that must have filed a dissent
+        limit: Page size
+        offset: Number of matches to skip
+
+    Returns:
+        (total number of matches, page of decision dicts in recorded order,
+        each with its index position as '_id')
+    """
+    ensure_index()
+
+    clauses = []
+    params: List[Any] = []
+    for token in tokenize(topic or ''):
+        clauses.append("id IN (SELECT id FROM tokens WHERE token >= ? AND token < ?)")
+        params.extend([token, token + '\uffff'])
+    if risk:
+        clauses.append(f"risk IN ({', '.join('?' for _ in risk)})")
+        params.extend(r.lower() for r in risk)
+    for personality, vote in (votes or {}).items():
+        clauses.append("id IN (SELECT id FROM votes WHERE personality = ? AND vote = ?)")
+        params.extend([personality.lower(), vote.upper()])
+    if dissenter:
+        clauses.append("id IN (SELECT id FROM dissenters WHERE personality = ?)")
+        params.append(dissenter.lower())
+
+    where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+    with closing(_connect()) as conn:
+        total = conn.execute(f"SELECT COUNT(*) FROM docs{where}", params).fetchone()[0]
+        page = []
+        for doc_id, data in conn.execute(
+                f"SELECT id, data FROM docs{where} ORDER BY id LIMIT ? OFFSET ?",
+                params + [limit, offset]):
+            decision = json.loads(data)
+            decision['_id'] = doc_id
+            page.append(decision)
+    return total, page
@@ -0,0 +1,247 @@
+"""
+Compact record types for MORNINGSTAR state entries.
+
+read_state() returns plain dicts, which is convenient but heavy: every
+decision carries its own dict, an empty votes dict and an empty dissents
+list. These __slots__ records hold the same data with no per-instance
+dict, store empty votes/dissents as None, and share one enum member per
+risk, severity and vote value. Each converts losslessly to and from the
+dict shape read_state() produces, including entries that leave fields
+out (decisions journaled by update_session() carry no votes or dissents):
+a bitmask of the fields present keeps to_dict() from adding defaults.
+
+    >>> journaled = {'topic': 'Cache', 'decision': 'Adopt', 'risk': 'Low'}
+    >>> Decision.from_dict(journaled).to_dict() == journaled
+    True
+    >>> state = {'decisions': [journaled], 'outstandingIssues': [{'issue': 'Flaky CI'}]}
+    >>> records_to_state(state_to_records(state)) == state
+    True
+"""
+
+import sys
+from enum import Enum
+from typing import Optional, List, Dict, Any, Union
+
+from .state import VALID_SEVERITIES, VALID_VOTES
+
+Severity = Enum('Severity', [(s.upper(), s) for s in VALID_SEVERITIES])
+VoteValue = Enum('VoteValue', [(v, v) for v in VALID_VOTES])
+
+_SEVERITIES = {s.value: s for s in Severity}
+_VOTE_VALUES = {v.value: v for v in VoteValue}
+
+
+def _intern_severity(value: Any) -> Union[Severity, str]:
+    """Map a risk/severity string to its shared Severity member when valid."""
+    if isinstance(value, str):
+        return _SEVERITIES.get(value) or sys.intern(value)
+    return value
+
+
+def _plain(value: Any) -> Any:
+    """Undo _intern_severity()/vote interning for dict output."""
+    return value.value if isinstance(value, Enum) else value
+
+
+def _extra(d: Dict[str, Any], known: tuple) -> Optional[Dict[str, Any]]:
+    """Keys outside a record's fields, kept so conversion stays lossless."""
+    extra = {k: v for k, v in d.items() if k not in known}
+    return extra or None
+
+
+def _present(d: Dict[str, Any], fields: tuple) -> int:
+    """Bitmask of the fields (bit i for fields[i]) that d has."""
+    return sum(1 << i for i, field in enumerate(fields) if field in d)
+
+
+class Vote:
+    """One personality's vote on a decision."""
+
+    __slots__ = ('personality', 'value')
+
+    def __init__(self, personality: str, value: str):
+        self.personality = sys.intern(personality)
+        self.value = _VOTE_VALUES.get(value) or sys.intern(value)
+
+    def __eq__(self, other: Any) -> bool:
+        return (isinstance(other, Vote) and self.personality == other.personality
+                and self.value == other.value)
+
+    def __repr__(self) -> str:
+        return f"Vote({self.personality!r}, {_plain(self.value)!r})"
+
+
+class Decision:
+    """A court decision: topic, ruling, rationale, risk, votes, and dissents."""
+
+    __slots__ = ('topic', 'decision', 'rationale', 'risk', 'votes', 'dissents', 'extra', 'present')
+
+    _FIELDS = ('topic', 'decision', 'rationale', 'risk', 'votes', 'dissents')
+    _ALL = (1 << len(_FIELDS)) - 1
+
+    def __init__(self, topic: str, decision: str, rationale: str = "See logs",
+                 risk: str = "Unknown", votes: Optional[List[Vote]] = None,
+                 dissents: Optional[List[Dict[str, str]]] = None,
+                 extra: Optional[Dict[str, Any]] = None, present: int = _ALL):
+        self.topic = topic
+        self.decision = decision
+        self.rationale = sys.intern(rationale) if isinstance(rationale, str) else rationale
+        self.risk = _intern_severity(risk)
+        self.votes = tuple(votes) if votes else None
+        self.dissents = tuple(dissents) if dissents else None
+        self.extra = extra
+        # Bit i set when _FIELDS[i] is emitted by to_dict()
+        self.present = present
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> 'Decision':
+        """Build a Decision from the dict shape used in state['decisions']."""
+        votes = d.get('votes') or {}
+        return cls(
+            topic=d.get('topic', 'Unknown'),
+            decision=d.get('decision', 'Unknown'),
+            rationale=d.get('rationale', 'See logs'),
+            risk=d.get('risk', 'Unknown'),
+            votes=[Vote(p, v) for p, v in votes.items()],
+            dissents=[dict(x) for x in d.get('dissents') or []],
+            extra=_extra(d, cls._FIELDS),
+            present=_present(d, cls._FIELDS),
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert back to the dict shape used in state['decisions']."""
+        values = (
+            self.topic,
+            self.decision,
+            self.rationale,
+            _plain(self.risk),
+            {v.personality: _plain(v.value) for v in self.votes or ()},
+            [dict(x) for x in self.dissents or ()],
+        )
+        present = self.present
+        d = {field: value for i, (field, value) in enumerate(zip(self._FIELDS, values))
+             if present >> i & 1}
+        if self.extra:
+            d.update(self.extra)
+        return d
+
+    def __eq__(self, other: Any) -> bool:
+        return isinstance(other, Decision) and self.to_dict() == other.to_dict()
+
+    def __repr__(self) -> str:
+        return f"Decision({self.topic!r}, {self.decision!r}, risk={_plain(self.risk)!r})"
+
+
+class Issue:
+    """An outstanding issue and its severity."""
+
+    __slots__ = ('issue', 'severity', 'extra', 'present')
+
+    _FIELDS = ('issue', 'severity')
+    _ALL = (1 << len(_FIELDS)) - 1
+
+    def __init__(self, issue: str, severity: str = "Medium",
+                 extra: Optional[Dict[str, Any]] = None, present: int = _ALL):
+        self.issue = issue
+        self.severity = _intern_severity(severity)
+        self.extra = extra
+        # Bit i set when _FIELDS[i] is emitted by to_dict()
+        self.present = present
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> 'Issue':
+        """Build an Issue from the dict shape used in state['outstandingIssues']."""
+        return cls(d.get('issue', 'Unknown'), d.get('severity', 'Medium'), _extra(d, cls._FIELDS),
+                   _present(d, cls._FIELDS))
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert back to the dict shape used in state['outstandingIssues']."""
+        d = {}
+        if self.present & 1:
+            d["issue"] = self.issue
+        if self.present & 2:
+            d["severity"] = _plain(self.severity)
+        if self.extra:
+            d.update(self.extra)
+        return d
+
+    def __eq__(self, other: Any) -> bool:
+        return isinstance(other, Issue) and self.to_dict() == other.to_dict()
+
+    def __repr__(self) -> str:
+        return f"Issue({self.issue!r}, {_plain(self.severity)!r})"
+
+
+class DissentVindication:
+    """
+    A dissent later proven right.
+
+    Entries parsed from current.md only carry the raw line; those recorded
+    through add_dissent_vindication() carry the structured fields.
+    """
+
+    __slots__ = ('original_decision', 'dissenter', 'prediction', 'outcome', 'raw', 'extra')
+
+    _FIELDS = ('originalDecision', 'dissenter', 'prediction', 'outcome', 'raw')
+
+    def __init__(self, original_decision: Optional[str] = None, dissenter: Optional[str] = None,
+                 prediction: Optional[str] = None, outcome: Optional[str] = None,
+                 raw: Optional[str] = None, extra: Optional[Dict[str, Any]] = None):
+        self.original_decision = original_decision
+        self.dissenter = sys.intern(dissenter) if isinstance(dissenter, str) else dissenter
+        self.prediction = prediction
+        self.outcome = outcome
+        self.raw = raw
+        self.extra = extra
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> 'DissentVindication':
+        """Build from the dict shape used in state['dissentVindications']."""
+        return cls(d.get('originalDecision'), d.get('dissenter'), d.get('prediction'),
+                   d.get('outcome'), d.get('raw'), _extra(d, cls._FIELDS))
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert back to the dict shape used in state['dissentVindications']."""
+        d = {}
+        for key, value in (('originalDecision', self.original_decision), ('dissenter', self.dissenter),
+                           ('prediction', self.prediction), ('outcome', self.outcome),
+                           ('raw', self.raw)):
+            if value is not None:
+                d[key] = value
+        if self.extra:
+            d.update(self.extra)
+        return d
+
+    def __eq__(self, other: Any) -> bool:
+        return isinstance(other, DissentVindication) and self.to_dict() == other.to_dict()
+
+    def __repr__(self) -> str:
+        if self.raw is not None:
+            return f"DissentVindication(raw={self.raw!r})"
+        return f"DissentVindication({self.original_decision!r}, {self.dissenter!r})"
+
+
+# State section -> record type
+SECTION_RECORDS = {
+    'decisions': Decision,
+    'outstandingIssues': Issue,
+    'dissentVindications': DissentVindication,
+}
+
+
+def state_to_records(state: Dict[str, Any]) -> Dict[str, Any]:
+    """Return a copy of state with decisions, issues and dissent vindications as records."""
+    compact = dict(state)
+    for section, record_type in SECTION_RECORDS.items():
+        if section in state:
+            compact[section] = [record_type.from_dict(d) for d in state[section]]
+    return compact
+
+
+def records_to_state(compact: Dict[str, Any]) -> Dict[str, Any]:
+    """Inverse of state_to_records(): convert records back to plain dicts."""
+    state = dict(compact)
+    for section in SECTION_RECORDS:
+        if section in compact:
+            state[section] = [r.to_dict() for r in compact[section]]
+    return state
@@ -1,6 +1,7 @@
 from datetime import datetime
-from .state import read_state, write_state, init_state
-from .changelog import format_session_changelog_entry, add_decision, add_entry
+from .state import read_state, write_state, init_state, append_item, has_state, transaction
+from .changelog import format_session_changelog_entry, add_decision, add_entry, batch
+from .archive import stage_rotation, publish_rotation, discard_rotation, ARCHIVED_SECTIONS
 
 def start_session():
     state = read_state()
@@ -23,71 +24,85 @@ def start_session():
         
     return state
 
-def update_session(work_item=None, decision=None, issue=None):
-    state = read_state()
-    if not state:
-        state = init_state()
-    
-    state['lastUpdated'] = datetime.now().isoformat()
-    
-    if work_item:
-        state['activeWork'].append(work_item)
-        # Log work to changelog immediately
-        add_entry('added', work_item, source="Session in progress")
-        
-    if decision:
-        # Expected format: {"topic": "...", "decision": "...", "rationale": "...", "risk": "..."}
-        state['decisions'].append(decision)
-        # Log decision to changelog immediately
-        add_decision(
-            topic=decision.get('topic', 'Unknown'),
-            decision=decision.get('decision', 'Unknown'),
-            risk=decision.get('risk', 'Unknown'),
-            rationale=decision.get('rationale')
-        )
-        
-    if issue:
-        # Expected format: {"issue": "...", "severity": "..."}
-        state['outstandingIssues'].append(issue)
+def update_session(work_item=None, decision=None, issue=None, return_state=True):
+    # Each change is journaled as a single append; no full state rewrite.
+    # Wrap repeated calls in state.transaction() to batch bulk imports.
+    # Returns the updated state, replayed from the journal (free inside a
+    # transaction); pass return_state=False to skip that read and get None.
+    with batch():
+        if work_item:
+            append_item('activeWork', work_item)
+            # Log work to changelog immediately
+            add_entry('added', work_item, source="Session in progress")
+            
+        if decision:
+            # Expected format: {"topic": "...", "decision": "...", "rationale": "...", "risk": "..."}
+            append_item('decisions', decision)
+            # Log decision to changelog immediately
+            add_decision(
+                topic=decision.get('topic', 'Unknown'),
+                decision=decision.get('decision', 'Unknown'),
+                risk=decision.get('risk', 'Unknown'),
+                rationale=decision.get('rationale')
+            )
+            
+        if issue:
+            # Expected format: {"issue": "...", "severity": "..."}
+            append_item('outstandingIssues', issue)
         
-    write_state(state)
-    print(f"Session state updated at {state['lastUpdated']}")
-    return state
+    print(f"Session state updated at {datetime.now().isoformat()}")
+    return read_state() if return_state else None
 
 def end_session(next_steps=None):
-    state = read_state()
-    if not state:
+    if not has_state():
         return
         
-    state['lastUpdated'] = datetime.now().isoformat()
+    # One write of current.md and one of CHANGELOG.md for the whole wrap-up
+    staged = None
+    try:
+        with transaction() as state:
+            state['lastUpdated'] = datetime.now().isoformat()
+            
+            if next_steps:
+                state['nextSession'] = next_steps
+                
+            # Update changelog with session summary
+            # Note: Individual decisions/work are logged as they happen,
+            # but vindications and final summary are captured here
+            changelog_entries = format_session_changelog_entry(state)
+
+            # Move closed decisions and vindications into sessions/archive/,
+            # keeping current.md down to live work; the shard is only
+            # published once the state write below has committed
+            report_state = dict(state)
+            staged = stage_rotation(state)
+            changed = ['lastUpdated', 'nextSession']
+            if staged:
+                changed += ARCHIVED_SECTIONS
+            write_state(state, changed=changed)
+    except BaseException:
+        discard_rotation(staged)
+        raise
+    shard_path = publish_rotation(staged)
     
-    if next_steps:
-        state['nextSession'] = next_steps
-        
-    # Archive logic could go here (move current.md to sessions/timestamp.md)
-    # For now, just save state
-    write_state(state)
     print("Session finalized.")
-    
-    # Update changelog with session summary
-    # Note: Individual decisions/work are logged as they happen,
-    # but vindications and final summary are captured here
-    changelog_entries = format_session_changelog_entry(state)
     if changelog_entries:
         print(f"\n*The Scribe has inscribed {len(changelog_entries)} entries to the chronicle.*")
+    if shard_path:
+        print(f"Closed decisions archived to {shard_path}")
     
     # Generate report
     report = f"""
-# Session Report {state['lastUpdated']}
+# Session Report {report_state['lastUpdated']}
 
 ## Work Completed
-{chr(10).join(['- ' + w for w in state.get('activeWork', [])])}
+{chr(10).join(['- ' + w for w in report_state.get('activeWork', [])])}
 
 ## Decisions
-{chr(10).join(['- ' + d.get('topic', '') + ': ' + d.get('decision', '') for d in state.get('decisions', [])])}
+{chr(10).join(['- ' + d.get('topic', '') + ': ' + d.get('decision', '') for d in report_state.get('decisions', [])])}
 
 ## Issues
-{chr(10).join(['- ' + i.get('issue', '') + ': ' + i.get('severity', '') for i in state.get('outstandingIssues', [])])}
+{chr(10).join(['- ' + i.get('issue', '') + ': ' + i.get('severity', '') for i in report_state.get('outstandingIssues', [])])}
 
 ## Changelog Entries Added
 {chr(10).join(['- ' + e for e in changelog_entries])}
@@ -1,17 +1,54 @@
 import re
 import os
+import json
+import hashlib
+import mmap
+from contextlib import contextmanager
 from datetime import datetime
 from dateutil import parser as date_parser
-from typing import Optional, Tuple, List, Dict, Any
+from typing import Optional, Tuple, List, Dict, Any, Iterator, Iterable
+
+from . import changelog
 
 STATE_FILE = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'state', 'current.md')
 
+# Write-ahead journal of mutations not yet folded into STATE_FILE
+JOURNAL_FILE = os.path.join(os.path.dirname(STATE_FILE), 'current.journal')
+
+# Fold the journal into the markdown snapshot once it grows past this size
+JOURNAL_COMPACT_BYTES = 256 * 1024
+
+# Parsed-snapshot cache, keyed on the state file's fingerprint
+CACHE_FILE = os.path.join(os.path.dirname(STATE_FILE), '.current.cache.json')
+CACHE_VERSION = 3
+CACHE_ENABLED = True
+
+# Storage backend: 'markdown' (STATE_FILE + journal) or 'sqlite' (see statedb.py)
+STATE_BACKENDS = ['markdown', 'sqlite']
+STATE_BACKEND = os.environ.get('MORNINGSTAR_STATE_BACKEND', 'markdown')
+
+# In-memory state while a transaction() is open; None outside a transaction
+_transaction: Optional[Dict[str, Any]] = None
+# Sections modified inside the open transaction; None once unknown (full write)
+_transaction_changed: Optional[set] = None
+
 # Valid severity levels
 VALID_SEVERITIES = ['Low', 'Medium', 'High', 'Critical']
 
 # Valid vote values
 VALID_VOTES = ['YES', 'NO', 'ABSTAIN', 'RECUSED']
 
+# Trailing " [Personality:VOTE, ...]" vote tally of a decision line
+VOTES_PATTERN = re.compile(r' \[([^\[\]]+)\]$')
+
+# Indented detail lines under a decision
+DISSENT_PATTERN = re.compile(r'^\*Dissent \((.*?)\)\*:\s?(.*)$')
+RATIONALE_PATTERN = re.compile(r'^\*Rationale\*:\s?(.*)$')
+
+# Start of the comment carrying an entry's exact JSON, appended to its line
+# when the readable form would not read back the same
+EXACT_MARKER = ' <!-- '
+
 
 class StateParseError(Exception):
     """Raised when state parsing fails in strict mode."""
@@ -23,25 +60,97 @@ def parse_list_item(line: str) -> str:
     return line.strip().lstrip('- ').strip()
 
 
-def parse_decision(line: str) -> Dict[str, Any]:
+def _exact_suffix(item: Any) -> str:
     """
-    Parse a decision line.
-    Format: "- [topic]: [decision] — [risk]" or variations
-    Returns a decision dict with optional votes and dissents.
-    """
-    item = parse_list_item(line)
-    
-    # Try to parse with em-dash separator
-    parts = re.split(r':\s*|—\s*|--\s*', item)
+    The comment that carries item's exact JSON at the end of its line.
     
-    decision = {
+    '<' and '>' only occur inside JSON strings, where they are escaped, so
+    the comment cannot be closed early or mistaken for another.
+    """
+    data = json.dumps(item, ensure_ascii=False).replace('<', '\\u003c').replace('>', '\\u003e')
+    return f"{EXACT_MARKER}{data} -->"
+
+
+def _split_exact(item: str) -> Tuple[str, Optional[Dict[str, Any]]]:
+    """Separate a list item's readable text from its exact-JSON comment, if any."""
+    start = item.rfind(EXACT_MARKER)
+    if start == -1 or not item.endswith(' -->'):
+        return item, None
+    try:
+        exact = json.loads(item[start + len(EXACT_MARKER):-4])
+    except ValueError:
+        return item, None
+    if not isinstance(exact, dict):
+        return item, None
+    return item[:start], exact
+
+
+def _decision_defaults() -> Dict[str, Any]:
+    return {
         "topic": "Unknown",
-        "decision": "Unknown", 
+        "decision": "Unknown",
         "rationale": "See logs",
         "risk": "Unknown",
         "votes": {},
         "dissents": []
     }
+
+
+def parse_decision(line: str, details: Iterable[str] = ()) -> Dict[str, Any]:
+    """
+    Parse a decision line and the indented detail lines below it.
+    Format: "- [topic]: [decision] — [risk] [Personality:VOTE, ...]", then
+    "  - *Rationale*: ..." and "  - *Dissent (Personality)*: ..." details,
+    as written by format_state_markdown(). Older variations
+    ("topic: decision -- risk") are still read.
+    Returns a decision dict with votes and dissents.
+
+    Rendering and parsing round-trip:
+
+    >>> d = {'topic': 'api cache', 'decision': 'use redis', 'rationale': 'Fast: and cheap',
+    ...      'risk': 'High', 'votes': {'The Engineer': 'YES', 'The Debugger': 'NO'},
+    ...      'dissents': [{'personality': 'The Debugger', 'opinion': 'Invalidation'}]}
+    >>> line, *details = _decision_lines(d)
+    >>> line
+    '- api cache: use redis — High [The Engineer:YES, The Debugger:NO]'
+    >>> parse_decision(line, details) == d
+    True
+    >>> odd = dict(d, topic='db: pool', decision='two\\nlines')
+    >>> line, *details = _decision_lines(odd)
+    >>> parse_decision(line, details) == odd
+    True
+    """
+    item, exact = _split_exact(parse_list_item(line))
+    decision = _decision_defaults()
+    if exact is not None:
+        decision.update(exact)
+        return decision
+
+    match = VOTES_PATTERN.search(item)
+    if match:
+        pairs = [pair.partition(':') for pair in match.group(1).split(', ')]
+        if all(sep for _, sep, _ in pairs):
+            decision["votes"] = {k: v for k, _, v in pairs}
+            item = item[:match.start()]
+
+    for detail in details:
+        text = parse_list_item(detail)
+        match = DISSENT_PATTERN.match(text)
+        if match:
+            decision["dissents"].append({"personality": match.group(1), "opinion": match.group(2)})
+            continue
+        match = RATIONALE_PATTERN.match(text)
+        if match:
+            decision["rationale"] = match.group(1)
+
+    topic, sep, rest = item.partition(': ')
+    if sep and ' — ' in rest:
+        decision["topic"] = topic
+        decision["decision"], _, decision["risk"] = rest.rpartition(' — ')
+        return decision
+
+    # Try to parse with em-dash separator
+    parts = re.split(r':\s*|—\s*|--\s*', item)
     
     if len(parts) >= 3:
         decision["topic"] = parts[0].strip()
@@ -61,7 +170,9 @@ def parse_issue(line: str) -> Dict[str, str]:
     Parse an issue line.
     Format: "- [issue]: [severity]" or "- [issue] — [severity]"
     """
-    item = parse_list_item(line)
+    item, exact = _split_exact(parse_list_item(line))
+    if exact is not None:
+        return dict({"issue": "Unknown", "severity": "Medium"}, **exact)
     
     # Try multiple separators
     for sep in [':', '—', '--']:
@@ -92,9 +203,14 @@ def normalize_severity(severity: str) -> str:
     return 'Medium'
 
 
-def parse_vindication(line: str) -> str:
+# Placeholder written for empty vindication sections; not an entry
+EMPTY_PLACEHOLDER = "None (yet)"
+
+
+def parse_vindication(line: str) -> Optional[str]:
     """Parse a vindication entry."""
-    return parse_list_item(line)
+    item = parse_list_item(line)
+    return None if item == EMPTY_PLACEHOLDER else item
 
 
 def parse_dissent_vindication(line: str) -> Optional[Dict[str, str]]:
@@ -102,106 +218,285 @@ def parse_dissent_vindication(line: str) -> Optional[Dict[str, str]]:
     Parse a dissent vindication line.
     Format: "- [decision]: [dissenter] predicted [prediction] — [outcome]"
     """
-    item = parse_list_item(line)
+    item, exact = _split_exact(parse_list_item(line))
+    if exact is not None:
+        return exact
+    if item == EMPTY_PLACEHOLDER:
+        return None
     # This is complex; for now, store as string and parse later if needed
     return {"raw": item}
 
 
-def read_state(strict: bool = False) -> Optional[Dict[str, Any]]:
+def read_state(strict: bool = False, use_cache: Optional[bool] = None) -> Optional[Dict[str, Any]]:
     """
     Read and parse the state file.
     
     Args:
         strict: If True, raise StateParseError on parsing issues
+        use_cache: Load the parsed snapshot from CACHE_FILE when its
+                   fingerprint still matches (defaults to CACHE_ENABLED)
         
     Returns:
         Parsed state dictionary, or None if file doesn't exist
     """
+    if _transaction is not None:
+        return _transaction
+    if STATE_BACKEND == 'sqlite':
+        from . import statedb
+        return statedb.read_state()
+    return read_markdown_state(strict, use_cache)
+
+
+def has_state() -> bool:
+    """Whether a state exists for the configured backend, without parsing it."""
+    if _transaction is not None:
+        return True
+    if STATE_BACKEND == 'sqlite':
+        from . import statedb
+        return os.path.exists(statedb.DB_FILE) or os.path.exists(STATE_FILE)
+    return os.path.exists(STATE_FILE)
+
+
+def read_markdown_state(strict: bool = False, use_cache: Optional[bool] = None) -> Optional[Dict[str, Any]]:
+    """Read STATE_FILE plus its journal, regardless of STATE_BACKEND."""
     if not os.path.exists(STATE_FILE):
         return None
 
+    if use_cache is None:
+        use_cache = CACHE_ENABLED
+    # Strict callers want parse errors raised, so never serve them a cached parse
+    use_cache = use_cache and not strict
+
     try:
-        with open(STATE_FILE, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
-    except IOError as e:
+        key = _fingerprint(STATE_FILE) if use_cache else None
+        state = _load_cache(key) if use_cache else None
+        if state is None:
+            state = _build_state(iter_state_events(STATE_FILE, strict))
+            if use_cache:
+                _save_cache(key, state)
+    except (IOError, OSError) as e:
         if strict:
             raise StateParseError(f"Failed to read state file: {e}")
         return None
 
-    state = {
-        "lastUpdated": datetime.now().isoformat(),
-        "activeWork": [],
-        "decisions": [],
-        "outstandingIssues": [],
-        "prophetVindications": [],
-        "dissentVindications": [],
-        "nextSession": []
-    }
+    # Replay mutations recorded since the snapshot was last written
+    _replay_journal(state, strict)
+    
+    return state
+
+
+def _fingerprint(path: str) -> List[Any]:
+    """(inode, size, mtime_ns, content hash) of a file, hashed in chunks."""
+    st = os.stat(path)
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return [st.st_ino, st.st_size, st.st_mtime_ns, digest.hexdigest()]
 
+
+def _load_cache(key: List[Any]) -> Optional[Dict[str, Any]]:
+    """Return the cached parse of STATE_FILE if its fingerprint matches key."""
+    try:
+        with open(CACHE_FILE, 'r', encoding='utf-8') as f:
+            cached = json.load(f)
+    except (IOError, OSError, ValueError):
+        return None
+    if not isinstance(cached, dict) or cached.get('version') != CACHE_VERSION or cached.get('key') != key:
+        return None
+    return cached.get('state')
+
+
+def _save_cache(key: List[Any], state: Dict[str, Any]) -> None:
+    """Persist a parsed snapshot; failures only cost the next run a re-parse."""
+    tmp_path = f"{CACHE_FILE}.tmp"
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': CACHE_VERSION, 'key': key, 'state': state}, f, ensure_ascii=False)
+        os.replace(tmp_path, CACHE_FILE)
+    except (IOError, OSError):
+        pass
+
+
+def _section_for_heading(heading: str) -> Optional[str]:
+    """Map a '## ' heading to its state key, or None if unrecognized."""
+    section_name = heading[3:].lower()
+    if 'last updated' in section_name:
+        return 'lastUpdated'
+    elif 'active work' in section_name:
+        return 'activeWork'
+    elif 'decisions' in section_name:
+        return 'decisions'
+    elif 'outstanding' in section_name:
+        return 'outstandingIssues'
+    elif 'prophet' in section_name and 'vindication' in section_name:
+        return 'prophetVindications'
+    elif 'dissent' in section_name and 'vindication' in section_name:
+        return 'dissentVindications'
+    elif 'next session' in section_name:
+        return 'nextSession'
+    elif 'recent' in section_name:
+        return 'recentAdditions'  # Ignored but recognized
+    return None
+
+
+def iter_state_events(path: Optional[str] = None, strict: bool = False,
+                      sections: Optional[List[str]] = None) -> Iterator[Tuple[str, Any]]:
+    """
+    Lazily parse a markdown state file into (kind, value) events.
+    
+    The file is read one line at a time, so memory stays bounded by the
+    longest line no matter how large the file is. Events are:
+    
+        ('header', section)    a '## ' heading; section is the state key or None
+        ('lastUpdated', ts)    the Last Updated timestamp
+        (section, item)        one parsed list item of a state section
+        ('warning', message)   a recoverable parse problem
+    
+    A decision is produced once its indented detail lines (rationale,
+    dissents) have been read.
+    
+    Args:
+        path: State file to read (defaults to STATE_FILE)
+        strict: If True, raise StateParseError instead of yielding warnings
+        sections: Only parse items of these sections; others are skipped unparsed
+    """
+    with open(path or STATE_FILE, 'r', encoding='utf-8') as f:
+        yield from _iter_state_lines(f, strict, sections)
+
+
+def _iter_state_lines(lines: Iterable[str], strict: bool = False,
+                      sections: Optional[List[str]] = None,
+                      inexact: Optional[List[Dict[str, Any]]] = None) -> Iterator[Tuple[str, Any]]:
+    """
+    iter_state_events() over lines of markdown state text.
+
+    With `inexact`, decisions whose lines are not as _decision_lines()
+    writes them (older formats, hand edits) are also added to it.
+    """
     current_section = None
-    parse_warnings = []
+    # (line number, line, detail lines) of the decision being read
+    pending = None
+
+    def flush():
+        line_num, line, details = pending
+        try:
+            item = parse_decision(line, details)
+        except Exception as e:
+            if strict:
+                raise StateParseError(f"Parse error at line {line_num}: {e}")
+            return ('warning', f"Line {line_num}: Failed to parse '{line[:50]}...': {e}")
+        if inexact is not None and [text.strip() for text in _decision_lines(item)] != [line] + details:
+            inexact.append(item)
+        return ('decisions', item)
 
-    for line_num, line in enumerate(lines, 1):
-        line = line.strip()
+    for line_num, raw in enumerate(lines, 1):
+        line = raw.strip()
         if not line:
             continue
         
+        # Indented details belong to the decision above
+        if pending is not None:
+            if raw[:1] in ' \t' and line.startswith('- '):
+                pending[2].append(line)
+                continue
+            yield flush()
+            pending = None
+        
         # Section headers
         if line.startswith('## '):
-            section_name = line[3:].lower()
-            if 'last updated' in section_name:
-                current_section = 'lastUpdated'
-            elif 'active work' in section_name:
-                current_section = 'activeWork'
-            elif 'decisions' in section_name:
-                current_section = 'decisions'
-            elif 'outstanding' in section_name:
-                current_section = 'outstandingIssues'
-            elif 'prophet' in section_name and 'vindication' in section_name:
-                current_section = 'prophetVindications'
-            elif 'dissent' in section_name and 'vindication' in section_name:
-                current_section = 'dissentVindications'
-            elif 'next session' in section_name:
-                current_section = 'nextSession'
-            elif 'recent' in section_name:
-                current_section = 'recentAdditions'  # Ignored but recognized
-            else:
-                current_section = None
-                parse_warnings.append(f"Line {line_num}: Unrecognized section '{line}'")
+            current_section = _section_for_heading(line)
+            if current_section is None:
+                yield ('warning', f"Line {line_num}: Unrecognized section '{line}'")
+            yield ('header', current_section)
             continue
         
         # List items
         if line.startswith('- ') and current_section:
+            if sections is not None and current_section not in sections:
+                continue
+            if current_section == 'decisions':
+                if raw[:1] not in ' \t':
+                    pending = (line_num, line, [])
+                # else: details with no decision above them
+                continue
             try:
-                if current_section == 'activeWork':
-                    state['activeWork'].append(parse_list_item(line))
-                elif current_section == 'decisions':
-                    state['decisions'].append(parse_decision(line))
+                if current_section in ('activeWork', 'nextSession'):
+                    item = parse_list_item(line)
                 elif current_section == 'outstandingIssues':
-                    state['outstandingIssues'].append(parse_issue(line))
+                    item = parse_issue(line)
                 elif current_section == 'prophetVindications':
-                    state['prophetVindications'].append(parse_vindication(line))
+                    item = parse_vindication(line)
                 elif current_section == 'dissentVindications':
-                    vindication = parse_dissent_vindication(line)
-                    if vindication:
-                        state['dissentVindications'].append(vindication)
-                elif current_section == 'nextSession':
-                    state['nextSession'].append(parse_list_item(line))
+                    item = parse_dissent_vindication(line)
+                else:
+                    continue
             except Exception as e:
-                parse_warnings.append(f"Line {line_num}: Failed to parse '{line[:50]}...': {e}")
                 if strict:
                     raise StateParseError(f"Parse error at line {line_num}: {e}")
+                yield ('warning', f"Line {line_num}: Failed to parse '{line[:50]}...': {e}")
+                continue
+            if item:
+                yield (current_section, item)
                     
         # Timestamp (special case - not a list item)
         elif current_section == 'lastUpdated' and not line.startswith('#'):
             try:
                 clean_ts = line.strip('[]')
                 date_parser.parse(clean_ts)
-                state['lastUpdated'] = clean_ts
             except Exception:
-                parse_warnings.append(f"Line {line_num}: Invalid timestamp '{line}'")
                 if strict:
                     raise StateParseError(f"Invalid timestamp at line {line_num}: {line}")
+                yield ('warning', f"Line {line_num}: Invalid timestamp '{line}'")
+                continue
+            yield ('lastUpdated', clean_ts)
+
+    if pending is not None:
+        yield flush()
+
+
+def inexact_decisions(path: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    Decisions in a state file that may not have been read exactly.
+
+    A decision is read exactly when rendering it again gives back its
+    lines; one that does not (written in an older format or edited by
+    hand) may have lost text to the parse.
+
+    Args:
+        path: State file to read (defaults to STATE_FILE)
+    """
+    inexact = []
+    path = path or STATE_FILE
+    if os.path.exists(path):
+        with open(path, 'r', encoding='utf-8') as f:
+            for _ in _iter_state_lines(f, sections=['decisions'], inexact=inexact):
+                pass
+    return inexact
+
+
+def _build_state(events: Iterator[Tuple[str, Any]]) -> Dict[str, Any]:
+    """Assemble a state dict from iter_state_events() output."""
+    state = {
+        "lastUpdated": datetime.now().isoformat(),
+        "activeWork": [],
+        "decisions": [],
+        "outstandingIssues": [],
+        "prophetVindications": [],
+        "dissentVindications": [],
+        "nextSession": []
+    }
+    parse_warnings = []
+
+    for kind, value in events:
+        if kind == 'header':
+            continue
+        elif kind == 'warning':
+            parse_warnings.append(value)
+        elif kind == 'lastUpdated':
+            state['lastUpdated'] = value
+        else:
+            state[kind].append(value)
 
     # Store warnings for diagnostic purposes
     state['_parseWarnings'] = parse_warnings
@@ -209,6 +504,177 @@ def read_state(strict: bool = False) -> Optional[Dict[str, Any]]:
     return state
 
 
+def iter_section(section: str, limit: Optional[int] = None) -> Iterator[Any]:
+    """
+    Yield the items of one state section without loading the others.
+    
+    With the markdown backend the snapshot is streamed and reading stops
+    as soon as the section ends or `limit` items have been produced;
+    journaled changes to the section are applied on top.
+    
+    Args:
+        section: State key (e.g. 'decisions')
+        limit: Stop after this many items
+    """
+    if limit is not None and limit <= 0:
+        return
+    if _transaction is not None:
+        items = iter(_transaction.get(section, []))
+    elif STATE_BACKEND == 'sqlite':
+        from . import statedb
+        items = statedb.iter_section(section)
+    elif os.path.exists(STATE_FILE):
+        items = _iter_markdown_section(section)
+    else:
+        return
+
+    for count, item in enumerate(items, 1):
+        yield item
+        if limit is not None and count >= limit:
+            return
+
+
+def _iter_markdown_section(section: str) -> Iterator[Any]:
+    """Stream one section of STATE_FILE, then its journaled appends."""
+    # The journal is bounded by JOURNAL_COMPACT_BYTES, so reading it whole is cheap
+    entries = []
+    if os.path.exists(JOURNAL_FILE):
+        with open(JOURNAL_FILE, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                if isinstance(entry, dict) and entry.get('section') == section:
+                    entries.append(entry)
+
+    # A journaled 'set' replaces everything before it, snapshot included
+    last_set = max((i for i, e in enumerate(entries) if e.get('op') == 'set'), default=None)
+    if last_set is None:
+        in_section = False
+        for kind, value in iter_state_events(STATE_FILE, sections=[section]):
+            if kind == 'header':
+                if in_section:
+                    break
+                in_section = value == section
+            elif kind == section:
+                yield value
+    else:
+        yield from entries[last_set]['data']
+        entries = entries[last_set + 1:]
+
+    for entry in entries:
+        if entry.get('op') == 'append':
+            yield entry['data']
+
+
+def _apply_journal_entry(state: Dict[str, Any], entry: Dict[str, Any]) -> None:
+    """Apply a single journal entry to a parsed state."""
+    section = entry['section']
+    if entry['op'] == 'append':
+        state.setdefault(section, []).append(entry['data'])
+    elif entry['op'] == 'set':
+        state[section] = entry['data']
+    else:
+        raise ValueError(f"Unknown journal operation '{entry['op']}'")
+    state['lastUpdated'] = entry.get('ts', state.get('lastUpdated'))
+
+
+def _replay_journal(state: Dict[str, Any], strict: bool = False) -> None:
+    """
+    Replay the journal tail on top of a parsed snapshot.
+    
+    A torn final line (e.g. from an interrupted append) is skipped with
+    a parse warning rather than discarding the whole journal.
+    """
+    if not os.path.exists(JOURNAL_FILE):
+        return
+
+    with open(JOURNAL_FILE, 'r', encoding='utf-8') as f:
+        for line_num, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                _apply_journal_entry(state, json.loads(line))
+            except (ValueError, KeyError, TypeError, AttributeError) as e:
+                state['_parseWarnings'].append(f"Journal line {line_num}: Skipped unreadable entry: {e}")
+                if strict:
+                    raise StateParseError(f"Journal error at line {line_num}: {e}")
+
+
+def _append_journal(op: str, section: str, data: Any) -> None:
+    """
+    Record a mutation as one appended journal line.
+    
+    Compacts the journal into the markdown snapshot once it exceeds
+    JOURNAL_COMPACT_BYTES.
+    """
+    entry = {
+        "ts": datetime.now().isoformat(),
+        "op": op,
+        "section": section,
+        "data": data
+    }
+    line = (json.dumps(entry, ensure_ascii=False) + '\n').encode('utf-8')
+    with open(JOURNAL_FILE, 'ab+') as f:
+        # Never glue a new entry onto a torn (unterminated) previous line
+        size = f.seek(0, os.SEEK_END)
+        if size:
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b'\n':
+                line = b'\n' + line
+        f.write(line)
+        size = f.tell()
+
+    if size >= JOURNAL_COMPACT_BYTES:
+        compact_state()
+
+
+def compact_state() -> bool:
+    """
+    Fold the journal into the markdown snapshot.
+    
+    A journal holding an entry that current.md cannot represent exactly
+    (see round_trips()) is left uncompacted, with a warning, so the entry
+    is not lost to the snapshot.
+    
+    Returns:
+        True if a journal was compacted
+    """
+    if STATE_BACKEND != 'markdown' or not os.path.exists(JOURNAL_FILE):
+        return False
+    lossy = _lossy_journal_entries()
+    if lossy:
+        section, item = lossy[0]
+        print(f"Warning: journal not compacted; {len(lossy)} item(s) would not read back exactly "
+              f"from current.md (first, in {section}: {item!r:.60})")
+        return False
+    state = read_state()
+    if state is None:
+        return False
+    # Only the journaled sections differ from the snapshot
+    write_state(state, changed=())
+    return True
+
+
+def _lossy_journal_entries() -> List[Tuple[str, Any]]:
+    """(section, item) of journaled entries that current.md would not read back exactly."""
+    lossy = []
+    with open(JOURNAL_FILE, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+                section, op, data = entry['section'], entry['op'], entry['data']
+            except (ValueError, KeyError, TypeError):
+                continue
+            if section not in SECTION_ORDER or section == 'lastUpdated':
+                continue
+            items = [data] if op == 'append' else data if isinstance(data, list) else []
+            lossy.extend((section, item) for item in items if not round_trips(section, item))
+    return lossy
+
+
 def validate_state(state: Dict[str, Any]) -> Tuple[bool, List[str]]:
     """
     Validate state structure without full JSON schema validation.
@@ -290,82 +756,369 @@ def repair_state(state: Dict[str, Any]) -> Dict[str, Any]:
     
     return repaired
 
-def write_state(state: Dict[str, Any]) -> None:
+# Section order of a rendered STATE_FILE, after the title preamble
+SECTION_ORDER = ['lastUpdated', 'activeWork', 'decisions', 'outstandingIssues',
+                 'prophetVindications', 'dissentVindications', 'nextSession']
+
+
+def _section_lines(section: str, state: Dict[str, Any]) -> List[str]:
+    """Markdown lines of one section, heading first, ending with a blank line."""
+    if section == 'lastUpdated':
+        return ["## Last Updated", f"[{state.get('lastUpdated', datetime.now().isoformat())}]", ""]
+
+    if section == 'activeWork':
+        return ["## Active Work"] + [f"- {item}" for item in state.get('activeWork', [])] + [""]
+
+    if section == 'decisions':
+        lines = ["## Decisions Made"]
+        for d in state.get('decisions', []):
+            lines.extend(_decision_lines(d))
+        return lines + [""]
+
+    if section == 'outstandingIssues':
+        lines = ["## Outstanding Issues"]
+        for i in state.get('outstandingIssues', []):
+            issue_line = _one_line(f"- {i.get('issue', 'Unknown')}: {i.get('severity', 'Medium')}")
+            if parse_issue(issue_line) != dict({"issue": "Unknown", "severity": "Medium"}, **i):
+                issue_line += _exact_suffix(i)
+            lines.append(issue_line)
+        return lines + [""]
+
+    if section == 'prophetVindications':
+        lines = ["## Prophet's Vindications"]
+        for p in state.get('prophetVindications', []):
+            lines.append(f"- {p}")
+        if not state.get('prophetVindications'):
+            lines.append(f"- {EMPTY_PLACEHOLDER}")
+        return lines + [""]
+
+    if section == 'dissentVindications':
+        lines = ["## Dissent Vindications"]
+        for dv in state.get('dissentVindications', []):
+            if isinstance(dv, dict):
+                if 'raw' in dv:
+                    dv_line = _one_line(f"- {dv['raw']}")
+                else:
+                    dv_line = _one_line(f"- {dv.get('originalDecision', 'Unknown')}: {dv.get('dissenter', 'Unknown')} was right — {dv.get('outcome', '')}")
+                if parse_dissent_vindication(dv_line) != dv:
+                    dv_line += _exact_suffix(dv)
+                lines.append(dv_line)
+            else:
+                lines.append(f"- {dv}")
+        if not state.get('dissentVindications'):
+            lines.append(f"- {EMPTY_PLACEHOLDER}")
+        return lines + [""]
+
+    if section == 'nextSession':
+        return ["## Next Session"] + [f"- {n}" for n in state.get('nextSession', [])] + [""]
+
+    raise ValueError(f"Unknown section: {section}")
+
+
+def _one_line(text: str) -> str:
+    """Text as a single markdown line; the exact-JSON comment keeps what is lost."""
+    return text.replace('\r', ' ').replace('\n', ' ')
+
+
+def round_trips(section: str, item: Any) -> bool:
     """
-    Write state to markdown file.
-    Handles new fields like dissents and vote tallies.
+    Whether item reads back from current.md exactly as it was written.
+
+    Decisions, issues and structured dissent vindications always do; a
+    plain-text entry does not if it spans lines, has surrounding
+    whitespace, or is not a string.
     """
-    lines = []
-    lines.append("# Session State")
-    lines.append("")
+    try:
+        text = '\n'.join(_section_lines(section, {section: [item]}))
+    except (AttributeError, TypeError):
+        return False
+    parsed = [value for kind, value in _iter_state_lines(text.split('\n')) if kind == section]
+    if section == 'decisions' and isinstance(item, dict):
+        item = dict(_decision_defaults(), **item)
+    elif section == 'outstandingIssues' and isinstance(item, dict):
+        item = dict({"issue": "Unknown", "severity": "Medium"}, **item)
+    return parsed == [item]
+
+
+
+def _decision_lines(d: Dict[str, Any]) -> List[str]:
+    """
+    A decision's line (with its vote tally) and detail lines.
+    
+    When parse_decision() would not read these back as the same decision
+    (separators inside the text, values that are not strings, extra keys)
+    the line also carries the decision's exact JSON.
+    """
+    decision_line = f"- {d.get('topic', 'Unknown')}: {d.get('decision', 'Unknown')} — {d.get('risk', 'Unknown')}"
+    votes = d.get('votes')
+    rationale = d.get('rationale', 'See logs')
+    dissents = d.get('dissents')
+    plain = _is_plain_decision(d)
+    if plain and not votes and not dissents and rationale == 'See logs':
+        return [decision_line]
+    
+    # Add vote tally if present
+    if votes:
+        decision_line += f" [{', '.join(f'{k}:{v}' for k, v in votes.items())}]"
     
-    lines.append("## Last Updated")
-    lines.append(f"[{state.get('lastUpdated', datetime.now().isoformat())}]")
-    lines.append("")
+    details = []
+    if rationale != 'See logs':
+        details.append(f"  - *Rationale*: {rationale}")
+    # Add dissents as sub-items
+    for dissent in dissents or []:
+        details.append(f"  - *Dissent ({dissent.get('personality', 'Unknown')})*: {dissent.get('opinion', '')}")
+    
+    if plain:
+        return [decision_line] + details
+    decision_line = _one_line(decision_line)
+    details = [_one_line(detail) for detail in details]
+    expected = _decision_defaults()
+    expected.update(d)
+    if parse_decision(decision_line, details) != expected:
+        decision_line += _exact_suffix(d)
+    return [decision_line] + details
 
-    lines.append("## Active Work")
-    for item in state.get('activeWork', []):
-        lines.append(f"- {item}")
-    lines.append("")
 
-    lines.append("## Decisions Made")
-    for d in state.get('decisions', []):
-        decision_line = f"- {d.get('topic', 'Unknown')}: {d.get('decision', 'Unknown')} — {d.get('risk', 'Unknown')}"
-        
-        # Add vote tally if present
-        votes = d.get('votes', {})
-        if votes:
-            vote_str = ', '.join([f"{k}:{v}" for k, v in votes.items() if v])
-            if vote_str:
-                decision_line += f" [{vote_str}]"
-        
-        lines.append(decision_line)
-        
-        # Add dissents as sub-items
-        for dissent in d.get('dissents', []):
-            lines.append(f"  - *Dissent ({dissent.get('personality', 'Unknown')})*: {dissent.get('opinion', '')}")
-    lines.append("")
-
-    lines.append("## Outstanding Issues")
-    for i in state.get('outstandingIssues', []):
-        lines.append(f"- {i.get('issue', 'Unknown')}: {i.get('severity', 'Medium')}")
-    lines.append("")
-
-    lines.append("## Prophet's Vindications")
-    for p in state.get('prophetVindications', []):
-        lines.append(f"- {p}")
-    if not state.get('prophetVindications'):
-        lines.append("- None (yet)")
-    lines.append("")
-
-    lines.append("## Dissent Vindications")
-    for dv in state.get('dissentVindications', []):
-        if isinstance(dv, dict):
-            if 'raw' in dv:
-                lines.append(f"- {dv['raw']}")
-            else:
-                lines.append(f"- {dv.get('originalDecision', 'Unknown')}: {dv.get('dissenter', 'Unknown')} was right — {dv.get('outcome', '')}")
+_DECISION_KEYS = frozenset(_decision_defaults())
+
+# Risk values that need no further checks in _is_plain_decision()
+_PLAIN_RISKS = frozenset(VALID_SEVERITIES + ['Unknown'])
+
+
+def _is_plain_decision(d: Dict[str, Any]) -> bool:
+    """
+    Cheap sufficient check that parse_decision() reads d's lines back as d,
+    so most decisions skip the full check in _decision_lines().
+    """
+    if not _DECISION_KEYS.issuperset(d):
+        return False
+    topic = d.get('topic', 'Unknown')
+    risk = d.get('risk', 'Unknown')
+    rationale = d.get('rationale', 'See logs')
+    try:
+        text = ''.join((topic, d.get('decision', 'Unknown'), risk, rationale))
+    except TypeError:
+        return False
+    if ('\n' in text or '\r' in text
+            or not topic or topic != topic.strip() or topic[0] == '-' or ': ' in topic):
+        return False
+    if risk not in _PLAIN_RISKS and (not risk or risk != risk.strip() or ' — ' in f' {risk}'
+                                     or risk.endswith((']', '-->'))):
+        return False
+    if rationale != 'See logs' and rationale != rationale.strip():
+        return False
+    votes = d.get('votes', {})
+    if type(votes) is not dict:
+        return False
+    if votes:
+        try:
+            text = ''.join(votes) + '\0' + ''.join(votes.values())
+        except TypeError:
+            return False
+        if (any(c in text for c in ',[]\n\r')
+                or ':' in text[:text.index('\0')]):
+            return False
+    dissents = d.get('dissents', [])
+    if type(dissents) is not list:
+        return False
+    for dissent in dissents:
+        if not (type(dissent) is dict and dissent.keys() == {'personality', 'opinion'}):
+            return False
+        personality, opinion = dissent['personality'], dissent['opinion']
+        try:
+            text = personality + opinion
+        except TypeError:
+            return False
+        if '\n' in text or '\r' in text or ')' in personality or opinion != opinion.strip():
+            return False
+    return True
+
+
+def _render_preamble(archive_index: Optional[str] = None) -> str:
+    """The title (and archive pointer) that precedes the first section."""
+    lines = ["# Session State", ""]
+    if archive_index:
+        lines.append(f"*Earlier decisions and vindications are archived — see `{archive_index}`*")
+        lines.append("")
+    return '\n'.join(lines) + '\n'
+
+
+def _render_section(section: str, state: Dict[str, Any]) -> str:
+    """One section's text, exactly as it appears in format_state_markdown()."""
+    text = '\n'.join(_section_lines(section, state))
+    # Every section but the last is followed by the next heading
+    return text if section == SECTION_ORDER[-1] else text + '\n'
+
+
+def format_state_markdown(state: Dict[str, Any], archive_index: Optional[str] = None) -> str:
+    """
+    Render state as the markdown stored in STATE_FILE.
+    Handles new fields like dissents and vote tallies.
+
+    Args:
+        state: The state dictionary
+        archive_index: Path of the session archive index to point to, if any
+    """
+    return _render_preamble(archive_index) + ''.join(
+        _render_section(section, state) for section in SECTION_ORDER)
+
+
+def _section_offsets(path: str) -> Optional[List[List[int]]]:
+    """
+    Byte ranges of each section of a state file, in SECTION_ORDER.
+
+    Headings are located with mmap.find(), so this costs about as much as
+    copying the file once, with no per-line Python work.
+
+    Returns:
+        [[start, end], ...] per section, or None if the file is not laid out
+        exactly as format_state_markdown() writes it (missing, repeated,
+        reordered, or unrecognized sections)
+    """
+    size = os.path.getsize(path)
+    if size == 0:
+        return None
+    starts = []
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        pos = 0 if mm[:3] == b'## ' else mm.find(b'\n## ')
+        while pos != -1:
+            start = pos if mm[pos:pos + 3] == b'## ' else pos + 1
+            line_end = mm.find(b'\n', start)
+            heading = mm[start:line_end if line_end != -1 else size].decode('utf-8').strip()
+            starts.append((_section_for_heading(heading), start))
+            pos = mm.find(b'\n## ', start)
+
+    if [section for section, _ in starts] != SECTION_ORDER:
+        return None
+    ends = [start for _, start in starts[1:]] + [size]
+    return [[start, end] for (_, start), end in zip(starts, ends)]
+
+
+def _journal_sections() -> set:
+    """Sections touched by the journal, i.e. not yet reflected in STATE_FILE."""
+    sections = set()
+    if not os.path.exists(JOURNAL_FILE):
+        return sections
+    with open(JOURNAL_FILE, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                sections.add(json.loads(line)['section'])
+            except (ValueError, KeyError, TypeError):
+                continue
+    if sections:
+        # Replaying an entry also moves lastUpdated
+        sections.add('lastUpdated')
+    return sections
+
+
+def _write_markdown_state(state: Dict[str, Any], archive_index: Optional[str],
+                          tmp_path: str, changed: Optional[Iterable[str]] = None) -> int:
+    """
+    Write the rendered state to tmp_path.
+
+    With `changed`, only those sections (plus any the journal touched) are
+    rendered; every other section is copied as a byte range from the
+    existing STATE_FILE. Without it, or if STATE_FILE is not laid out as
+    format_state_markdown() writes it, the whole state is rendered.
+
+    Returns:
+        Number of sections rendered
+    """
+    offsets = None
+    if changed is not None and os.path.exists(STATE_FILE):
+        offsets = _section_offsets(STATE_FILE)
+    if offsets is None:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(format_state_markdown(state, archive_index))
+        return len(SECTION_ORDER)
+
+    dirty = set(changed) | _journal_sections()
+    rendered = 0
+    with open(STATE_FILE, 'rb') as src, \
+            mmap.mmap(src.fileno(), 0, access=mmap.ACCESS_READ) as mm, \
+            open(tmp_path, 'wb') as dst:
+        dst.write(_render_preamble(archive_index).encode('utf-8'))
+        with memoryview(mm) as view:
+            for section, (start, end) in zip(SECTION_ORDER, offsets):
+                if section in dirty:
+                    dst.write(_render_section(section, state).encode('utf-8'))
+                    rendered += 1
+                else:
+                    dst.write(view[start:end])
+    return rendered
+
+
+def write_state(state: Dict[str, Any], changed: Optional[Iterable[str]] = None) -> None:
+    """
+    Write state to the configured backend (markdown file by default).
+    
+    Inside a transaction() the write is deferred until the transaction ends.
+
+    Args:
+        state: The full state dictionary
+        changed: Sections that differ from what is on disk. With the
+                 markdown backend only these (and any sections with
+                 journaled changes) are re-rendered; the rest are copied
+                 from the current file. None re-renders everything.
+    """
+    global _transaction_changed
+    if _transaction is not None:
+        if state is not _transaction:
+            _transaction.clear()
+            _transaction.update(state)
+        if changed is None or _transaction_changed is None:
+            _transaction_changed = None
         else:
-            lines.append(f"- {dv}")
-    if not state.get('dissentVindications'):
-        lines.append("- None (yet)")
-    lines.append("")
+            _transaction_changed.update(changed)
+        return
 
-    lines.append("## Next Session")
-    for n in state.get('nextSession', []):
-        lines.append(f"- {n}")
-    lines.append("")
+    if STATE_BACKEND == 'sqlite':
+        from . import statedb
+        statedb.write_state(state)
+        _auto_backup()
+        return
 
     # Ensure directory exists
     os.makedirs(os.path.dirname(STATE_FILE), exist_ok=True)
+
+    from . import archive
+    archive_index = None
+    if os.path.exists(archive.ARCHIVE_INDEX):
+        archive_index = os.path.relpath(archive.ARCHIVE_INDEX, os.path.dirname(STATE_FILE))
     
-    with open(STATE_FILE, 'w', encoding='utf-8') as f:
-        f.write('\n'.join(lines))
+    # Write the snapshot atomically, then drop the journal it now contains
+    tmp_path = f"{STATE_FILE}.tmp"
+    _write_markdown_state(state, archive_index, tmp_path, changed)
+    os.replace(tmp_path, STATE_FILE)
 
+    if os.path.exists(JOURNAL_FILE):
+        os.remove(JOURNAL_FILE)
+    _auto_backup()
 
-def init_state() -> Dict[str, Any]:
-    """Initialize a fresh state file."""
-    state = {
+
+def _auto_backup() -> None:
+    """
+    Rate-limited automatic backup after a write (MORNINGSTAR_AUTO_BACKUP_INTERVAL).
+    
+    Inside a changelog batch (and so inside a transaction()) the backup
+    waits until the batch has written CHANGELOG.md, so it never pairs new
+    state with the old changelog.
+    """
+    changelog.after_batch(_run_auto_backup)
+
+
+def _run_auto_backup() -> None:
+    from . import backup
+    try:
+        backup.maybe_auto_backup()
+    except (IOError, OSError):
+        # The write itself succeeded; the next interval tries again
+        pass
+
+
+def _initial_state() -> Dict[str, Any]:
+    """The state a fresh session starts from."""
+    return {
         "lastUpdated": datetime.now().isoformat(),
         "activeWork": ["Initialize Morningstar System"],
         "decisions": [],
@@ -374,10 +1127,123 @@ def init_state() -> Dict[str, Any]:
         "dissentVindications": [],
         "nextSession": []
     }
+
+
+def init_state() -> Dict[str, Any]:
+    """Initialize a fresh state file."""
+    state = _initial_state()
     write_state(state)
     return state
 
 
+@contextmanager
+def transaction() -> Iterator[Dict[str, Any]]:
+    """
+    Batch any number of state and changelog mutations into one write each.
+    
+    Inside the block, read_state() returns a single in-memory state,
+    append_item()/add_decision()/set_section()/write_state() modify it, and
+    changelog updates are held by changelog.batch(). On normal exit the
+    state and the changelog are each written once, atomically; if the
+    block raises, neither file is touched. Nested transactions join the
+    outer one.
+    
+    Example:
+        with transaction():
+            for d in imported:
+                session.update_session(decision=d)
+    
+    Yields:
+        The in-memory state dictionary
+    """
+    global _transaction, _transaction_changed
+    if _transaction is not None:
+        yield _transaction
+        return
+    
+    current = read_state()
+    if current is None:
+        current = _initial_state()
+        changed = None
+    else:
+        changed = set()
+    
+    _transaction = current
+    _transaction_changed = changed
+    try:
+        with changelog.batch():
+            yield current
+            changed = _transaction_changed
+            _transaction = None
+            write_state(current, changed=changed)
+    finally:
+        _transaction = None
+        _transaction_changed = None
+
+
+def _mark_changed(*sections: str) -> None:
+    """Record sections modified inside the open transaction."""
+    if _transaction_changed is not None:
+        _transaction_changed.update(sections)
+
+
+def append_item(section: str, item: Any) -> None:
+    """
+    Append a single item to a state section.
+    
+    The item is written to the journal rather than rewriting the whole
+    state file; read_state() replays it on top of the snapshot.
+    
+    Args:
+        section: State key (e.g. 'activeWork', 'decisions', 'outstandingIssues')
+        item: The item to append, in the same shape read_state() returns
+    """
+    if _transaction is not None:
+        _transaction.setdefault(section, []).append(item)
+        _transaction['lastUpdated'] = datetime.now().isoformat()
+        _mark_changed(section, 'lastUpdated')
+        return
+
+    # Keep an existing decision index current without a rebuild
+    index = None
+    if section == 'decisions':
+        from . import index
+        if os.path.exists(index.INDEX_FILE):
+            previous_stamp = index.source_stamp()
+        else:
+            index = None
+
+    if STATE_BACKEND == 'sqlite':
+        from . import statedb
+        statedb.append_item(section, item)
+    else:
+        if not os.path.exists(STATE_FILE):
+            init_state()
+        _append_journal('append', section, item)
+
+    if index is not None:
+        index.record_decision(item, previous_stamp)
+    _auto_backup()
+
+
+def set_section(section: str, value: Any) -> None:
+    """Replace a state section wholesale (e.g. 'nextSession') via the journal."""
+    if _transaction is not None:
+        _transaction[section] = value
+        _transaction['lastUpdated'] = datetime.now().isoformat()
+        _mark_changed(section, 'lastUpdated')
+        return
+
+    if STATE_BACKEND == 'sqlite':
+        from . import statedb
+        statedb.set_section(section, value)
+    else:
+        if not os.path.exists(STATE_FILE):
+            init_state()
+        _append_journal('set', section, value)
+    _auto_backup()
+
+
 def add_decision(topic: str, decision: str, risk: str, rationale: str = "See logs",
                  votes: Optional[Dict[str, str]] = None, 
                  dissents: Optional[List[Dict[str, str]]] = None) -> None:
@@ -392,12 +1258,6 @@ def add_decision(topic: str, decision: str, risk: str, rationale: str = "See log
         votes: Dict of personality -> vote
         dissents: List of {personality, opinion} dicts
     """
-    state = read_state()
-    if not state:
-        state = init_state()
-    
-    state['lastUpdated'] = datetime.now().isoformat()
-    
     new_decision = {
         "topic": topic,
         "decision": decision,
@@ -407,8 +1267,7 @@ def add_decision(topic: str, decision: str, risk: str, rationale: str = "See log
         "dissents": dissents or []
     }
     
-    state['decisions'].append(new_decision)
-    write_state(state)
+    append_item('decisions', new_decision)
 
 
 def add_dissent_vindication(original_decision: str, dissenter: str, 
@@ -416,12 +1275,6 @@ def add_dissent_vindication(original_decision: str, dissenter: str,
     """
     Record when a dissenting opinion was proven correct.
     """
-    state = read_state()
-    if not state:
-        state = init_state()
-    
-    state['lastUpdated'] = datetime.now().isoformat()
-    
     vindication = {
         "originalDecision": original_decision,
         "dissenter": dissenter,
@@ -429,8 +1282,4 @@ def add_dissent_vindication(original_decision: str, dissenter: str,
         "outcome": outcome
     }
     
-    if 'dissentVindications' not in state:
-        state['dissentVindications'] = []
-    
-    state['dissentVindications'].append(vindication)
-    write_state(state)
+    append_item('dissentVindications', vindication)
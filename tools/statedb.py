@@ -0,0 +1,348 @@
+"""
+SQLite storage backend for MORNINGSTAR state.
+
+Selected with MORNINGSTAR_STATE_BACKEND=sqlite (or `morningstar --backend sqlite`).
+Exposes the same read/write/append operations as the markdown backend in
+state.py, plus indexed queries that the markdown file cannot answer
+without a full parse. The markdown file is produced on demand with
+export_markdown().
+"""
+
+import json
+import os
+import sqlite3
+from contextlib import closing
+from datetime import datetime
+from typing import Optional, List, Dict, Any, Iterator
+
+from . import state as state_module
+
+DB_FILE = os.path.join(os.path.dirname(state_module.STATE_FILE), 'current.db')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS decisions (
+    id INTEGER PRIMARY KEY,
+    topic TEXT NOT NULL,
+    decision TEXT NOT NULL,
+    rationale TEXT NOT NULL,
+    risk TEXT NOT NULL,
+    votes TEXT NOT NULL DEFAULT '{}',
+    dissents TEXT NOT NULL DEFAULT '[]',
+    timestamp TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_decisions_topic ON decisions(topic);
+CREATE INDEX IF NOT EXISTS idx_decisions_risk ON decisions(risk);
+CREATE INDEX IF NOT EXISTS idx_decisions_timestamp ON decisions(timestamp);
+CREATE TABLE IF NOT EXISTS issues (
+    id INTEGER PRIMARY KEY,
+    issue TEXT NOT NULL,
+    severity TEXT NOT NULL,
+    timestamp TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_issues_severity ON issues(severity);
+CREATE INDEX IF NOT EXISTS idx_issues_timestamp ON issues(timestamp);
+CREATE TABLE IF NOT EXISTS active_work (
+    id INTEGER PRIMARY KEY,
+    item TEXT NOT NULL,
+    timestamp TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS prophet_vindications (
+    id INTEGER PRIMARY KEY,
+    item TEXT NOT NULL,
+    timestamp TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS dissent_vindications (
+    id INTEGER PRIMARY KEY,
+    data TEXT NOT NULL,
+    timestamp TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_dissent_vindications_timestamp ON dissent_vindications(timestamp);
+CREATE TABLE IF NOT EXISTS next_session (
+    id INTEGER PRIMARY KEY,
+    item TEXT NOT NULL,
+    timestamp TEXT NOT NULL
+);
+"""
+
+def _decision_values(item: Dict[str, Any]) -> tuple:
+    return (item.get('topic', 'Unknown'), item.get('decision', 'Unknown'),
+            item.get('rationale') or 'See logs', item.get('risk', 'Unknown'),
+            json.dumps(item.get('votes') or {}), json.dumps(item.get('dissents') or []))
+
+
+def _issue_values(item: Dict[str, Any]) -> tuple:
+    return (item.get('issue', 'Unknown'), item.get('severity', 'Medium'))
+
+
+# State section -> (table, payload columns, item -> column values)
+SECTION_TABLES = {
+    'activeWork': ('active_work', ('item',), lambda item: (item,)),
+    'decisions': ('decisions', ('topic', 'decision', 'rationale', 'risk', 'votes', 'dissents'), _decision_values),
+    'outstandingIssues': ('issues', ('issue', 'severity'), _issue_values),
+    'prophetVindications': ('prophet_vindications', ('item',), lambda item: (item,)),
+    'dissentVindications': ('dissent_vindications', ('data',), lambda item: (json.dumps(item),)),
+    'nextSession': ('next_session', ('item',), lambda item: (item,)),
+}
+
+
+def connect() -> sqlite3.Connection:
+    """
+    Open the state database, creating the schema if needed.
+
+    A database created next to an existing current.md is seeded from it,
+    so switching backends does not lose state.
+    """
+    is_new = not os.path.exists(DB_FILE)
+    os.makedirs(os.path.dirname(DB_FILE), exist_ok=True)
+    conn = sqlite3.connect(DB_FILE)
+    conn.executescript(SCHEMA)
+    if is_new and os.path.exists(state_module.STATE_FILE):
+        import_markdown(conn)
+    return conn
+
+
+def _table_for(section: str) -> tuple:
+    if section not in SECTION_TABLES:
+        raise ValueError(f"Unknown state section '{section}'")
+    return SECTION_TABLES[section]
+
+
+def _insert(conn: sqlite3.Connection, section: str, items: List[Any], timestamp: str) -> None:
+    """Insert items at the end of the table backing a state section."""
+    table, columns, values = _table_for(section)
+    placeholders = ', '.join('?' for _ in range(len(columns) + 1))
+    conn.executemany(
+        f"INSERT INTO {table} ({', '.join(columns)}, timestamp) VALUES ({placeholders})",
+        [values(item) + (timestamp,) for item in items]
+    )
+
+
+def _sync_section(conn: sqlite3.Connection, section: str, items: List[Any], timestamp: str) -> None:
+    """
+    Make a section's rows match items.
+
+    Rows that already match the leading items are kept along with their
+    original timestamps; only the differing tail is deleted and re-inserted.
+    """
+    table, columns, values = _table_for(section)
+    rows = conn.execute(f"SELECT id, {', '.join(columns)} FROM {table} ORDER BY id")
+    kept = 0
+    first_stale_id = None
+    # items first, so zip stops without consuming a row once items run out
+    for item, row in zip(items, rows):
+        if tuple(row[1:]) != values(item):
+            first_stale_id = row[0]
+            break
+        kept += 1
+    else:
+        # All compared rows matched; anything past len(items) is stale
+        row = rows.fetchone()
+        first_stale_id = row[0] if row else None
+
+    if first_stale_id is not None:
+        conn.execute(f"DELETE FROM {table} WHERE id >= ?", (first_stale_id,))
+    _insert(conn, section, items[kept:], timestamp)
+
+
+def _touch(conn: sqlite3.Connection, timestamp: str) -> None:
+    """Record the last-updated timestamp."""
+    conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('lastUpdated', ?)", (timestamp,))
+
+
+def _decision_from_row(row: tuple) -> Dict[str, Any]:
+    """Convert a decisions row to the dict shape read_state() returns."""
+    return {
+        "topic": row[0],
+        "decision": row[1],
+        "rationale": row[2],
+        "risk": row[3],
+        "votes": json.loads(row[4]),
+        "dissents": json.loads(row[5])
+    }
+
+
+def read_state() -> Optional[Dict[str, Any]]:
+    """
+    Read the full state from the database.
+
+    Returns:
+        State dictionary in the same shape as state.read_state(), or None
+        if no state has been initialized
+    """
+    if not os.path.exists(DB_FILE) and not os.path.exists(state_module.STATE_FILE):
+        return None
+
+    with closing(connect()) as conn:
+        row = conn.execute("SELECT value FROM meta WHERE key = 'lastUpdated'").fetchone()
+        if row is None:
+            return None
+
+        state = {"lastUpdated": row[0]}
+        for section in ['activeWork', 'prophetVindications', 'nextSession']:
+            table = SECTION_TABLES[section][0]
+            state[section] = [r[0] for r in conn.execute(f"SELECT item FROM {table} ORDER BY id")]
+        state['decisions'] = [
+            _decision_from_row(r) for r in conn.execute(
+                "SELECT topic, decision, rationale, risk, votes, dissents FROM decisions ORDER BY id")
+        ]
+        state['outstandingIssues'] = [
+            {"issue": r[0], "severity": r[1]}
+            for r in conn.execute("SELECT issue, severity FROM issues ORDER BY id")
+        ]
+        state['dissentVindications'] = [
+            json.loads(r[0]) for r in conn.execute("SELECT data FROM dissent_vindications ORDER BY id")
+        ]
+        state['_parseWarnings'] = []
+    return state
+
+
+def iter_section(section: str) -> Iterator[Any]:
+    """Yield the items of one state section, oldest first, straight from the cursor."""
+    table, columns, _ = _table_for(section)
+    with closing(connect()) as conn:
+        for row in conn.execute(f"SELECT {', '.join(columns)} FROM {table} ORDER BY id"):
+            if section == 'decisions':
+                yield _decision_from_row(row)
+            elif section == 'outstandingIssues':
+                yield {"issue": row[0], "severity": row[1]}
+            elif section == 'dissentVindications':
+                yield json.loads(row[0])
+            else:
+                yield row[0]
+
+
+def write_state(state: Dict[str, Any]) -> None:
+    """Replace the stored state in a single transaction."""
+    timestamp = state.get('lastUpdated', datetime.now().isoformat())
+    with closing(connect()) as conn:
+        with conn:
+            for section in SECTION_TABLES:
+                _sync_section(conn, section, list(state.get(section, [])), timestamp)
+            _touch(conn, timestamp)
+
+
+def append_item(section: str, item: Any) -> None:
+    """Insert a single item into a state section."""
+    timestamp = datetime.now().isoformat()
+    with closing(connect()) as conn:
+        with conn:
+            if conn.execute("SELECT 1 FROM meta WHERE key = 'lastUpdated'").fetchone() is None:
+                # Same starting point as state.init_state()
+                _insert(conn, 'activeWork', ["Initialize Morningstar System"], timestamp)
+            _insert(conn, section, [item], timestamp)
+            _touch(conn, timestamp)
+
+
+def set_section(section: str, value: List[Any]) -> None:
+    """Replace a single state section."""
+    timestamp = datetime.now().isoformat()
+    with closing(connect()) as conn:
+        with conn:
+            _sync_section(conn, section, list(value), timestamp)
+            _touch(conn, timestamp)
+
+
+def query_decisions(
+    topic: Optional[str] = None,
+    risk: Optional[List[str]] = None,
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+    limit: Optional[int] = None,
+    offset: int = 0
+) -> List[Dict[str, Any]]:
+    """
+    Return decisions matching all of the given filters.
+
+    Args:
+        topic: Case-insensitive substring of the topic
+        risk: Risk levels to include (e.g. ['High', 'Critical'])
+        since: Only decisions recorded at or after this ISO timestamp
+        until: Only decisions recorded before this ISO timestamp
+        limit: Maximum number of results
+        offset: Number of matching results to skip
+
+    Returns:
+        List of decision dicts, oldest first, each with its 'timestamp'
+    """
+    clauses = []
+    params: List[Any] = []
+    if topic:
+        clauses.append("topic LIKE ? ESCAPE '\\'")
+        escaped = topic.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+        params.append(f"%{escaped}%")
+    if risk:
+        clauses.append(f"risk IN ({', '.join('?' for _ in risk)})")
+        params.extend(risk)
+    if since:
+        clauses.append("timestamp >= ?")
+        params.append(since)
+    if until:
+        clauses.append("timestamp < ?")
+        params.append(until)
+
+    sql = "SELECT topic, decision, rationale, risk, votes, dissents, timestamp FROM decisions"
+    if clauses:
+        sql += " WHERE " + " AND ".join(clauses)
+    sql += " ORDER BY id LIMIT ? OFFSET ?"
+    params.extend([limit if limit is not None else -1, offset])
+
+    with closing(connect()) as conn:
+        results = []
+        for row in conn.execute(sql, params):
+            decision = _decision_from_row(row)
+            decision['timestamp'] = row[6]
+            results.append(decision)
+    return results
+
+
+def query_issues(severity: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+    """Return outstanding issues, optionally filtered by severity."""
+    sql = "SELECT issue, severity, timestamp FROM issues"
+    params: List[Any] = []
+    if severity:
+        sql += f" WHERE severity IN ({', '.join('?' for _ in severity)})"
+        params.extend(severity)
+    sql += " ORDER BY id"
+    with closing(connect()) as conn:
+        return [{"issue": r[0], "severity": r[1], "timestamp": r[2]} for r in conn.execute(sql, params)]
+
+
+def import_markdown(conn: sqlite3.Connection) -> int:
+    """
+    Load the markdown state file (snapshot + journal) into the database.
+
+    Returns:
+        Number of decisions imported
+    """
+    state = state_module.read_markdown_state()
+    if not state:
+        return 0
+
+    timestamp = state.get('lastUpdated', datetime.now().isoformat())
+    with conn:
+        for section in SECTION_TABLES:
+            _sync_section(conn, section, list(state.get(section, [])), timestamp)
+        _touch(conn, timestamp)
+    return len(state.get('decisions', []))
+
+
+def export_markdown(path: Optional[str] = None) -> str:
+    """
+    Render the stored state as markdown.
+
+    Args:
+        path: Optional file to write the markdown to
+
+    Returns:
+        The rendered markdown
+    """
+    state = read_state() or {}
+    content = state_module.format_state_markdown(state)
+    if path:
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(content)
+    return content